@@ -17,12 +17,13 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.nlp.parser import QueryParser
 from src.nlp.synonyms import CULINARIA, PRECO, DISTANCIA, AVALIACAO
-from src.processors.recommendation_engine import RecommendationEngine
+from src.processors.recommendation_engine import RecommendationEngine, GROUP_OBJECTIVES, GROUP_MAX_USERS, ROUTE_MAX_POINTS
 from src.models.restaurant import Restaurant, restaurants_to_dicts
 from src.services.cache_service import cache_service
 from src.utils.validators import business_validator
 from src.utils.logger import backend_logger
 from src.utils.search_validator import search_validator
+from src.utils.geo_utils import geographic_midpoint
 
 # configuracao do app
 app = Flask(__name__)
@@ -46,7 +47,7 @@ CORS(app, origins=[
 
 # instancias globais
 query_parser = QueryParser()
-recommendation_engine = RecommendationEngine()
+recommendation_engine = RecommendationEngine(live_ingestion=True)
 
 # configurar dicionarios de sinonimos no parser
 query_parser.set_cuisine_synonyms(CULINARIA)
@@ -172,6 +173,45 @@ def get_recommendations():
         # extrair filtros do texto usando parser
         filters = query_parser.parse_query(text)
         
+        # termos corrigidos pelo validador ("habbibs" -> "habibs") viram a keyword da busca
+        if search_validation.corrected_terms:
+            filters['corrected_terms'] = search_validation.corrected_terms
+        
+        # rota opcional (lista de [lat, lon]) para buscas "no caminho"
+        route = data.get('route')
+        if isinstance(route, list) and len(route) > ROUTE_MAX_POINTS:
+            backend_logger.warn('Route with too many points rejected', {'points': len(route)})
+            return jsonify({
+                'error': 'dados invalidos',
+                'message': f'route deve ter no maximo {ROUTE_MAX_POINTS} pontos'
+            }), 400
+        if filters.get('towards') and route:
+            try:
+                route = [(float(point[0]), float(point[1])) for point in route]
+            except (TypeError, ValueError, IndexError):
+                route = None
+            if route and all(-90 <= lat <= 90 and -180 <= lon <= 180 for lat, lon in route):
+                filters['route'] = route
+            else:
+                backend_logger.warn('Invalid route ignored', {'route': data.get('route')})
+        
+        # destino opcional para buscas "na direção de"/"no caminho"
+        target_latitude = data.get('target_latitude')
+        target_longitude = data.get('target_longitude')
+        if filters.get('towards') and target_latitude is not None and target_longitude is not None:
+            try:
+                target_latitude = float(target_latitude)
+                target_longitude = float(target_longitude)
+            except (TypeError, ValueError):
+                target_latitude = target_longitude = None
+            if target_latitude is not None and -90 <= target_latitude <= 90 and -180 <= target_longitude <= 180:
+                filters['target_location'] = {'latitude': target_latitude, 'longitude': target_longitude}
+            else:
+                backend_logger.warn('Invalid target location ignored', {
+                    'target_latitude': data.get('target_latitude'),
+                    'target_longitude': data.get('target_longitude')
+                })
+        
         backend_logger.recommendation_engine('starting_recommendations', {
             'text': text,
             'filters': filters,
@@ -241,6 +281,116 @@ def get_recommendations():
 
 
 
+@app.route('/api/recommendations/group', methods=['POST'])
+def get_group_recommendations():
+    """
+    endpoint de recomendacoes para grupos: restaurantes no "meio do caminho" entre varios usuarios
+    
+    corpo: locations (lista de {latitude, longitude}), text (opcional, filtros e palavra-chave),
+    objective ('max' ou 'sum', padrao 'max') e max_results (padrao 5)
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({
+                'error': 'dados nao fornecidos',
+                'message': 'envie locations no corpo da requisicao'
+            }), 400
+        
+        locations = data.get('locations') or []
+        objective = data.get('objective', 'max')
+        text = (data.get('text') or '').strip()
+        
+        try:
+            user_locations = [(float(location['latitude']), float(location['longitude'])) for location in locations]
+        except (KeyError, TypeError, ValueError):
+            user_locations = None
+        
+        try:
+            max_results = int(data.get('max_results', 5))
+        except (TypeError, ValueError):
+            max_results = None
+        if max_results is None or max_results <= 0:
+            return jsonify({
+                'error': 'dados invalidos',
+                'message': 'max_results deve ser um inteiro positivo'
+            }), 400
+        
+        if (not user_locations or not 2 <= len(user_locations) <= GROUP_MAX_USERS
+                or not all(-90 <= lat <= 90 and -180 <= lon <= 180 for lat, lon in user_locations)):
+            return jsonify({
+                'error': 'dados invalidos',
+                'message': f'envie de 2 a {GROUP_MAX_USERS} localizacoes validas com latitude e longitude'
+            }), 400
+        
+        if objective not in GROUP_OBJECTIVES:
+            return jsonify({
+                'error': 'dados invalidos',
+                'message': f"objective deve ser um de: {', '.join(GROUP_OBJECTIVES)}"
+            }), 400
+        
+        filters = query_parser.parse_query(text) if text else {}
+        keyword = recommendation_engine.extract_keyword_from_query(text, filters) if text else None
+        
+        # buscar restaurantes em volta do ponto medio do grupo (na esfera: vale para grupos
+        # que cruzam o antimeridiano); a lista e da requisicao, o motor compartilhado nao muda
+        middle_latitude, middle_longitude = geographic_midpoint(user_locations)
+        restaurants = recommendation_engine.get_restaurants_from_api(middle_latitude, middle_longitude, keyword)
+        recommendations = recommendation_engine.get_group_recommendations(
+            user_locations, max_results, objective, filters, restaurants=restaurants
+        )
+        
+        return jsonify({
+            'status': 'success',
+            'message': f'encontrados {len(recommendations)} restaurantes',
+            'data': {
+                'recommendations': restaurants_to_dicts(recommendations),
+                'user_locations': [{'latitude': lat, 'longitude': lon} for lat, lon in user_locations],
+                'objective': objective,
+                'filters_extracted': filters
+            }
+        }), 200
+    
+    except Exception as e:
+        backend_logger.api_error('POST', '/api/recommendations/group', e, request.get_json())
+        return jsonify({
+            'error': 'erro interno do servidor',
+            'message': str(e)
+        }), 500
+
+
+@app.route('/api/restaurants/search', methods=['GET'])
+def search_restaurants_by_name():
+    """
+    endpoint de busca por nome entre os restaurantes ja recebidos do google maps
+    
+    parametros: q (trecho do nome, sem diferenciar acentos) e limit (padrao 10)
+    """
+    try:
+        query = request.args.get('q', '')
+        try:
+            limit = int(request.args.get('limit', 10))
+        except ValueError:
+            limit = None
+        
+        if not query or limit is None or limit <= 0:
+            return jsonify({
+                'error': 'parametros invalidos',
+                'message': 'envie q (trecho do nome) e limit positivo'
+            }), 400
+        
+        restaurants = recommendation_engine.search_by_name(query, limit)
+        return jsonify({
+            'status': 'success',
+            'data': restaurants_to_dicts(restaurants)
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'error': 'erro ao buscar restaurantes por nome',
+            'message': str(e)
+        }), 500
+
+
 @app.route('/api/business-rules', methods=['GET'])
 def get_business_rules():
     """
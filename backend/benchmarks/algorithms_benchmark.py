@@ -0,0 +1,123 @@
+"""
+benchmark de escalabilidade do pacote algorithms do projeto sabora
+executa cada implementacao de ordenacao, busca e top-k sobre restaurantes e dicionarios
+sinteticos e grava ops/s, comparacoes e pico de memoria em json
+
+Execute: python benchmarks/algorithms_benchmark.py [--sizes 10 100 1000] [--output arquivo.json]
+"""
+
+import argparse
+from typing import Any, Dict, List
+
+from benchmark_utils import (
+    DEFAULT_SIZES, PRICE_RANGES, make_restaurants, make_dicts, measure,
+    count_comparisons, write_results, print_table
+)
+
+from algorithms.sorting_algorithms import bubble_sort, fast_sort, multi_key_sort, bucket_sort
+from algorithms.selection_algorithms import top_k
+from algorithms.search_algorithms import linear_search, binary_search
+from algorithms.name_index import NameIndex
+from algorithms.columnar_algorithms import HAS_NUMPY, build_column, columnar_sort, columnar_top_k
+
+
+RADIUS_STEPS = [2.0, 5.0, 10.0, 15.0, 20.0, 25.0]
+SORT_KEYS = [('rating', True), ('distance', False)]
+TOP_K = 5
+NAME_QUERY = 'esquina praia'
+
+
+def _radius_expansion_binary(items: list) -> None:
+    for radius in RADIUS_STEPS:
+        binary_search(items, key='distance', limit_value=radius)
+
+
+def _columnar_top_k(items: list) -> None:
+    columns = [(build_column(items, key), descending) for key, descending in SORT_KEYS]
+    columnar_top_k(columns, TOP_K)
+
+
+# cada benchmark: (nome, funcao, entrada ordenada por distancia?, quadratico?, conta comparacoes?)
+BENCHMARKS = [
+    ('sort/bubble_sort', lambda items: bubble_sort(items, key='distance'), False, True, True),
+    ('sort/fast_sort', lambda items: fast_sort(items, key='distance'), False, False, True),
+    ('sort/numpy_sort', lambda items: columnar_sort(items, key='distance'), False, False, False),
+    ('sort/multi_key_sort', lambda items: multi_key_sort(items, SORT_KEYS), False, False, True),
+    ('sort/bucket_sort_price', lambda items: bucket_sort(items, key='price_range', categories=PRICE_RANGES), False, False, True),
+    ('topk/fast_sort_head', lambda items: fast_sort(items, key='rating', descending=True)[:TOP_K], False, False, True),
+    ('topk/top_k', lambda items: top_k(items, key='rating', k=TOP_K, descending=True), False, False, True),
+    ('topk/columnar_top_k', _columnar_top_k, False, False, False),
+    ('search/binary_search', lambda items: binary_search(items, key='distance', limit_value=10.0), True, False, True),
+    ('search/radius_expansion_binary', _radius_expansion_binary, True, False, True),
+    ('search/linear_search_name', lambda items: linear_search(items, key='name', search_value=NAME_QUERY), False, False, False),
+    ('search/name_index_build', lambda items: NameIndex(items), False, False, False),
+]
+
+
+def run(sizes: List[int], max_quadratic_n: int) -> List[Dict[str, Any]]:
+    """
+    executa todos os benchmarks para cada tamanho e tipo de dado
+
+    Args:
+        sizes: tamanhos de lista
+        max_quadratic_n: maior n para algoritmos quadraticos (acima disso sao pulados)
+
+    Returns:
+        linhas de resultado
+    """
+    results = []
+    data_makers = {'restaurant': make_restaurants, 'dict': make_dicts}
+
+    for n in sizes:
+        for data_kind, make_data in data_makers.items():
+            base = make_data(n)
+            sorted_base = fast_sort(base.copy(), key='distance')
+            counting_base = make_data(n, counting=True)
+            counting_sorted = fast_sort(counting_base.copy(), key='distance')
+
+            for name, function, needs_sorted, quadratic, counts in BENCHMARKS:
+                row = {'benchmark': name, 'data': data_kind, 'n': n}
+
+                needs_numpy = 'numpy' in name or 'columnar' in name
+                if (quadratic and n > max_quadratic_n) or (needs_numpy and not HAS_NUMPY):
+                    row['skipped'] = True
+                    results.append(row)
+                    continue
+
+                source = sorted_base if needs_sorted else base
+                counting_source = counting_sorted if needs_sorted else counting_base
+
+                row.update(measure(function, source.copy))
+                row['items_per_sec'] = n * row['ops_per_sec'] if row['ops_per_sec'] else None
+                row['comparisons'] = count_comparisons(function, counting_source.copy) if counts else None
+                results.append(row)
+
+            # busca no indice de nomes separada da construcao
+            index = NameIndex(base)
+            row = {'benchmark': 'search/name_index_search', 'data': data_kind, 'n': n}
+            row.update(measure(lambda query: index.search(query), lambda: NAME_QUERY))
+            row['items_per_sec'] = n * row['ops_per_sec'] if row['ops_per_sec'] else None
+            row['comparisons'] = None
+            results.append(row)
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='benchmark de escalabilidade do pacote algorithms')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='tamanhos de lista (padrao: 10 100 1000 10000 100000)')
+    parser.add_argument('--max-quadratic-n', type=int, default=2000,
+                        help='maior n para algoritmos O(n^2) como o bubble_sort')
+    parser.add_argument('--output', default=None,
+                        help='arquivo json de saida (padrao: benchmarks/results/algorithms.json)')
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.max_quadratic_n)
+    print_table(results)
+    output_path = write_results(results, args.output, 'algorithms')
+    print(f"\nresultados gravados em {output_path}")
+
+
+if __name__ == '__main__':
+    main()
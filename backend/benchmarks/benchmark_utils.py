@@ -0,0 +1,230 @@
+"""
+utilitarios compartilhados pelos benchmarks do projeto sabora
+gera dados sinteticos, mede tempo, comparacoes e pico de memoria e grava resultados em json
+"""
+
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+# adicionar o diretorio src ao path para imports relativos
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models.restaurant import Restaurant
+
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+PRICE_RANGES = ['baixo', 'medio', 'medio-alto', 'alto']
+CUISINES = ['Japonesa', 'Italiana', 'Brasileira', 'Pizzaria', 'Frutos do Mar', 'Café', 'Bar', 'Restaurante']
+NAME_WORDS = ['sabor', 'cantina', 'praia', 'bairro', 'fogo', 'chão', 'quintal', 'sushi', 'pizza',
+              'casa', 'bistrô', 'grill', 'japa', 'divino', 'esquina', 'mar', 'sertão', 'café']
+
+# centro de referencia (maceio) e deslocamento maximo em graus (~25 km)
+CENTER_LATITUDE = -9.6498
+CENTER_LONGITUDE = -35.7089
+MAX_OFFSET_DEGREES = 0.225
+
+
+class CountingFloat(float):
+    """float que conta quantas comparacoes participou"""
+
+    comparisons = 0
+
+    def __lt__(self, other):
+        CountingFloat.comparisons += 1
+        return float.__lt__(self, other)
+
+    def __le__(self, other):
+        CountingFloat.comparisons += 1
+        return float.__le__(self, other)
+
+    def __gt__(self, other):
+        CountingFloat.comparisons += 1
+        return float.__gt__(self, other)
+
+    def __ge__(self, other):
+        CountingFloat.comparisons += 1
+        return float.__ge__(self, other)
+
+    def __neg__(self):
+        return CountingFloat(float.__neg__(self))
+
+    __hash__ = float.__hash__
+
+
+def make_restaurants(count: int, seed: int = 42, counting: bool = False) -> List[Restaurant]:
+    """
+    cria restaurantes sinteticos espalhados em um raio de ~25 km
+
+    Args:
+        count: quantidade de restaurantes
+        seed: semente do gerador aleatorio
+        counting: se true, distancia e nota usam CountingFloat
+
+    Returns:
+        lista de objetos restaurant com distancia preenchida
+    """
+    rng = random.Random(seed)
+    number = CountingFloat if counting else float
+    restaurants = []
+    for i in range(count):
+        restaurant = Restaurant(
+            id=i,
+            name=f"{rng.choice(NAME_WORDS)} {rng.choice(NAME_WORDS)} {i}",
+            latitude=CENTER_LATITUDE + rng.uniform(-MAX_OFFSET_DEGREES, MAX_OFFSET_DEGREES),
+            longitude=CENTER_LONGITUDE + rng.uniform(-MAX_OFFSET_DEGREES, MAX_OFFSET_DEGREES),
+            rating=number(round(rng.uniform(1.0, 5.0), 1)),
+            cuisine_type=rng.choice(CUISINES),
+            price_range=rng.choice(PRICE_RANGES),
+            address=f"rua {i}"
+        )
+        restaurant.distance = number(round(rng.uniform(0.05, 25.0), 3))
+        restaurants.append(restaurant)
+    return restaurants
+
+
+def make_dicts(count: int, seed: int = 42, counting: bool = False) -> List[Dict[str, Any]]:
+    """
+    cria os mesmos restaurantes sinteticos como dicionarios
+
+    Args:
+        count: quantidade de restaurantes
+        seed: semente do gerador aleatorio
+        counting: se true, distancia e nota usam CountingFloat
+
+    Returns:
+        lista de dicionarios
+    """
+    return [
+        {
+            'id': restaurant.id,
+            'name': restaurant.name,
+            'rating': restaurant.rating,
+            'distance': restaurant.distance,
+            'price_range': restaurant.price_range,
+        }
+        for restaurant in make_restaurants(count, seed, counting)
+    ]
+
+
+def measure(
+    function: Callable[[Any], Any],
+    make_input: Callable[[], Any],
+    min_time: float = 0.2,
+    max_repeats: int = 5
+) -> Dict[str, Any]:
+    """
+    mede o tempo de uma operacao, repetindo ate acumular min_time segundos
+
+    Args:
+        function: operacao a medir, recebe a entrada gerada
+        make_input: gera uma entrada nova para cada repeticao (fora da medicao)
+        min_time: tempo minimo acumulado antes de parar
+        max_repeats: numero maximo de repeticoes
+
+    Returns:
+        dicionario com seconds (mediana), repeats, ops_per_sec e peak_memory_bytes
+    """
+    timings = []
+    while len(timings) < max_repeats and sum(timings) < min_time:
+        data = make_input()
+        start = time.perf_counter()
+        function(data)
+        timings.append(time.perf_counter() - start)
+
+    # pico de memoria em uma execucao separada (tracemalloc deixa tudo mais lento)
+    data = make_input()
+    tracemalloc.start()
+    function(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    seconds = statistics.median(timings)
+    return {
+        'seconds': seconds,
+        'repeats': len(timings),
+        'ops_per_sec': 1.0 / seconds if seconds > 0 else None,
+        'peak_memory_bytes': peak,
+    }
+
+
+def count_comparisons(function: Callable[[Any], Any], make_input: Callable[[], Any]) -> int:
+    """
+    conta as comparacoes feitas pela operacao sobre dados com CountingFloat
+
+    Args:
+        function: operacao a medir
+        make_input: gera a entrada com valores CountingFloat
+
+    Returns:
+        numero de comparacoes
+    """
+    data = make_input()
+    CountingFloat.comparisons = 0
+    function(data)
+    return CountingFloat.comparisons
+
+
+def environment_info() -> Dict[str, Any]:
+    """informacoes do ambiente para acompanhar os resultados"""
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'numpy': numpy_version,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def write_results(results: List[Dict[str, Any]], output_path: Optional[str], suite: str) -> str:
+    """
+    grava os resultados em json
+
+    Args:
+        results: linhas de resultado
+        output_path: caminho do arquivo (None usa benchmarks/results/<suite>.json)
+        suite: nome da suite
+
+    Returns:
+        caminho do arquivo gravado
+    """
+    if output_path is None:
+        output_path = os.path.join(RESULTS_DIR, f"{suite}.json")
+
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(output_path, 'w', encoding='utf-8') as output_file:
+        json.dump({'suite': suite, 'environment': environment_info(), 'results': results},
+                  output_file, indent=2, ensure_ascii=False)
+    return output_path
+
+
+def print_table(results: List[Dict[str, Any]]) -> None:
+    """imprime os resultados em forma de tabela"""
+    header = f"{'benchmark':<32} {'dados':<12} {'n':>7} {'ops/s':>12} {'comparacoes':>14} {'pico (KB)':>10}"
+    print(header)
+    print('-' * len(header))
+    for row in results:
+        if row.get('skipped'):
+            print(f"{row['benchmark']:<32} {row['data']:<12} {row['n']:>7} {'pulado':>12}")
+            continue
+        ops = f"{row['ops_per_sec']:.1f}" if row['ops_per_sec'] else '-'
+        comparisons = row['comparisons'] if row['comparisons'] is not None else '-'
+        print(f"{row['benchmark']:<32} {row['data']:<12} {row['n']:>7} {ops:>12} "
+              f"{comparisons:>14} {row['peak_memory_bytes'] / 1024:>10.1f}")
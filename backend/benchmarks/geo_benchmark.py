@@ -0,0 +1,205 @@
+"""
+benchmark dos utilitarios geograficos e indices espaciais do projeto sabora
+compara haversine ponto a ponto e em lote, geohash e consultas por raio com e sem indice,
+e grava ops/s e pico de memoria em json
+
+Execute: python benchmarks/geo_benchmark.py [--sizes 10 100 1000] [--output arquivo.json]
+"""
+
+import argparse
+from itertools import islice
+from typing import Any, Dict, List
+
+from benchmark_utils import (
+    DEFAULT_SIZES, CENTER_LATITUDE, CENTER_LONGITUDE, make_restaurants, measure,
+    write_results, print_table
+)
+
+from utils.geo_utils import (
+    calculate_distance, calculate_distance_from_dict, calculate_distances_batch, prepare_coordinates,
+    pack_coordinates,
+    distances_within_radius, distance_matrix,
+    geohash_encode, geohash_decode, geohash_neighbors, geohash_cover
+)
+from location.spatial_index import SpatialIndex
+from location.grid_index import GridIndex
+
+
+QUERY_RADIUS_KM = 2.0
+CITY_RADIUS_KM = 25.0
+COVER_RADII_KM = [0.5, 2.0, 25.0]
+GEOHASH_PRECISION = 7
+CENTER = {'latitude': CENTER_LATITUDE, 'longitude': CENTER_LONGITUDE}
+
+# rota de ~200 vertices atravessando a cidade para a consulta por corredor
+ROUTE = [(CENTER_LATITUDE + 0.001 * i, CENTER_LONGITUDE + 0.0015 * i - 0.0005 * (i % 7)) for i in range(200)]
+CORRIDOR_KM = 0.3
+
+# pontos de origem da matriz de distancias (ex: usuarios de um pedido em lote)
+MATRIX_POINTS = [(CENTER_LATITUDE + 0.01 * i, CENTER_LONGITUDE - 0.01 * i) for i in range(10)]
+
+
+def _scalar_distances(restaurants: list) -> None:
+    for restaurant in restaurants:
+        calculate_distance_from_dict(CENTER, {
+            'latitude': restaurant.latitude,
+            'longitude': restaurant.longitude
+        })
+
+
+def _batch_distances(restaurants: list) -> None:
+    calculate_distances_batch(
+        CENTER_LATITUDE, CENTER_LONGITUDE,
+        [restaurant.latitude for restaurant in restaurants],
+        [restaurant.longitude for restaurant in restaurants]
+    )
+
+
+def _float_columns(restaurants: list) -> None:
+    # linha de base do armazenamento: duas listas de floats python
+    [restaurant.latitude for restaurant in restaurants], [restaurant.longitude for restaurant in restaurants]
+
+
+def _packed_columns(restaurants: list) -> None:
+    pack_coordinates(
+        [restaurant.latitude for restaurant in restaurants],
+        [restaurant.longitude for restaurant in restaurants]
+    )
+
+
+def _scan_radius(restaurants: list) -> None:
+    # linha de base sem indice: todas as distancias e depois o filtro
+    distances = calculate_distances_batch(
+        CENTER_LATITUDE, CENTER_LONGITUDE,
+        [restaurant.latitude for restaurant in restaurants],
+        [restaurant.longitude for restaurant in restaurants]
+    ).tolist()
+    [restaurant for restaurant, distance in zip(restaurants, distances) if distance <= QUERY_RADIUS_KM]
+
+
+def _scalar_matrix(restaurants: list) -> None:
+    [[calculate_distance(lat, lon, restaurant.latitude, restaurant.longitude) for restaurant in restaurants]
+     for lat, lon in MATRIX_POINTS]
+
+
+def _encode_all(restaurants: list) -> None:
+    for restaurant in restaurants:
+        geohash_encode(restaurant.latitude, restaurant.longitude, GEOHASH_PRECISION)
+
+
+# cada benchmark: (nome, funcao que recebe a lista de restaurantes)
+BENCHMARKS = [
+    ('distance/scalar_loop', _scalar_distances),
+    ('distance/batch', _batch_distances),
+    ('storage/float_lists', _float_columns),
+    ('storage/packed_int32', _packed_columns),
+    ('matrix/scalar_calls_10xn', _scalar_matrix),
+    ('matrix/distance_matrix_10xn', lambda restaurants: distance_matrix(MATRIX_POINTS, restaurants)),
+    ('geohash/encode', _encode_all),
+    ('radius/full_scan', _scan_radius),
+    ('index/spatial_build', SpatialIndex),
+    ('index/grid_build', lambda restaurants: GridIndex.for_radius(QUERY_RADIUS_KM, restaurants)),
+]
+
+
+def _row(name: str, data_kind: str, n: int, measured: Dict[str, Any]) -> Dict[str, Any]:
+    row = {'benchmark': name, 'data': data_kind, 'n': n}
+    row.update(measured)
+    row['items_per_sec'] = n * row['ops_per_sec'] if row['ops_per_sec'] else None
+    row['comparisons'] = None
+    return row
+
+
+def run(sizes: List[int]) -> List[Dict[str, Any]]:
+    """
+    executa todos os benchmarks para cada tamanho de catalogo
+
+    Args:
+        sizes: quantidades de restaurantes
+
+    Returns:
+        linhas de resultado
+    """
+    results = []
+
+    for n in sizes:
+        restaurants = make_restaurants(n)
+
+        for name, function in BENCHMARKS:
+            results.append(_row(name, 'restaurant', n, measure(function, restaurants.copy)))
+
+        # operacoes que reaproveitam estruturas ja construidas
+        lats = [restaurant.latitude for restaurant in restaurants]
+        lons = [restaurant.longitude for restaurant in restaurants]
+        prepared = prepare_coordinates(lats, lons)
+        packed = pack_coordinates(lats, lons)
+        hashes = [geohash_encode(lat, lon, GEOHASH_PRECISION) for lat, lon in zip(lats, lons)]
+        spatial_index = SpatialIndex(restaurants)
+        grid_index = GridIndex.for_radius(QUERY_RADIUS_KM, restaurants)
+
+        prepared_runs = [
+            ('distance/batch_prepared',
+             lambda data: calculate_distances_batch(CENTER_LATITUDE, CENTER_LONGITUDE, prepared=data),
+             lambda: prepared),
+            ('distance/batch_packed',
+             lambda data: calculate_distances_batch(CENTER_LATITUDE, CENTER_LONGITUDE, packed=data),
+             lambda: packed),
+            ('radius/exact_25km',
+             lambda data: distances_within_radius(CENTER_LATITUDE, CENTER_LONGITUDE, CITY_RADIUS_KM,
+                                                  prepared=data, mode='exact'),
+             lambda: prepared),
+            ('radius/approx_25km',
+             lambda data: distances_within_radius(CENTER_LATITUDE, CENTER_LONGITUDE, CITY_RADIUS_KM,
+                                                  prepared=data, mode='approx'),
+             lambda: prepared),
+            ('geohash/decode', lambda data: [geohash_decode(value) for value in data], lambda: hashes),
+            ('geohash/neighbors', lambda data: [geohash_neighbors(value) for value in data], lambda: hashes),
+            ('radius/spatial_index',
+             lambda index: index.query_radius(CENTER_LATITUDE, CENTER_LONGITUDE, QUERY_RADIUS_KM),
+             lambda: spatial_index),
+            ('radius/spatial_sector_90deg',
+             lambda index: index.query_sector(CENTER_LATITUDE, CENTER_LONGITUDE, QUERY_RADIUS_KM, 0.0, 90.0),
+             lambda: spatial_index),
+            ('corridor/spatial_200_vertices',
+             lambda index: index.query_corridor(ROUTE, CORRIDOR_KM),
+             lambda: spatial_index),
+            ('radius/grid_index',
+             lambda index: index.query_radius(CENTER_LATITUDE, CENTER_LONGITUDE, QUERY_RADIUS_KM),
+             lambda: grid_index),
+            ('knn/spatial_index_k5',
+             lambda index: index.query_knn(CENTER_LATITUDE, CENTER_LONGITUDE, 5),
+             lambda: spatial_index),
+            ('knn/iter_nearest_k5',
+             lambda index: list(islice(index.iter_nearest(CENTER_LATITUDE, CENTER_LONGITUDE), 5)),
+             lambda: spatial_index),
+        ]
+        for name, function, make_input in prepared_runs:
+            results.append(_row(name, 'restaurant', n, measure(function, make_input)))
+
+    # cobertura de um circulo nao depende do tamanho do catalogo
+    for radius in COVER_RADII_KM:
+        measured = measure(lambda point: geohash_cover(point[0], point[1], radius),
+                           lambda: (CENTER_LATITUDE, CENTER_LONGITUDE))
+        row = _row(f"geohash/cover_{radius:g}km", 'point', 1, measured)
+        row['cells'] = len(geohash_cover(CENTER_LATITUDE, CENTER_LONGITUDE, radius))
+        results.append(row)
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='benchmark dos utilitarios geograficos e indices espaciais')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='quantidades de restaurantes (padrao: 10 100 1000 10000 100000)')
+    parser.add_argument('--output', default=None,
+                        help='arquivo json de saida (padrao: benchmarks/results/geo.json)')
+    args = parser.parse_args()
+
+    results = run(args.sizes)
+    print_table(results)
+    output_path = write_results(results, args.output, 'geo')
+    print(f"\nresultados gravados em {output_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+benchmark dos modelos de dados do projeto sabora
+compara a serializacao manual do restaurante com dataclasses.asdict, a memoria
+das instancias, a copia campo a campo contra a RestaurantView para anotar distancias
+e o filtro + top-k em objetos contra o RestaurantTable colunar, e grava ops/s e pico de memoria em json
+
+Execute: python benchmarks/models_benchmark.py [--sizes 10 100 1000] [--output arquivo.json]
+"""
+
+import argparse
+from dataclasses import asdict
+from typing import Any, Dict, List
+
+from benchmark_utils import DEFAULT_SIZES, make_restaurants, measure, write_results, print_table
+
+from models.restaurant import Restaurant, restaurants_to_dicts
+from models.restaurant_view import RestaurantView
+from models.restaurant_table import RestaurantTable
+from algorithms.sorting_algorithms import multi_key_sort
+from nlp.cuisine_taxonomy import compile_cuisine_filter
+
+
+SORT_KEYS = [('rating', True), ('distance', False), ('price_value', False)]
+MIN_RATING = 3.5
+CUISINE_TYPES = ['japonesa', 'italiana']
+TOP_K = 10
+
+
+def _objects_top_k(restaurants: list) -> None:
+    # linha de base: filtros e ordenacao objeto a objeto
+    matches = [
+        restaurant for restaurant in restaurants
+        if restaurant.rating >= MIN_RATING and restaurant.matches_cuisine_filter(CUISINE_TYPES)
+    ]
+    multi_key_sort(matches, SORT_KEYS)[:TOP_K]
+
+
+def _cuisine_filter(restaurants: list) -> list:
+    # filtro de culinaria compilado uma vez: por restaurante so um e bit a bit da mascara do rotulo
+    cuisine_filter = compile_cuisine_filter(CUISINE_TYPES)
+    return [restaurant for restaurant in restaurants if restaurant.matches_cuisine_filter(cuisine_filter)]
+
+
+def _copy_with_distance(restaurants: list) -> list:
+    # linha de base: um novo restaurante por candidato so para preencher a distancia
+    return [
+        Restaurant(
+            id=restaurant.id, name=restaurant.name, latitude=restaurant.latitude,
+            longitude=restaurant.longitude, rating=restaurant.rating, cuisine_type=restaurant.cuisine_type,
+            price_range=restaurant.price_range, address=restaurant.address, phone=restaurant.phone,
+            website=restaurant.website, opening_hours=restaurant.opening_hours, features=restaurant.features,
+            distance=restaurant.distance, distance_formatted='1.0 km'
+        )
+        for restaurant in restaurants
+    ]
+
+
+def _table_top_k(table: RestaurantTable) -> None:
+    table.filter_by(min_rating=MIN_RATING, cuisine_types=CUISINE_TYPES).top_k(SORT_KEYS, TOP_K).to_restaurants()
+
+
+# cada benchmark: (nome, funcao que recebe a lista de restaurantes)
+BENCHMARKS = [
+    ('serialize/asdict', lambda restaurants: [asdict(restaurant) for restaurant in restaurants]),
+    ('serialize/restaurants_to_dicts', restaurants_to_dicts),
+    ('build/restaurants', lambda restaurants: make_restaurants(len(restaurants))),
+    ('build/restaurant_table', RestaurantTable.from_restaurants),
+    ('annotate/copy_restaurants', _copy_with_distance),
+    ('annotate/restaurant_views',
+     lambda restaurants: [RestaurantView(restaurant, restaurant.distance, '1.0 km') for restaurant in restaurants]),
+    ('filter/cuisine_compiled', _cuisine_filter),
+    ('rank/objects_filter_top10', _objects_top_k),
+]
+
+
+def run(sizes: List[int]) -> List[Dict[str, Any]]:
+    """
+    executa todos os benchmarks para cada tamanho de lista
+
+    Args:
+        sizes: quantidades de restaurantes
+
+    Returns:
+        linhas de resultado
+    """
+    results = []
+
+    for n in sizes:
+        restaurants = make_restaurants(n)
+        for name, function in BENCHMARKS:
+            row = {'benchmark': name, 'data': 'restaurant', 'n': n}
+            row.update(measure(function, restaurants.copy))
+            row['items_per_sec'] = n * row['ops_per_sec'] if row['ops_per_sec'] else None
+            row['comparisons'] = None
+            results.append(row)
+
+        # filtro + top-k sobre uma tabela ja construida
+        table = RestaurantTable.from_restaurants(restaurants)
+        row = {'benchmark': 'rank/table_filter_top10', 'data': 'restaurant', 'n': n}
+        row.update(measure(_table_top_k, lambda: table))
+        row['items_per_sec'] = n * row['ops_per_sec'] if row['ops_per_sec'] else None
+        row['comparisons'] = None
+        results.append(row)
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='benchmark dos modelos de dados')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='quantidades de restaurantes (padrao: 10 100 1000 10000 100000)')
+    parser.add_argument('--output', default=None,
+                        help='arquivo json de saida (padrao: benchmarks/results/models.json)')
+    args = parser.parse_args()
+
+    results = run(args.sizes)
+    print_table(results)
+    output_path = write_results(results, args.output, 'models')
+    print(f"\nresultados gravados em {output_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+from .sorting_algorithms import _resolve_key_getter
+
+try:
+    import numpy as np
+except ImportError:  # numpy e opcional: sem ele o backend colunar fica indisponivel
+    np = None
+
+HAS_NUMPY = np is not None
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("numpy e necessario para o backend colunar")
+
+
+def build_column(items_list: list, key):
+    # extrai uma chave numerica para um array float64 contiguo (ausentes viram nan)
+    _require_numpy()
+    if not items_list:
+        return np.empty(0, dtype=np.float64)
+
+    get_value = _resolve_key_getter(items_list, key)
+    values = [get_value(item) for item in items_list]
+    return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+
+def build_columns(items_list: list, keys: list):
+    return {key: build_column(items_list, key) for key in keys}
+
+
+def _sort_values(values, descending: bool):
+    # negar para ordem decrescente; nan fica sempre no final
+    return -values if descending else values
+
+
+def columnar_argsort(values, descending: bool = False):
+    # indices de ordenacao estavel (equivalente ao fast_sort)
+    _require_numpy()
+    return np.argsort(_sort_values(values, descending), kind='stable')
+
+
+def columnar_lexsort(sort_columns: list):
+    # sort_columns: [(valores, descending), ...] do criterio mais para o menos significativo
+    _require_numpy()
+    keys = [_sort_values(values, descending) for values, descending in reversed(sort_columns)]
+    return np.lexsort(keys)
+
+
+def columnar_top_k(sort_columns: list, k: int):
+    # indices dos k primeiros na ordem de columnar_lexsort, sem ordenar tudo:
+    # argpartition no criterio principal e lexsort so nos candidatos que empatam ou superam o k-esimo
+    _require_numpy()
+    primary_values, primary_descending = sort_columns[0]
+    size = len(primary_values)
+    if k <= 0 or size == 0:
+        return np.empty(0, dtype=np.intp)
+    if k >= size:
+        return columnar_lexsort(sort_columns)[:k]
+
+    primary = _sort_values(primary_values, primary_descending)
+    primary = np.where(np.isnan(primary), np.inf, primary)
+    kth_value = primary[np.argpartition(primary, k - 1)[k - 1]]
+    candidates = np.flatnonzero(primary <= kth_value)
+
+    order = columnar_lexsort([(values[candidates], descending) for values, descending in sort_columns])
+    return candidates[order[:k]]
+
+
+def columnar_radius_cutoff(sorted_values, limit_value: float):
+    # quantidade de valores <= limit_value em um array crescente (equivale a binary_search + 1)
+    _require_numpy()
+    return int(np.searchsorted(sorted_values, limit_value, side='right'))
+
+
+def materialize(items_list: list, indices):
+    # so os indices selecionados viram objetos de novo
+    return [items_list[index] for index in indices.tolist()]
+
+
+def columnar_sort(items_list: list, key=None, descending: bool = False):
+    # mesma assinatura do fast_sort, ordenando pela coluna extraida
+    if not items_list:
+        return items_list
+
+    column = build_column(items_list, key)
+    items_list[:] = materialize(items_list, columnar_argsort(column, descending))
+    return items_list
+
+
+def columnar_multi_key_sort(items_list: list, sort_keys: list):
+    # mesma assinatura do multi_key_sort, ordenando por lexsort sobre as colunas extraidas
+    if not items_list:
+        return items_list
+
+    sort_columns = [(build_column(items_list, key), descending) for key, descending in sort_keys]
+    items_list[:] = materialize(items_list, columnar_lexsort(sort_columns))
+    return items_list
@@ -0,0 +1,110 @@
+from .name_index import normalize_text
+
+
+def edit_distance(first: str, second: str, max_distance: int = None):
+    # distancia de damerau-levenshtein restrita (troca de letras vizinhas custa 1)
+    # com max_distance, para cedo e retorna max_distance + 1 quando o limite e excedido
+    if max_distance is not None and abs(len(first) - len(second)) > max_distance:
+        return max_distance + 1
+
+    previous_row = None
+    current_row = list(range(len(second) + 1))
+
+    for i in range(1, len(first) + 1):
+        before_previous, previous_row = previous_row, current_row
+        current_row = [i] + [0] * len(second)
+        row_minimum = i
+
+        for j in range(1, len(second) + 1):
+            cost = 0 if first[i - 1] == second[j - 1] else 1
+            value = min(
+                previous_row[j] + 1,
+                current_row[j - 1] + 1,
+                previous_row[j - 1] + cost
+            )
+            if (i > 1 and j > 1 and first[i - 1] == second[j - 2]
+                    and first[i - 2] == second[j - 1]):
+                value = min(value, before_previous[j - 2] + 1)
+            current_row[j] = value
+            row_minimum = min(row_minimum, value)
+
+        if max_distance is not None and row_minimum > max_distance:
+            return max_distance + 1
+
+    distance = current_row[len(second)]
+    if max_distance is not None and distance > max_distance:
+        return max_distance + 1
+    return distance
+
+
+def _deletes(term: str, max_distance: int):
+    # todas as variantes obtidas removendo ate max_distance caracteres
+    variants = {term}
+    frontier = {term}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for word in frontier:
+            for i in range(len(word)):
+                next_frontier.add(word[:i] + word[i + 1:])
+        variants |= next_frontier
+        frontier = next_frontier
+    return variants
+
+
+class DeletionIndex:
+    # indice de delecoes no estilo symspell: cada termo e indexado por todas as suas
+    # variantes com ate max_distance delecoes; a consulta gera as proprias variantes,
+    # junta os candidatos por dicionario e so entao confirma a distancia de edicao
+
+    def __init__(self, max_distance: int = 2):
+        self.max_distance = max_distance
+        self.terms = {}
+        self.deletes = {}
+
+    def __len__(self):
+        return len(self.terms)
+
+    def __contains__(self, term: str):
+        return normalize_text(term).strip() in self.terms
+
+    def add(self, term: str, value=None):
+        # value identifica o que o termo representa (ex: nome canonico do estabelecimento)
+        normalized = normalize_text(term).strip()
+        if not normalized or normalized in self.terms:
+            return
+        self.terms[normalized] = term if value is None else value
+        for variant in _deletes(normalized, self.max_distance):
+            self.deletes.setdefault(variant, []).append(normalized)
+
+    def add_many(self, terms, value=None):
+        for term in terms:
+            self.add(term, value)
+
+    def add_vocabulary(self, vocabulary: dict):
+        # dicionario no formato dos sinonimos: {valor canonico: [termos]}
+        for value, terms in vocabulary.items():
+            self.add(value, value)
+            self.add_many(terms, value)
+
+    def lookup(self, query: str, max_distance: int = None):
+        # termos a ate max_distance edicoes da consulta, como (termo, distancia, valor),
+        # ordenados por distancia e depois por termo
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+
+        normalized = normalize_text(query).strip()
+        if not normalized:
+            return []
+
+        candidates = set()
+        for variant in _deletes(normalized, max_distance):
+            candidates.update(self.deletes.get(variant, ()))
+
+        matches = []
+        for term in candidates:
+            distance = edit_distance(normalized, term, max_distance)
+            if distance <= max_distance:
+                matches.append((term, distance, self.terms[term]))
+
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches
@@ -0,0 +1,36 @@
+import heapq
+
+
+def _item_getter(key):
+    # resolve o valor por funcao, atributo ou chave de dicionario, item a item,
+    # ja que as fontes sao iteradores e nao ha lista para inspecionar antes
+    if callable(key):
+        return key
+
+    def get_value(item):
+        if hasattr(item, key):
+            return getattr(item, key)
+        return item.get(key)
+    return get_value
+
+
+def k_way_merge(sorted_iterables: list, key, id_key='id', descending: bool = False):
+    # intercala N fontes ja ordenadas por key de forma preguicosa (heap de N posicoes),
+    # descartando repeticoes pelo identificador: fica a primeira ocorrencia na ordem final;
+    # itens sem valor vao para o final nos dois sentidos, como no fast_sort
+    get_item_value = _item_getter(key)
+
+    def get_value(item):
+        value = get_item_value(item)
+        return ((value is not None) if descending else (value is None), value)
+
+    get_id = _item_getter(id_key) if id_key else None
+    seen_ids = set()
+
+    for item in heapq.merge(*sorted_iterables, key=get_value, reverse=descending):
+        if get_id is not None:
+            item_id = get_id(item)
+            if item_id in seen_ids:
+                continue
+            seen_ids.add(item_id)
+        yield item
@@ -0,0 +1,145 @@
+import threading
+import unicodedata
+
+
+def normalize_text(text: str):
+    # minusculas e sem acentos, para que "Japonês" e "japones" sejam iguais
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _trigrams(text: str):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class NameIndex:
+    # indice invertido trigrama -> posicoes, construido uma vez sobre os nomes
+    # responde buscas por substring intersectando as listas e verificando os candidatos
+    # itens com o mesmo id sao atualizados no lugar (ou, se o nome mudou, a posicao antiga vira
+    # None), para que a ingestao ao vivo (GoogleMapsService) possa reenviar os mesmos lugares;
+    # com max_items, os ids atualizados ha mais tempo saem primeiro
+
+    def __init__(self, items: list = None, key: str = 'name', max_items: int = None):
+        if max_items is not None and max_items <= 0:
+            raise ValueError("max_items deve ser positivo")
+        self.key = key
+        self.max_items = max_items
+        self.items = []
+        self.names = []
+        self.postings = {}
+        # id -> posicao, na ordem da ultima atualizacao (o primeiro e o proximo a expirar)
+        self._positions = {}
+        self._removed = 0
+        self._lock = threading.Lock()
+        if items:
+            self.add_many(items)
+
+    def __len__(self):
+        return len(self.items) - self._removed
+
+    def _value(self, item):
+        if hasattr(item, self.key):
+            return getattr(item, self.key)
+        return item.get(self.key)
+
+    def _id(self, item):
+        if hasattr(item, 'id'):
+            return item.id
+        return item.get('id') if isinstance(item, dict) else None
+
+    def add(self, item):
+        # insercao incremental: so indexa os trigramas do novo nome
+        value = self._value(item)
+        name = normalize_text(str(value)) if value else ''
+        item_id = self._id(item)
+
+        with self._lock:
+            if item_id is not None:
+                previous = self._positions.pop(item_id, None)
+                if previous is not None:
+                    if self.names[previous] == name:
+                        # mesmo nome: so troca o item, sem novas posicoes nem trigramas
+                        self.items[previous] = item
+                        self._positions[item_id] = previous
+                        return previous
+                    self._discard(previous)
+
+            position = len(self.items)
+            if item_id is not None:
+                self._positions[item_id] = position
+            self.items.append(item)
+            self.names.append(name)
+            for trigram in _trigrams(name):
+                self.postings.setdefault(trigram, []).append(position)
+
+            if self.max_items is not None:
+                while len(self) > self.max_items and self._positions:
+                    self._discard(self._positions.pop(next(iter(self._positions))))
+            if self._removed > len(self):
+                self._compact()
+            return self._positions.get(item_id, len(self.items) - 1)
+
+    def add_many(self, items: list):
+        for item in items:
+            self.add(item)
+
+    def _discard(self, position: int):
+        self.items[position] = None
+        self.names[position] = None
+        self._removed += 1
+
+    def _compact(self):
+        # reconstroi as listas sem as posicoes descartadas, mantendo a ordem de insercao
+        live = [position for position, name in enumerate(self.names) if name is not None]
+        new_positions = {old: new for new, old in enumerate(live)}
+        self.items = [self.items[position] for position in live]
+        self.names = [self.names[position] for position in live]
+        self.postings = {}
+        for position, name in enumerate(self.names):
+            for trigram in _trigrams(name):
+                self.postings.setdefault(trigram, []).append(position)
+        self._positions = {item_id: new_positions[old] for item_id, old in self._positions.items()}
+        self._removed = 0
+
+    def _candidates(self, folded_query: str):
+        trigrams = _trigrams(folded_query)
+        if not trigrams:
+            # consultas com menos de 3 caracteres nao tem trigramas: verificar todos
+            return range(len(self.names))
+
+        posting_lists = []
+        for trigram in trigrams:
+            posting = self.postings.get(trigram)
+            if not posting:
+                return []
+            posting_lists.append(posting)
+
+        # intersectar a partir da menor lista
+        posting_lists.sort(key=len)
+        candidates = set(posting_lists[0])
+        for posting in posting_lists[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                break
+        return candidates
+
+    def search(self, query: str, limit: int = None):
+        # todos os itens cujo nome contem a consulta, ranqueados por
+        # posicao do trecho (prefixo primeiro), tamanho do nome e ordem de insercao;
+        # mesma semantica de linear_search: a consulta nao e aparada e nomes vazios nao casam
+        folded_query = normalize_text(query)
+
+        matches = []
+        with self._lock:
+            for position in self._candidates(folded_query):
+                name = self.names[position]
+                if not name:
+                    continue
+                offset = name.find(folded_query)
+                if offset >= 0:
+                    matches.append((offset, len(name), position))
+
+            matches.sort()
+            if limit is not None:
+                matches = matches[:limit]
+            return [self.items[position] for _, _, position in matches]
@@ -0,0 +1,27 @@
+import heapq
+
+from .sorting_algorithms import _resolve_key_getter
+
+
+def top_k(items_list: list, key: str, k: int, descending: bool = False):
+    # selecao parcial O(n log k): equivalente a fast_sort(...)[:k] sem ordenar a lista inteira
+    if k <= 0 or not items_list:
+        return []
+
+    get_value = _resolve_key_getter(items_list, key)
+
+    # itens sem valor so entram se faltarem itens com valor, como no fast_sort
+    with_value = []
+    without_value = []
+    for item in items_list:
+        if get_value(item) is None:
+            without_value.append(item)
+        else:
+            with_value.append(item)
+
+    select = heapq.nlargest if descending else heapq.nsmallest
+    selected = select(k, with_value, key=get_value)
+
+    if len(selected) < k:
+        selected.extend(without_value[:k - len(selected)])
+    return selected
@@ -1,3 +1,6 @@
+from operator import attrgetter, methodcaller
+
+
 def bubble_sort(items_list: list, key: str = None, descending: bool = False):
     n = len(items_list)
     for i in range(n - 1, 0, -1):
@@ -29,6 +32,171 @@ def bubble_sort(items_list: list, key: str = None, descending: bool = False):
             
     return items_list
 
+
+def _resolve_key_getter(items_list: list, key):
+    # resolve o acessor uma unica vez por chamada (funcao, atributo ou chave de dicionario)
+    if callable(key):
+        return key
+    if hasattr(items_list[0], key):
+        return attrgetter(key)
+    return methodcaller('get', key)
+
+
+def fast_sort(items_list: list, key: str = None, descending: bool = False):
+    # mesma assinatura do bubble_sort, mas O(n log n) usando o timsort nativo (estavel)
+    if not items_list:
+        return items_list
+
+    get_value = _resolve_key_getter(items_list, key)
+
+    # itens sem valor vao para o final, preservando a ordem original entre eles
+    with_value = []
+    without_value = []
+    for item in items_list:
+        if get_value(item) is None:
+            without_value.append(item)
+        else:
+            with_value.append(item)
+
+    with_value.sort(key=get_value, reverse=descending)
+    items_list[:] = with_value + without_value
+    return items_list
+
+
+def _first_value(items_list: list, get_value):
+    for item in items_list:
+        value = get_value(item)
+        if value is not None:
+            return value
+    return None
+
+
+def _numeric_component(get_value, descending: bool):
+    # valores ausentes viram infinito e ficam no final nos dois sentidos
+    infinity = float('inf')
+    if descending:
+        return lambda item: infinity if get_value(item) is None else -get_value(item)
+    return lambda item: infinity if get_value(item) is None else get_value(item)
+
+
+def _generic_component(get_value):
+    # (ausente, valor): ausentes no final sem comparar None com outros tipos
+    def component(item):
+        value = get_value(item)
+        return (value is None, value)
+    return component
+
+
+def compile_sort_key(items_list: list, sort_keys: list):
+    # compila [(key, descending), ...] em uma unica chave de tupla
+    # retorna None quando algum criterio decrescente nao e numerico (nao da para negar)
+    if not items_list:
+        return None
+
+    components = []
+    for key, descending in sort_keys:
+        get_value = _resolve_key_getter(items_list, key)
+        sample = _first_value(items_list, get_value)
+        if isinstance(sample, (int, float)) or sample is None:
+            components.append(_numeric_component(get_value, descending))
+        elif descending:
+            return None
+        else:
+            components.append(_generic_component(get_value))
+
+    if len(components) == 1:
+        return components[0]
+    return lambda item: tuple([component(item) for component in components])
+
+
+def multi_key_sort(items_list: list, sort_keys: list):
+    # ordenacao estavel por varios criterios: uma passada estavel por criterio, do menos para o
+    # mais significativo, cada uma com o acessor nativo como chave (sem montar tuplas por item)
+    if not items_list:
+        return items_list
+
+    for key, descending in reversed(sort_keys):
+        get_value = _resolve_key_getter(items_list, key)
+        if None in map(get_value, items_list):
+            # ausentes vao para o final da passada
+            fast_sort(items_list, key=get_value, descending=descending)
+        else:
+            items_list.sort(key=get_value, reverse=descending)
+    return items_list
+
+
+def multi_key_bubble_sort(items_list: list, sort_keys: list):
+    # mesma ordem do multi_key_sort com passadas do bubble_sort (estavel)
+    if not items_list:
+        return items_list
+
+    for key, descending in reversed(sort_keys):
+        bubble_sort(items_list, key=key, descending=descending)
+    return items_list
+
+
+def bucket_sort(items_list: list, key, categories, descending: bool = False):
+    # ordenacao estavel O(n + k) para chaves categoricas pequenas (ex: faixa de preco)
+    # categories define a ordem crescente; valores fora dela vao para o final
+    if not items_list:
+        return items_list
+
+    get_value = _resolve_key_getter(items_list, key)
+    bucket_index = {category: index for index, category in enumerate(categories)}
+    buckets = [[] for _ in bucket_index]
+    overflow = []
+
+    for item in items_list:
+        index = bucket_index.get(get_value(item))
+        if index is None:
+            overflow.append(item)
+        else:
+            buckets[index].append(item)
+
+    if descending:
+        buckets.reverse()
+
+    items_list[:] = [item for bucket in buckets for item in bucket] + overflow
+    return items_list
+
+
+def numpy_sort(items_list: list, key: str = None, descending: bool = False):
+    # backend colunar: importado sob demanda porque numpy e opcional
+    from .columnar_algorithms import columnar_sort
+    return columnar_sort(items_list, key=key, descending=descending)
+
+
+def numpy_multi_key_sort(items_list: list, sort_keys: list):
+    from .columnar_algorithms import columnar_multi_key_sort
+    return columnar_multi_key_sort(items_list, sort_keys)
+
+
+# algoritmos de ordenacao disponiveis para o motor de recomendacoes
+SORT_ALGORITHMS = {
+    'bubble': bubble_sort,
+    'fast': fast_sort,
+    'numpy': numpy_sort,
+}
+
+# variante de varios criterios ([(key, descending), ...]) de cada algoritmo
+MULTI_KEY_SORT_ALGORITHMS = {
+    'bubble': multi_key_bubble_sort,
+    'fast': multi_key_sort,
+    'numpy': numpy_multi_key_sort,
+}
+
+
+def get_sort_algorithm(name: str):
+    if name not in SORT_ALGORITHMS:
+        raise ValueError(f"algoritmo de ordenacao desconhecido: {name}")
+    return SORT_ALGORITHMS[name]
+
+
+def get_multi_key_sort_algorithm(name: str):
+    if name not in MULTI_KEY_SORT_ALGORITHMS:
+        raise ValueError(f"algoritmo de ordenacao desconhecido: {name}")
+    return MULTI_KEY_SORT_ALGORITHMS[name]
+
 ### Exemplo de Uso:
 
 if __name__ == '__main__':
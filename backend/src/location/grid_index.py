@@ -0,0 +1,200 @@
+import math
+import threading
+from itertools import product
+from typing import NamedTuple
+
+from utils.geo_utils import (
+    KM_PER_DEGREE, RADIANS_PER_DEGREE, calculate_distance, calculate_distances_batch, distance_to_bounds
+)
+from .spatial_index import BOUNDARY_SLACK_KM
+
+
+# celulas por raio em GridIndex.for_radius: uma consulta visita cerca de 5x5 celulas
+CELLS_PER_RADIUS = 2
+
+# margem relativa no teste celula x circulo (o ponto mais proximo da celula e aproximado)
+CELL_DISTANCE_MARGIN = 0.01
+
+
+class _Entry(NamedTuple):
+    sequence: int
+    restaurant: object
+    latitude: float
+    longitude: float
+
+
+class GridIndex:
+    # grade uniforme em graus: cada restaurante fica no balde (linha, coluna) da sua celula
+    # inserir, remover e substituir sao O(1); consultas por raio so visitam as celulas
+    # que intersectam o circulo e confirmam as distancias com haversine em lote
+    # um lock interno permite a ingestao ao vivo (GoogleMapsService) durante as consultas
+
+    def __init__(self, cell_size_km: float = 1.0, restaurants: list = None):
+        if cell_size_km <= 0:
+            raise ValueError("tamanho da celula deve ser positivo")
+        self.cell_size_km = cell_size_km
+        self.cell_size_degrees = cell_size_km / KM_PER_DEGREE
+        self.columns = math.ceil(360 / self.cell_size_degrees)
+        self._cells = {}
+        self._locations = {}
+        self._sequence = 0
+        self._lock = threading.RLock()
+        if restaurants:
+            self.add_many(restaurants)
+
+    @classmethod
+    def for_radius(cls, radius_km: float, restaurants: list = None):
+        # escolhe o tamanho da celula a partir do raio tipico das consultas
+        return cls(radius_km / CELLS_PER_RADIUS, restaurants)
+
+    def __len__(self):
+        return len(self._locations)
+
+    def __contains__(self, restaurant_id):
+        return restaurant_id in self._locations
+
+    def cell_of(self, lat: float, lon: float):
+        row = math.floor((lat + 90) / self.cell_size_degrees)
+        column = math.floor((lon + 180) / self.cell_size_degrees) % self.columns
+        return row, column
+
+    def add(self, restaurant):
+        # insere ou substitui (pelo id) um restaurante
+        lat, lon = restaurant.latitude, restaurant.longitude
+        if lat is None or lon is None or not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ValueError(f"coordenadas invalidas para o restaurante {restaurant.id}")
+
+        cell = self.cell_of(lat, lon)
+        with self._lock:
+            self.remove(restaurant.id)
+            entry = _Entry(self._sequence, restaurant, lat, lon)
+            self._sequence += 1
+            self._cells.setdefault(cell, {})[restaurant.id] = entry
+            self._locations[restaurant.id] = cell
+
+    def add_many(self, restaurants: list):
+        for restaurant in restaurants:
+            self.add(restaurant)
+
+    def remove(self, restaurant_id):
+        with self._lock:
+            cell = self._locations.pop(restaurant_id, None)
+            if cell is None:
+                return False
+            bucket = self._cells[cell]
+            del bucket[restaurant_id]
+            if not bucket:
+                del self._cells[cell]
+            return True
+
+    def count_in_cell(self, lat: float, lon: float):
+        return len(self._cells.get(self.cell_of(lat, lon), ()))
+
+    def cell_counts(self):
+        # quantidade de restaurantes por celula ocupada
+        with self._lock:
+            return {cell: len(bucket) for cell, bucket in self._cells.items()}
+
+    def density(self, lat: float, lon: float):
+        # restaurantes por km2 na celula do ponto
+        row, _ = self.cell_of(lat, lon)
+        lat_low, lat_high, _, _ = self._cell_bounds((row, 0))
+        middle = (lat_low + lat_high) * 0.5
+        area = self.cell_size_km * self.cell_size_km * max(math.cos(middle * RADIANS_PER_DEGREE), 1e-9)
+        return self.count_in_cell(lat, lon) / area
+
+    def _cell_bounds(self, cell):
+        row, column = cell
+        size = self.cell_size_degrees
+        lat_low = -90 + row * size
+        lon_low = -180 + column * size
+        return lat_low, min(lat_low + size, 90), lon_low, min(lon_low + size, 180)
+
+    def _candidate_cells(self, lat: float, lon: float, km: float):
+        # celulas ocupadas na caixa que envolve o circulo
+        span = km / KM_PER_DEGREE
+        lat_low, lat_high = max(lat - span, -90), min(lat + span, 90)
+        rows = range(self.cell_of(lat_low, 0)[0], self.cell_of(lat_high, 0)[0] + 1)
+
+        widest = max(abs(lat_low), abs(lat_high)) * RADIANS_PER_DEGREE
+        lon_span = span / math.cos(widest) if widest < math.pi / 2 else 360
+        if lon_span >= 180:
+            columns = range(self.columns)
+        else:
+            # o intervalo de longitudes e partido em +-180 quando o circulo cruza o antimeridiano
+            # (360 / cell_size_degrees nao e inteiro: a ultima coluna e parcial)
+            west, east = lon - lon_span, lon + lon_span
+            if west < -180:
+                intervals = [(west + 360, 180), (-180, east)]
+            elif east > 180:
+                intervals = [(west, 180), (-180, east - 360)]
+            else:
+                intervals = [(west, east)]
+            columns = sorted({
+                column % self.columns
+                for low, high in intervals
+                for column in range(math.floor((low + 180) / self.cell_size_degrees),
+                                    math.floor((high + 180) / self.cell_size_degrees) + 1)
+            })
+
+        with self._lock:
+            if len(rows) * len(columns) <= len(self._cells):
+                return [cell for cell in product(rows, columns) if cell in self._cells]
+            row_set, column_set = set(rows), set(columns)
+            return [cell for cell in self._cells if cell[0] in row_set and cell[1] in column_set]
+
+    def _nearest_distance(self, lat: float, lon: float, cell):
+        return distance_to_bounds(lat, lon, *self._cell_bounds(cell))
+
+    def _farthest_distance(self, lat: float, lon: float, cell):
+        lat_low, lat_high, lon_low, lon_high = self._cell_bounds(cell)
+        return max(calculate_distance(lat, lon, corner_lat, corner_lon)
+                   for corner_lat in (lat_low, lat_high) for corner_lon in (lon_low, lon_high))
+
+    def cells_in_radius(self, lat: float, lon: float, km: float):
+        # celulas ocupadas que intersectam o circulo
+        limit = km * (1 + CELL_DISTANCE_MARGIN) + BOUNDARY_SLACK_KM
+        return [cell for cell in self._candidate_cells(lat, lon, km)
+                if self._nearest_distance(lat, lon, cell) <= limit]
+
+    def estimate_count(self, lat: float, lon: float, km: float):
+        # limite superior do numero de restaurantes no raio, sem calcular distancias
+        with self._lock:
+            return sum(len(self._cells[cell]) for cell in self.cells_in_radius(lat, lon, km))
+
+    def radius_for_count(self, lat: float, lon: float, count: int, max_radius_km: float):
+        # menor raio (ate max_radius_km) que cobre celulas inteiras com pelo menos count
+        # restaurantes; None se nem max_radius_km chega la
+        with self._lock:
+            distances = sorted(
+                (self._farthest_distance(lat, lon, cell), len(self._cells[cell]))
+                for cell in self.cells_in_radius(lat, lon, max_radius_km)
+            )
+        total = 0
+        for distance, cell_count in distances:
+            if distance > max_radius_km:
+                break
+            total += cell_count
+            if total >= count:
+                return distance
+        return None
+
+    def query_radius(self, lat: float, lon: float, km: float):
+        # restaurantes a ate km do ponto, como (restaurante, distancia_km),
+        # ordenados por distancia e depois por ordem de insercao
+        if km < 0:
+            raise ValueError("raio deve ser positivo")
+
+        candidates = []
+        with self._lock:
+            for cell in self.cells_in_radius(lat, lon, km):
+                candidates.extend(self._cells[cell].values())
+
+        distances = calculate_distances_batch(
+            lat, lon,
+            [entry.latitude for entry in candidates],
+            [entry.longitude for entry in candidates]
+        ).tolist()
+        matches = [(distance, entry) for distance, entry in zip(distances, candidates) if distance <= km]
+        matches.sort(key=lambda match: (match[0], match[1].sequence))
+        return [(entry.restaurant, distance) for distance, entry in matches]
@@ -0,0 +1,105 @@
+import heapq
+
+from utils.geo_utils import (
+    calculate_distances_batch, calculate_bearings_batch, positions_in_sector,
+    point_segment_distances_batch, prepare_coordinates
+)
+
+
+class LinearScan:
+    # mesmas consultas do SpatialIndex (raio, setor, corredor, k vizinhos) por varredura em lote
+    # para listas usadas em uma unica requisicao: construir a arvore custa mais do que varrer
+    # uma vez; os resultados saem na mesma ordem do indice (distancia e depois ordem de insercao)
+
+    def __init__(self, restaurants: list = None):
+        entries = {}
+        for restaurant in restaurants or ():
+            lat, lon = restaurant.latitude, restaurant.longitude
+            if lat is None or lon is None or not (-90 <= lat <= 90 and -180 <= lon <= 180):
+                raise ValueError(f"coordenadas invalidas para o restaurante {restaurant.id}")
+            # mesmo id substitui o anterior e vai para o fim da ordem, como no indice
+            entries.pop(restaurant.id, None)
+            entries[restaurant.id] = restaurant
+
+        self.restaurants = list(entries.values())
+        self._prepared = prepare_coordinates(
+            [restaurant.latitude for restaurant in self.restaurants],
+            [restaurant.longitude for restaurant in self.restaurants]
+        )
+        self._last_point = None
+        self._last_distances = None
+
+    def __len__(self):
+        return len(self.restaurants)
+
+    def _distances(self, lat: float, lon: float):
+        # as distancias do ultimo ponto sao reaproveitadas (a busca em grupo repete o centro)
+        if self._last_point != (lat, lon):
+            self._last_distances = calculate_distances_batch(lat, lon, prepared=self._prepared).tolist()
+            self._last_point = (lat, lon)
+        return self._last_distances
+
+    def _within(self, lat: float, lon: float, km: float):
+        if km < 0:
+            raise ValueError("raio deve ser positivo")
+        if not self.restaurants:
+            return []
+        return sorted((distance, i) for i, distance in enumerate(self._distances(lat, lon)) if distance <= km)
+
+    def query_radius(self, lat: float, lon: float, km: float):
+        # restaurantes a ate km do ponto, como (restaurante, distancia_km),
+        # ordenados por distancia e depois por ordem de insercao
+        return [(self.restaurants[i], distance) for distance, i in self._within(lat, lon, km)]
+
+    def query_sector(self, lat: float, lon: float, km: float, bearing: float, width_degrees: float = 90.0):
+        # restaurantes de query_radius dentro do setor de rumos centrado em bearing
+        # (um restaurante no proprio ponto sempre entra)
+        matches = self._within(lat, lon, km)
+        bearings = calculate_bearings_batch(
+            lat, lon,
+            [self.restaurants[i].latitude for _, i in matches],
+            [self.restaurants[i].longitude for _, i in matches]
+        )
+        inside = set(positions_in_sector(bearings, bearing, width_degrees))
+        return [(self.restaurants[i], distance) for position, (distance, i) in enumerate(matches)
+                if position in inside or distance == 0.0]
+
+    def query_corridor(self, route: list, km: float):
+        # restaurantes a ate km de uma rota (lista de pontos (lat, lon)), como
+        # (restaurante, distancia_km ate a rota); a distancia e o minimo sobre os trechos
+        if km < 0:
+            raise ValueError("raio deve ser positivo")
+        points = [(lat, lon) for lat, lon in route]
+        if len(points) <= 1:
+            return self.query_radius(*points[0], km) if points else []
+        if not self.restaurants:
+            return []
+
+        nearest = None
+        for (lat1, lon1), (lat2, lon2) in zip(points, points[1:]):
+            distances = point_segment_distances_batch(lat1, lon1, lat2, lon2, prepared=self._prepared).tolist()
+            nearest = distances if nearest is None else list(map(min, nearest, distances))
+
+        matches = sorted((distance, i) for i, distance in enumerate(nearest) if distance <= km)
+        return [(self.restaurants[i], distance) for distance, i in matches]
+
+    def query_knn(self, lat: float, lon: float, k: int):
+        # os k restaurantes mais proximos, como (restaurante, distancia_km)
+        if k <= 0 or not self.restaurants:
+            return []
+        nearest = heapq.nsmallest(k, zip(self._distances(lat, lon), range(len(self.restaurants))))
+        return [(self.restaurants[i], distance) for distance, i in nearest]
+
+    def iter_nearest(self, lat: float, lon: float, max_km: float = None):
+        # gera (restaurante, distancia_km) do mais proximo para o mais distante, sob demanda;
+        # heap com todas as distancias: so os itens consumidos pagam o log n
+        if not self.restaurants:
+            return
+        heap = [
+            (distance, i) for i, distance in enumerate(self._distances(lat, lon))
+            if max_km is None or distance <= max_km
+        ]
+        heapq.heapify(heap)
+        while heap:
+            distance, i = heapq.heappop(heap)
+            yield self.restaurants[i], distance
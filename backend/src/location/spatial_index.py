@@ -0,0 +1,410 @@
+import heapq
+import math
+from typing import NamedTuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy e opcional: sem ele a arvore e construida com sort em listas
+    np = None
+
+from utils.geo_utils import (
+    EARTH_RADIUS_KM, RADIANS_PER_DEGREE, calculate_distance, calculate_distances_batch, calculate_bearings_batch,
+    positions_in_sector, point_segment_distances_batch
+)
+
+
+# folga para nao perder pontos na fronteira do raio (distancias sao arredondadas em 4 casas)
+BOUNDARY_SLACK_KM = 0.0001
+
+
+class _Entry(NamedTuple):
+    sequence: int
+    id: object
+    restaurant: object
+    latitude: float
+    longitude: float
+    x: float
+    y: float
+    z: float
+
+
+def _to_unit_vector(lat: float, lon: float):
+    # coordenadas 3d na esfera unitaria: a distancia em linha reta (corda)
+    # cresce junto com a distancia de haversine, entao serve para podar a arvore
+    lat_rad = lat * RADIANS_PER_DEGREE
+    lon_rad = lon * RADIANS_PER_DEGREE
+    cos_lat = math.cos(lat_rad)
+    return cos_lat * math.cos(lon_rad), cos_lat * math.sin(lon_rad), math.sin(lat_rad)
+
+
+def _chord_length(km: float):
+    angle = min(km / EARTH_RADIUS_KM, math.pi)
+    return 2 * math.sin(angle * 0.5)
+
+
+def _chord_to_km(chord: float):
+    return 2 * EARTH_RADIUS_KM * math.asin(min(chord * 0.5, 1.0))
+
+
+def _box_distance_sq(point, bounds):
+    # quadrado da menor distancia entre o ponto e a caixa (0 se estiver dentro)
+    total = 0.0
+    for axis in range(3):
+        value = point[axis]
+        if value < bounds[axis]:
+            delta = bounds[axis] - value
+        elif value > bounds[axis + 3]:
+            delta = value - bounds[axis + 3]
+        else:
+            continue
+        total += delta * delta
+    return total
+
+
+def _boxes_overlap(first, second):
+    return all(first[axis] <= second[axis + 3] and second[axis] <= first[axis + 3] for axis in range(3))
+
+
+def _in_box(entry, box):
+    return (box[0] <= entry.x <= box[3] and box[1] <= entry.y <= box[4] and box[2] <= entry.z <= box[5])
+
+
+def _segment_box(start, end, margin: float):
+    # caixa que contem o arco entre start e end mais margin (corda) em volta: o arco se afasta
+    # da corda no maximo a flecha 1 - cos(angulo / 2)
+    half_chord = math.sqrt(sum((p - q) * (p - q) for p, q in zip(start, end))) * 0.5
+    sagitta = 1 - math.sqrt(max(1 - half_chord * half_chord, 0.0))
+    pad = margin + sagitta
+    return (tuple(min(p, q) - pad for p, q in zip(start, end))
+            + tuple(max(p, q) + pad for p, q in zip(start, end)))
+
+
+class SpatialIndex:
+    # kd-tree sobre os restaurantes em coordenadas da esfera unitaria
+    # cada no guarda a caixa dos seus pontos; as folhas sao faixas contiguas de _tree_entries
+    # insercoes vao para um buffer pendente e remocoes viram entradas obsoletas,
+    # e a arvore so e reconstruida quando esse lixo passa de rebuild_ratio do tamanho
+
+    def __init__(self, restaurants: list = None, leaf_size: int = 16, rebuild_ratio: float = 0.25):
+        self.leaf_size = leaf_size
+        self.rebuild_ratio = rebuild_ratio
+        self._entries = {}
+        self._sequence = 0
+        self._tree_entries = []
+        self._node_bounds = []
+        self._node_ranges = []
+        self._node_children = []
+        self._pending = []
+        self._stale = 0
+        if restaurants:
+            for restaurant in restaurants:
+                self._insert(restaurant)
+            self.rebuild()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, restaurant_id):
+        return restaurant_id in self._entries
+
+    def _insert(self, restaurant):
+        lat, lon = restaurant.latitude, restaurant.longitude
+        if lat is None or lon is None or not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ValueError(f"coordenadas invalidas para o restaurante {restaurant.id}")
+
+        entry = _Entry(self._sequence, restaurant.id, restaurant, lat, lon, *_to_unit_vector(lat, lon))
+        self._sequence += 1
+        if restaurant.id in self._entries:
+            self._stale += 1
+        self._entries[restaurant.id] = entry
+        self._pending.append(entry)
+
+    def add(self, restaurant):
+        # insere ou substitui (pelo id) um restaurante
+        self._insert(restaurant)
+        self._maybe_rebuild()
+
+    def add_many(self, restaurants: list):
+        for restaurant in restaurants:
+            self._insert(restaurant)
+        self._maybe_rebuild()
+
+    def remove(self, restaurant_id):
+        if self._entries.pop(restaurant_id, None) is None:
+            return False
+        self._stale += 1
+        self._maybe_rebuild()
+        return True
+
+    def _is_live(self, entry):
+        return self._entries.get(entry.id) is entry
+
+    def _maybe_rebuild(self):
+        garbage = len(self._pending) + self._stale
+        if garbage > max(self.leaf_size, self.rebuild_ratio * len(self._tree_entries)):
+            self.rebuild()
+
+    def rebuild(self):
+        # reconstroi a arvore com as entradas vivas, na ordem de insercao
+        entries = sorted(self._entries.values())
+        self._node_bounds = []
+        self._node_ranges = []
+        self._node_children = []
+        self._pending = []
+        self._stale = 0
+
+        # a construcao trabalha sobre posicoes, com numpy quando disponivel
+        self._axes = (
+            [entry.x for entry in entries],
+            [entry.y for entry in entries],
+            [entry.z for entry in entries]
+        )
+        self._order = list(range(len(entries)))
+        if np is not None:
+            self._axes = np.array(self._axes)
+            self._order = np.arange(len(entries))
+        if entries:
+            self._build_node(0, len(entries))
+            if np is not None:
+                self._fill_leaf_bounds()
+        self._tree_entries = [entries[position] for position in list(self._order)]
+        del self._axes, self._order
+
+    def _build_node(self, start: int, end: int):
+        node = len(self._node_bounds)
+        if np is not None and end - start <= self.leaf_size:
+            # caixas das folhas sao calculadas de uma vez em _fill_leaf_bounds
+            self._node_bounds.append(None)
+            self._node_ranges.append((start, end))
+            self._node_children.append(None)
+            return node
+
+        positions = self._order[start:end]
+        if np is not None:
+            coords = self._axes[:, positions]
+            lows = coords.min(axis=1).tolist()
+            highs = coords.max(axis=1).tolist()
+        else:
+            lows = []
+            highs = []
+            for values in self._axes:
+                axis_values = list(map(values.__getitem__, positions))
+                lows.append(min(axis_values))
+                highs.append(max(axis_values))
+        self._node_bounds.append(tuple(lows + highs))
+        self._node_ranges.append((start, end))
+        self._node_children.append(None)
+
+        if end - start <= self.leaf_size:
+            return node
+
+        # dividir na mediana do eixo de maior extensao
+        axis = max(range(3), key=lambda i: highs[i] - lows[i])
+        middle = (start + end) // 2
+        if np is not None:
+            self._order[start:end] = positions[np.argpartition(coords[axis], middle - start)]
+        else:
+            positions.sort(key=self._axes[axis].__getitem__)
+            self._order[start:end] = positions
+        left = self._build_node(start, middle)
+        right = self._build_node(middle, end)
+        self._node_children[node] = (left, right)
+        return node
+
+    def _fill_leaf_bounds(self):
+        leaves = [node for node, children in enumerate(self._node_children) if children is None]
+        starts = [self._node_ranges[node][0] for node in leaves]
+        coords = self._axes[:, self._order]
+        lows = np.minimum.reduceat(coords, starts, axis=1).T.tolist()
+        highs = np.maximum.reduceat(coords, starts, axis=1).T.tolist()
+        for node, low, high in zip(leaves, lows, highs):
+            self._node_bounds[node] = tuple(low + high)
+
+    def _collect(self, lat: float, lon: float, km: float):
+        # todas as entradas vivas a ate km (mais a folga), com a distancia exata de haversine
+        point = _to_unit_vector(lat, lon)
+        limit = _chord_length(km + BOUNDARY_SLACK_KM)
+        limit_sq = limit * limit
+
+        candidates = []
+        stack = [0] if self._node_bounds else []
+        while stack:
+            node = stack.pop()
+            if _box_distance_sq(point, self._node_bounds[node]) > limit_sq:
+                continue
+            children = self._node_children[node]
+            if children is None:
+                start, end = self._node_ranges[node]
+                candidates.extend(self._tree_entries[start:end])
+            else:
+                stack.extend(children)
+        candidates.extend(self._pending)
+        candidates = [entry for entry in candidates if self._is_live(entry)]
+
+        distances = calculate_distances_batch(
+            lat, lon,
+            [entry.latitude for entry in candidates],
+            [entry.longitude for entry in candidates]
+        ).tolist()
+        matches = list(zip(distances, candidates))
+        matches.sort(key=lambda match: (match[0], match[1].sequence))
+        return matches
+
+    def query_radius(self, lat: float, lon: float, km: float):
+        # restaurantes a ate km do ponto, como (restaurante, distancia_km),
+        # ordenados por distancia e depois por ordem de insercao
+        if km < 0:
+            raise ValueError("raio deve ser positivo")
+        return [(entry.restaurant, distance) for distance, entry in self._collect(lat, lon, km)
+                if distance <= km]
+
+    def query_sector(self, lat: float, lon: float, km: float, bearing: float, width_degrees: float = 90.0):
+        # restaurantes a ate km do ponto e dentro do setor de rumos centrado em bearing,
+        # como (restaurante, distancia_km) na ordem de query_radius; os rumos dos candidatos
+        # do raio sao calculados em lote (um restaurante no proprio ponto sempre entra)
+        if km < 0:
+            raise ValueError("raio deve ser positivo")
+        matches = [(distance, entry) for distance, entry in self._collect(lat, lon, km) if distance <= km]
+        bearings = calculate_bearings_batch(
+            lat, lon,
+            [entry.latitude for _, entry in matches],
+            [entry.longitude for _, entry in matches]
+        )
+        inside = set(positions_in_sector(bearings, bearing, width_degrees))
+        return [(entry.restaurant, distance) for i, (distance, entry) in enumerate(matches)
+                if i in inside or distance == 0.0]
+
+    def _collect_box(self, box):
+        # entradas vivas dentro da caixa (coordenadas da esfera unitaria)
+        candidates = [entry for entry in self._pending if _in_box(entry, box)]
+        stack = [0] if self._node_bounds else []
+        while stack:
+            node = stack.pop()
+            if not _boxes_overlap(box, self._node_bounds[node]):
+                continue
+            children = self._node_children[node]
+            if children is None:
+                start, end = self._node_ranges[node]
+                candidates.extend(entry for entry in self._tree_entries[start:end] if _in_box(entry, box))
+            else:
+                stack.extend(children)
+        return [entry for entry in candidates if self._is_live(entry)]
+
+    def query_corridor(self, route: list, km: float):
+        # restaurantes a ate km de uma rota (lista de pontos (lat, lon)), como
+        # (restaurante, distancia_km ate a rota), ordenados por distancia e ordem de insercao;
+        # cada trecho poda a arvore pela sua caixa e mede as distancias em lote
+        if km < 0:
+            raise ValueError("raio deve ser positivo")
+        points = [(lat, lon) for lat, lon in route]
+        if len(points) <= 1:
+            return self.query_radius(*points[0], km) if points else []
+
+        margin = _chord_length(km + BOUNDARY_SLACK_KM)
+        best = {}
+        for (lat1, lon1), (lat2, lon2) in zip(points, points[1:]):
+            box = _segment_box(_to_unit_vector(lat1, lon1), _to_unit_vector(lat2, lon2), margin)
+            candidates = self._collect_box(box)
+            distances = point_segment_distances_batch(
+                lat1, lon1, lat2, lon2,
+                [entry.latitude for entry in candidates],
+                [entry.longitude for entry in candidates]
+            ).tolist()
+            for distance, entry in zip(distances, candidates):
+                if distance <= km:
+                    current = best.get(entry.sequence)
+                    if current is None or distance < current[0]:
+                        best[entry.sequence] = (distance, entry)
+
+        matches = sorted(best.values(), key=lambda match: (match[0], match[1].sequence))
+        return [(entry.restaurant, distance) for distance, entry in matches]
+
+    def _kth_nearest_km(self, point, k: int):
+        # busca best-first pela distancia do k-esimo vizinho (pela corda)
+        best = []
+        for entry in self._pending:
+            if self._is_live(entry):
+                self._keep_nearest(best, k, point, entry)
+
+        nodes = [(0.0, 0)] if self._node_bounds else []
+        while nodes:
+            box_distance, node = heapq.heappop(nodes)
+            if len(best) == k and box_distance > -best[0]:
+                break
+            children = self._node_children[node]
+            if children is None:
+                start, end = self._node_ranges[node]
+                for entry in self._tree_entries[start:end]:
+                    if self._is_live(entry):
+                        self._keep_nearest(best, k, point, entry)
+            else:
+                for child in children:
+                    heapq.heappush(nodes, (_box_distance_sq(point, self._node_bounds[child]), child))
+
+        if not best:
+            return None
+        return _chord_to_km(math.sqrt(-best[0]))
+
+    @staticmethod
+    def _distance_sq(point, entry):
+        # quadrado da corda entre o ponto e a entrada
+        dx = entry.x - point[0]
+        dy = entry.y - point[1]
+        dz = entry.z - point[2]
+        return dx * dx + dy * dy + dz * dz
+
+    @classmethod
+    def _keep_nearest(cls, best: list, k: int, point, entry):
+        distance_sq = cls._distance_sq(point, entry)
+        if len(best) < k:
+            heapq.heappush(best, -distance_sq)
+        elif distance_sq < -best[0]:
+            heapq.heapreplace(best, -distance_sq)
+
+    def query_knn(self, lat: float, lon: float, k: int):
+        # os k restaurantes mais proximos, como (restaurante, distancia_km)
+        # a distancia do k-esimo vizinho vira um raio, refinado com haversine exato
+        if k <= 0:
+            return []
+        kth_km = self._kth_nearest_km(_to_unit_vector(lat, lon), k)
+        if kth_km is None:
+            return []
+        return [(entry.restaurant, distance) for distance, entry in self._collect(lat, lon, kth_km)[:k]]
+
+    def iter_nearest(self, lat: float, lon: float, max_km: float = None):
+        # gera (restaurante, distancia_km) do mais proximo para o mais distante, sob demanda:
+        # nos e pontos dividem a mesma fila de prioridade e um ponto so sai quando nenhuma
+        # caixa ainda nao aberta pode conter algo mais perto (o indice nao deve mudar durante a iteracao)
+        point = _to_unit_vector(lat, lon)
+        limit_sq = math.inf
+        if max_km is not None:
+            limit = _chord_length(max_km + BOUNDARY_SLACK_KM)
+            limit_sq = limit * limit
+
+        queue = []
+        for entry in self._pending:
+            if self._is_live(entry):
+                queue.append((self._distance_sq(point, entry), 0, entry.sequence, entry))
+        if self._node_bounds:
+            queue.append((_box_distance_sq(point, self._node_bounds[0]), 1, 0, None))
+        heapq.heapify(queue)
+
+        while queue:
+            distance_sq, is_node, key, entry = heapq.heappop(queue)
+            if distance_sq > limit_sq:
+                return
+            if not is_node:
+                distance = calculate_distance(lat, lon, entry.latitude, entry.longitude)
+                if max_km is None or distance <= max_km:
+                    yield entry.restaurant, distance
+                continue
+
+            children = self._node_children[key]
+            if children is None:
+                start, end = self._node_ranges[key]
+                for entry in self._tree_entries[start:end]:
+                    if self._is_live(entry):
+                        heapq.heappush(queue, (self._distance_sq(point, entry), 0, entry.sequence, entry))
+            else:
+                for child in children:
+                    heapq.heappush(queue, (_box_distance_sq(point, self._node_bounds[child]), 1, child, None))
@@ -7,9 +7,13 @@ from .restaurant import (
     restaurants_to_dicts,
     dicts_to_restaurants
 )
+from .restaurant_table import RestaurantTable
+from .restaurant_view import RestaurantView
 
 __all__ = [
     'Restaurant',
     'restaurants_to_dicts',
-    'dicts_to_restaurants'
+    'dicts_to_restaurants',
+    'RestaurantTable',
+    'RestaurantView'
 ]
@@ -3,15 +3,53 @@ modelo de dados para restaurantes do projeto sabora
 define a estrutura de dados central para restaurantes
 """
 
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, asdict, field
+from typing import Dict, Any, Optional, List, Union
+from dataclasses import dataclass, field
 
+from nlp.cuisine_taxonomy import CuisineFilter, compile_cuisine_filter, cuisine_filter_matches
+from nlp.cuisine_taxonomy import cuisine_mask as label_cuisine_mask
 
-@dataclass
+
+# valores ordinais das faixas de preco (faixas desconhecidas contam como medio)
+PRICE_RANGE_VALUES = {
+    'baixo': 1,
+    'medio': 2,
+    'medio-alto': 3,
+    'alto': 4
+}
+DEFAULT_PRICE_VALUE = PRICE_RANGE_VALUES['medio']
+
+
+def cuisine_matches(
+    cuisine_type: str,
+    cuisine_types: Union[List[str], CuisineFilter, None],
+    mask: Optional[int] = None
+) -> bool:
+    """
+    verifica se um tipo de culinaria atende ao filtro de culinaria
+    
+    Args:
+        cuisine_type: tipo de culinaria do restaurante
+        cuisine_types: tipos de culinaria desejados, ou o filtro ja compilado por
+            compile_cuisine_filter (para compilar uma vez por requisicao)
+        mask: mascara de culinaria guardada na ingestao (None calcula pelo rotulo)
+        
+    Returns:
+        true se atender ao filtro
+    """
+    if not isinstance(cuisine_types, CuisineFilter):
+        cuisine_types = compile_cuisine_filter(cuisine_types)
+    return cuisine_filter_matches(cuisine_type, cuisine_types, mask)
+
+
+@dataclass(slots=True)
 class Restaurant:
     """
     modelo de dados para restaurantes
     
+    usa __slots__ (sem __dict__ por instancia): menos memoria por restaurante e acesso
+    mais rapido aos campos; atributos fora da lista abaixo nao podem ser criados
+    
     Attributes:
         id: identificador unico do restaurante
         name: nome do restaurante
@@ -29,6 +67,9 @@ class Restaurant:
         distance_formatted: distancia formatada para exibicao
         rank: posicao na lista de recomendacoes
         recommendation_score: score de recomendacao (0-100)
+        cuisine_mask: mascara de bits das culinarias da taxonomia, classificada na ingestao
+            (None calcula a partir de cuisine_type); derivada do rotulo, fica fora da
+            comparacao e da serializacao
     """
     
     id: int
@@ -47,28 +88,65 @@ class Restaurant:
     distance_formatted: Optional[str] = None
     rank: Optional[int] = None
     recommendation_score: Optional[float] = None
+    cuisine_mask: Optional[int] = field(default=None, compare=False)
     
     def to_dict(self) -> Dict[str, Any]:
         """
         converte o objeto para dicionario
         
+        montado campo a campo, sem a copia recursiva de dataclasses.asdict;
+        so a lista de caracteristicas e copiada
+        
         Returns:
             dicionario com os dados do restaurante
         """
-        return asdict(self)
+        features = self.features
+        return {
+            'id': self.id,
+            'name': self.name,
+            'latitude': self.latitude,
+            'longitude': self.longitude,
+            'rating': self.rating,
+            'cuisine_type': self.cuisine_type,
+            'price_range': self.price_range,
+            'address': self.address,
+            'phone': self.phone,
+            'website': self.website,
+            'opening_hours': self.opening_hours,
+            'features': list(features) if features is not None else None,
+            'distance': self.distance,
+            'distance_formatted': self.distance_formatted,
+            'rank': self.rank,
+            'recommendation_score': self.recommendation_score
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Restaurant':
         """
         cria um objeto restaurant a partir de um dicionario
         
+        a mascara de culinarias nao e lida do dicionario: e recalculada a partir de cuisine_type
+        
         Args:
             data: dicionario com dados do restaurante
             
         Returns:
             objeto restaurant
         """
-        return cls(**data)
+        restaurant = cls(**{key: value for key, value in data.items() if key != 'cuisine_mask'})
+        if restaurant.cuisine_type:
+            restaurant.cuisine_mask = label_cuisine_mask(restaurant.cuisine_type)
+        return restaurant
+    
+    @property
+    def price_value(self) -> int:
+        """
+        valor ordinal da faixa de preco (1 = baixo, 4 = alto)
+        
+        Returns:
+            valor numerico da faixa de preco
+        """
+        return PRICE_RANGE_VALUES.get(self.price_range.lower(), DEFAULT_PRICE_VALUE)
     
     def update_distance(self, distance: float, distance_formatted: str) -> None:
         """
@@ -115,53 +193,17 @@ class Restaurant:
             return False
         return self.distance <= radius_km
     
-    def matches_cuisine_filter(self, cuisine_types: List[str]) -> bool:
+    def matches_cuisine_filter(self, cuisine_types: Union[List[str], CuisineFilter, None]) -> bool:
         """
         verifica se o restaurante atende ao filtro de culinaria
         
         Args:
-            cuisine_types: tipos de culinaria desejados
+            cuisine_types: tipos de culinaria desejados (ou filtro compilado)
             
         Returns:
             true se atender ao filtro
         """
-        if not cuisine_types:
-            return True
-        
-        restaurant_cuisine = self.cuisine_type.lower()
-        
-        # Verificar se algum dos tipos de culinária desejados está presente no restaurante
-        for cuisine in cuisine_types:
-            cuisine_lower = cuisine.lower()
-            
-            # Verificar se o tipo de culinária está contido no nome do tipo do restaurante
-            if cuisine_lower in restaurant_cuisine:
-                return True
-            
-            # Verificar correspondências específicas
-            cuisine_matches = {
-                'japonesa': ['japonesa', 'japonês', 'japanese', 'sushi', 'temaki', 'sashimi', 'yaki', 'izakaya', 'oriental'],
-                'italiana': ['italiana', 'italian', 'pizza', 'pasta'],
-                'chinesa': ['chinesa', 'chinese', 'dim sum'],
-                'brasileira': ['brasileira', 'brazilian', 'brasileiro', 'pastel', 'pastelaria', 'churrasco', 'churrascaria', 'feijoada', 'nordestina', 'nordestino', 'regional'],
-                'mexicana': ['mexicana', 'mexican', 'taco', 'burrito'],
-                'indiana': ['indiana', 'indian', 'curry'],
-                'árabe': ['árabe', 'arabic', 'kebab', 'shawarma'],
-                'mediterrânea': ['mediterrânea', 'mediterranean', 'hummus'],
-                'frutos do mar': ['frutos do mar', 'seafood', 'peixe', 'camarão', 'ceviche'],
-                'vegana': ['vegana', 'vegan', 'vegetariana', 'vegetarian'],
-                'fast food': ['fast food', 'fast-food', 'hamburguer'],
-                'padaria': ['padaria', 'bakery', 'pão'],
-                'café': ['café', 'cafe', 'coffee'],
-                'bar': ['bar', 'pub', 'cervejaria']
-            }
-            
-            if cuisine_lower in cuisine_matches:
-                for match_term in cuisine_matches[cuisine_lower]:
-                    if match_term in restaurant_cuisine:
-                        return True
-        
-        return False
+        return cuisine_matches(self.cuisine_type, cuisine_types, self.cuisine_mask)
     
     def matches_price_filter(self, price_range: str) -> bool:
         """
@@ -0,0 +1,298 @@
+"""
+modelo colunar de restaurantes do projeto sabora
+guarda um conjunto de candidatos como colunas (struct-of-arrays) em vez de um objeto por linha
+"""
+
+from typing import Dict, Any, Optional, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy e opcional: sem ele a tabela colunar fica indisponivel
+    np = None
+
+from .restaurant import Restaurant, PRICE_RANGE_VALUES, DEFAULT_PRICE_VALUE
+from .restaurant_view import RestaurantView
+from nlp.cuisine_taxonomy import compile_cuisine_filter, cuisine_mask
+from utils.geo_utils import MICRODEGREES_PER_DEGREE, PackedCoordinates, format_distance
+from algorithms.columnar_algorithms import columnar_lexsort, columnar_top_k
+
+
+# colunas numericas da tabela e seus tipos (coordenadas em microgradus, como em pack_coordinates)
+NUMERIC_COLUMNS = {
+    'row': 'intp',
+    'lat_e6': 'int32',
+    'lon_e6': 'int32',
+    'rating': 'float64',
+    'price_value': 'int8',
+    'price_code': 'int16',
+    'cuisine_code': 'int32',
+    'cuisine_mask': 'int64',
+    'distance': 'float64',
+}
+
+
+# microgradus das coordenadas ausentes ou fora dos limites (nenhuma coordenada valida chega la)
+INVALID_MICRODEGREES = -2 ** 31
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("numpy e necessario para RestaurantTable")
+
+
+def _microdegrees(values: Sequence[Optional[float]], limit: float):
+    # graus -> microgradus int32; ausentes, nan e fora de [-limit, limit] viram INVALID_MICRODEGREES
+    degrees = np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        valid = (degrees >= -limit) & (degrees <= limit)
+    packed = np.full(len(degrees), INVALID_MICRODEGREES, dtype=np.int32)
+    packed[valid] = np.rint(degrees[valid] * MICRODEGREES_PER_DEGREE)
+    return packed
+
+
+def _intern(values: Sequence[str]) -> Tuple[List[int], List[str]]:
+    # codigos inteiros para valores repetidos (cada texto distinto guardado uma vez)
+    codes = {}
+    encoded = [codes.setdefault(value, len(codes)) for value in values]
+    return encoded, list(codes)
+
+
+class RestaurantTable:
+    """
+    conjunto de restaurantes em colunas numpy
+
+    coordenadas (microgradus int32, 8 bytes por linha), nota, preco (ordinal e codigo), culinaria
+    (codigo e mascara da taxonomia) e distancia sao arrays; ids, nomes, enderecos e os campos opcionais continuam nos
+    restaurantes de origem, acessados pela coluna row (a tabela guarda a referencia da lista,
+    sem copiar os textos). filtrar, ordenar e fatiar so reindexam as colunas numericas, sem
+    criar objetos por linha; to_restaurants e to_dicts materializam apenas a pagina final
+
+    Attributes:
+        columns: colunas numericas (veja NUMERIC_COLUMNS), todas com o mesmo tamanho
+        cuisine_names: texto de cada codigo de culinaria
+        price_names: texto de cada codigo de faixa de preco
+    """
+
+    __slots__ = ('columns', 'cuisine_names', 'price_names', '_records')
+
+    def __init__(
+        self,
+        columns: Dict[str, Any],
+        cuisine_names: List[str],
+        price_names: List[str],
+        records: List[Restaurant]
+    ):
+        self.columns = columns
+        self.cuisine_names = cuisine_names
+        self.price_names = price_names
+        self._records = records
+
+    @classmethod
+    def from_restaurants(cls, restaurants: List[Restaurant]) -> 'RestaurantTable':
+        """
+        monta a tabela a partir de uma lista de restaurantes
+
+        Args:
+            restaurants: lista de objetos restaurant (nota e distancia ausentes viram nan,
+                coordenadas ausentes ou invalidas viram INVALID_MICRODEGREES); a tabela le a
+                lista, que nao deve mudar depois
+
+        Returns:
+            tabela com uma linha por restaurante, na mesma ordem
+
+        Raises:
+            ImportError: se numpy nao estiver instalado
+        """
+        _require_numpy()
+        cuisine_codes, cuisine_names = _intern([restaurant.cuisine_type for restaurant in restaurants])
+        price_codes, price_names = _intern([restaurant.price_range for restaurant in restaurants])
+        label_masks = [cuisine_mask(name) for name in cuisine_names]
+
+        def floats(values):
+            return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+        columns = {
+            'row': np.arange(len(restaurants), dtype=np.intp),
+            'lat_e6': _microdegrees([restaurant.latitude for restaurant in restaurants], 90),
+            'lon_e6': _microdegrees([restaurant.longitude for restaurant in restaurants], 180),
+            'rating': floats([restaurant.rating for restaurant in restaurants]),
+            'price_value': np.array(
+                [PRICE_RANGE_VALUES.get(name.lower(), DEFAULT_PRICE_VALUE) for name in price_names],
+                dtype=np.int8
+            )[np.array(price_codes, dtype=np.intp)],
+            'price_code': np.array(price_codes, dtype=np.int16),
+            'cuisine_code': np.array(cuisine_codes, dtype=np.int32),
+            # culinarias da taxonomia atendidas por cada linha: a mascara guardada na ingestao,
+            # ou a do rotulo (calculada uma vez por rotulo distinto) para restaurantes sem ela
+            'cuisine_mask': np.array([
+                label_masks[code] if restaurant.cuisine_mask is None else restaurant.cuisine_mask
+                for restaurant, code in zip(restaurants, cuisine_codes)
+            ], dtype=np.int64),
+            'distance': floats([restaurant.distance for restaurant in restaurants]),
+        }
+        return cls(columns, cuisine_names, price_names, restaurants)
+
+    def __len__(self):
+        return len(self.columns['row'])
+
+    def __getitem__(self, key):
+        # fatia (ou array de indices/mascara) vira uma nova tabela sobre os mesmos restaurantes
+        return self._derive({name: values[key] for name, values in self.columns.items()})
+
+    def _derive(self, columns: Dict[str, Any]) -> 'RestaurantTable':
+        return RestaurantTable(columns, self.cuisine_names, self.price_names, self._records)
+
+    @property
+    def ids(self) -> list:
+        """ids das linhas, na ordem atual da tabela"""
+        return [self._records[row].id for row in self.columns['row'].tolist()]
+
+    def take(self, indices) -> 'RestaurantTable':
+        """
+        seleciona (e reordena) linhas pelas posicoes
+
+        Args:
+            indices: posicoes das linhas na ordem desejada
+
+        Returns:
+            nova tabela com as linhas selecionadas
+        """
+        return self[np.asarray(indices, dtype=np.intp)]
+
+    def filter(self, mask) -> 'RestaurantTable':
+        """
+        mantem as linhas em que a mascara booleana e verdadeira, na ordem atual
+
+        Args:
+            mask: array booleano do tamanho da tabela
+
+        Returns:
+            nova tabela com as linhas aprovadas
+        """
+        return self.take(np.flatnonzero(mask))
+
+    def with_distances(self, distances) -> 'RestaurantTable':
+        """
+        substitui a coluna de distancias (em km)
+
+        Args:
+            distances: uma distancia por linha
+
+        Returns:
+            nova tabela com as distancias informadas
+        """
+        columns = dict(self.columns)
+        columns['distance'] = np.asarray(distances, dtype=np.float64)
+        return self._derive(columns)
+
+    @property
+    def packed(self) -> PackedCoordinates:
+        """coordenadas das linhas no formato de pack_coordinates, sem copia (para os calculos com packed=)"""
+        return PackedCoordinates(self.columns['lat_e6'], self.columns['lon_e6'])
+
+    def valid_coordinates_mask(self):
+        """
+        mascara das linhas com latitude e longitude dentro dos limites validos
+
+        Returns:
+            array booleano (ausentes e nan contam como invalidos)
+        """
+        return (self.columns['lat_e6'] != INVALID_MICRODEGREES) & (self.columns['lon_e6'] != INVALID_MICRODEGREES)
+
+    def filter_by(
+        self,
+        max_distance: Optional[float] = None,
+        min_rating: Optional[float] = None,
+        cuisine_types: Optional[List[str]] = None,
+        price_range: Optional[str] = None
+    ) -> 'RestaurantTable':
+        """
+        aplica os filtros do modelo restaurant (matches_*_filter) em colunas
+
+        culinaria e um e bit a bit sobre a coluna cuisine_mask (termos fora da taxonomia e o
+        preco sao avaliados uma vez por codigo distinto e espalhados pelas linhas)
+
+        Args:
+            max_distance: distancia maxima em km
+            min_rating: nota minima
+            cuisine_types: tipos de culinaria desejados
+            price_range: faixa de preco desejada
+
+        Returns:
+            nova tabela so com as linhas aprovadas
+        """
+        mask = np.ones(len(self), dtype=bool)
+        with np.errstate(invalid='ignore'):
+            if max_distance is not None:
+                mask &= self.columns['distance'] <= max_distance
+            if min_rating:
+                mask &= self.columns['rating'] >= min_rating
+        compiled = compile_cuisine_filter(cuisine_types)
+        if compiled is not None:
+            accepted = (self.columns['cuisine_mask'] & compiled.mask) != 0
+            if compiled.substrings:
+                by_code = np.array([
+                    any(substring in name.lower() for substring in compiled.substrings)
+                    for name in self.cuisine_names
+                ], dtype=bool)
+                accepted |= by_code[self.columns['cuisine_code']]
+            mask &= accepted
+        if price_range:
+            wanted = price_range.lower()
+            accepted = np.array([name.lower() == wanted for name in self.price_names], dtype=bool)
+            mask &= accepted[self.columns['price_code']]
+        return self.filter(mask)
+
+    def _sort_columns(self, keys: List[Tuple[str, bool]]):
+        return [(self.columns[name].astype(np.float64, copy=False), descending) for name, descending in keys]
+
+    def sort(self, keys: List[Tuple[str, bool]]) -> 'RestaurantTable':
+        """
+        ordena de forma estavel por varias colunas
+
+        Args:
+            keys: [(coluna, descending), ...] do criterio mais para o menos significativo
+
+        Returns:
+            nova tabela ordenada (nan fica no final)
+        """
+        return self.take(columnar_lexsort(self._sort_columns(keys)))
+
+    def top_k(self, keys: List[Tuple[str, bool]], k: int) -> 'RestaurantTable':
+        """
+        as k primeiras linhas na ordem de sort, sem ordenar a tabela inteira
+
+        Args:
+            keys: [(coluna, descending), ...] do criterio mais para o menos significativo
+            k: quantidade de linhas
+
+        Returns:
+            nova tabela com ate k linhas
+        """
+        return self.take(columnar_top_k(self._sort_columns(keys), k))
+
+    def to_restaurants(self) -> List[RestaurantView]:
+        """
+        materializa as linhas como visoes dos restaurantes de origem (com distancia formatada, se houver)
+
+        Returns:
+            lista de RestaurantView, na ordem da tabela
+        """
+        rows = self.columns['row'].tolist()
+        distances = self.columns['distance'].tolist()
+        views = []
+        for row, distance in zip(rows, distances):
+            if distance == distance:
+                views.append(RestaurantView(self._records[row], distance, format_distance(distance)))
+            else:  # nan: distancia nao calculada
+                views.append(RestaurantView(self._records[row]))
+        return views
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        converte as linhas para dicionarios no formato de Restaurant.to_dict
+
+        Returns:
+            lista de dicionarios
+        """
+        return [restaurant.to_dict() for restaurant in self.to_restaurants()]
@@ -0,0 +1,122 @@
+"""
+visao de um restaurante com as anotacoes de uma requisicao
+distancia, posicao e score ficam na visao; o restaurante base e compartilhado e nunca alterado
+"""
+
+from typing import Dict, Any, Optional
+
+from .restaurant import Restaurant
+
+
+class RestaurantView:
+    """
+    anotacoes por requisicao (distancia, posicao e score) sobre um restaurante compartilhado
+
+    os demais campos e metodos (nome, nota, price_value, matches_*_filter, ...) sao lidos do
+    restaurante base, que nao pode ser alterado pela visao. cada requisicao cria as proprias
+    visoes, entao requisicoes concorrentes sobre o mesmo catalogo nao interferem entre si
+
+    Attributes:
+        restaurant: restaurante base (compartilhado)
+        distance: distancia ate o usuario em km
+        distance_formatted: distancia formatada para exibicao
+        rank: posicao na lista de recomendacoes
+        recommendation_score: score de recomendacao (0-100)
+    """
+
+    __slots__ = ('restaurant', 'distance', 'distance_formatted', 'rank', 'recommendation_score')
+
+    def __init__(
+        self,
+        restaurant: Restaurant,
+        distance: Optional[float] = None,
+        distance_formatted: Optional[str] = None,
+        rank: Optional[int] = None,
+        recommendation_score: Optional[float] = None
+    ):
+        if isinstance(restaurant, RestaurantView):
+            # nao encadear visoes: a nova visao aponta direto para o restaurante base
+            restaurant = restaurant.restaurant
+        self.restaurant = restaurant
+        self.distance = distance
+        self.distance_formatted = distance_formatted
+        self.rank = rank
+        self.recommendation_score = recommendation_score
+
+    def __getattr__(self, name: str):
+        # so e chamado para nomes fora dos slots: campos e metodos do restaurante base
+        if name == 'restaurant':
+            raise AttributeError(name)
+        return getattr(self.restaurant, name)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (RestaurantView, Restaurant)):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (
+            f"RestaurantView({self.restaurant!r}, distance={self.distance!r}, "
+            f"rank={self.rank!r}, recommendation_score={self.recommendation_score!r})"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        converte para dicionario no formato de Restaurant.to_dict, com as anotacoes da visao
+
+        Returns:
+            dicionario com os dados do restaurante
+        """
+        data = self.restaurant.to_dict()
+        data['distance'] = self.distance
+        data['distance_formatted'] = self.distance_formatted
+        data['rank'] = self.rank
+        data['recommendation_score'] = self.recommendation_score
+        return data
+
+    def update_distance(self, distance: float, distance_formatted: str) -> None:
+        """
+        atualiza a distancia da visao
+
+        Args:
+            distance: distancia em quilometros
+            distance_formatted: distancia formatada
+        """
+        self.distance = distance
+        self.distance_formatted = distance_formatted
+
+    def update_rank(self, rank: int) -> None:
+        """
+        atualiza a posicao da visao na lista
+
+        Args:
+            rank: posicao na lista
+        """
+        self.rank = rank
+
+    def update_recommendation_score(self, score: float) -> None:
+        """
+        atualiza o score de recomendacao da visao
+
+        Args:
+            score: score de recomendacao (0-100)
+        """
+        self.recommendation_score = score
+
+    def is_within_radius(self, center_lat: float, center_lon: float, radius_km: float) -> bool:
+        """
+        verifica se a distancia da visao esta dentro do raio
+
+        Args:
+            center_lat: latitude do centro (nao usada, a distancia ja foi calculada)
+            center_lon: longitude do centro (nao usada, a distancia ja foi calculada)
+            radius_km: raio em quilometros
+
+        Returns:
+            true se a distancia for conhecida e estiver dentro do raio
+        """
+        if self.distance is None:
+            return False
+        return self.distance <= radius_km
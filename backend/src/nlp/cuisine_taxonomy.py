@@ -0,0 +1,229 @@
+"""
+taxonomia de culinarias do projeto sabora
+um unico vocabulario compilado: nomes e tipos do google viram rotulos de culinaria, e cada rotulo
+vira uma mascara de bits com os codigos das culinarias que ele atende
+"""
+
+import re
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from algorithms.name_index import normalize_text
+
+
+# termos que contam como correspondencia para cada culinaria do filtro; a posicao define o codigo
+CUISINE_TERMS = {
+    'japonesa': ('japonesa', 'japonês', 'japanese', 'sushi', 'temaki', 'sashimi', 'yaki', 'izakaya', 'oriental'),
+    'italiana': ('italiana', 'italian', 'pizza', 'pasta'),
+    'chinesa': ('chinesa', 'chinese', 'dim sum'),
+    'brasileira': ('brasileira', 'brazilian', 'brasileiro', 'pastel', 'pastelaria', 'churrasco', 'churrascaria',
+                   'feijoada', 'nordestina', 'nordestino', 'regional'),
+    'mexicana': ('mexicana', 'mexican', 'taco', 'burrito'),
+    'indiana': ('indiana', 'indian', 'curry'),
+    'árabe': ('árabe', 'arabe', 'arabic', 'kebab', 'shawarma'),
+    'mediterrânea': ('mediterrânea', 'mediterranea', 'mediterranean', 'hummus'),
+    'frutos do mar': ('frutos do mar', 'seafood', 'peixe', 'camarão', 'ceviche'),
+    'vegana': ('vegana', 'vegan', 'vegetariana', 'vegetarian'),
+    'fast food': ('fast food', 'fast-food', 'hamburguer'),
+    'padaria': ('padaria', 'bakery', 'pão'),
+    'café': ('café', 'cafe', 'coffee'),
+    'bar': ('bar', 'pub', 'cervejaria'),
+}
+
+CUISINES = tuple(CUISINE_TERMS)
+CUISINE_CODES = {name: code for code, name in enumerate(CUISINES)}
+
+# nomes aceitos no filtro (com e sem acento, como nas chaves de nlp.synonyms.CULINARIA) -> codigo
+FILTER_CODES = {
+    **{normalize_text(name): code for name, code in CUISINE_CODES.items()},
+    **CUISINE_CODES,
+}
+
+# rotulo exibido de cada culinaria da taxonomia (cada rotulo atende a propria culinaria no filtro)
+CUISINE_LABELS = {
+    'japonesa': 'Japonesa',
+    'italiana': 'Italiana',
+    'chinesa': 'Chinesa',
+    'brasileira': 'Brasileira',
+    'mexicana': 'Mexicana',
+    'indiana': 'Indiana',
+    'árabe': 'Árabe',
+    'mediterrânea': 'Mediterrânea',
+    'frutos do mar': 'Frutos do Mar',
+    'vegana': 'Vegana',
+    'fast food': 'Fast Food',
+    'padaria': 'Padaria',
+    'café': 'Café',
+    'bar': 'Bar',
+}
+
+# palavras-chave do nome do lugar -> rotulo, derivadas de CUISINE_TERMS; a primeira que comecar
+# uma palavra do nome vence ("pão" nao casa com "Japão", "pub" nao casa com "República")
+NAME_KEYWORDS = tuple(
+    (re.compile(r'\b' + re.escape(term)), CUISINE_LABELS[cuisine])
+    for cuisine, terms in CUISINE_TERMS.items()
+    for term in terms
+)
+
+DEFAULT_CUISINE_LABEL = 'Restaurante'
+
+# tipos do google places -> culinaria da taxonomia
+GOOGLE_TYPE_CUISINES = {
+    'italian_restaurant': 'italiana',
+    'japanese_restaurant': 'japonesa',
+    'chinese_restaurant': 'chinesa',
+    'indian_restaurant': 'indiana',
+    'mexican_restaurant': 'mexicana',
+    'brazilian_restaurant': 'brasileira',
+    'seafood_restaurant': 'frutos do mar',
+    'steakhouse': 'brasileira',
+    'pizza_restaurant': 'italiana',
+    'bakery': 'padaria',
+    'cafe': 'café',
+    'bar': 'bar',
+    'fast_food': 'fast food',
+}
+
+# tipos do google places -> rotulo (o primeiro tipo conhecido da lista vence); os tipos fora
+# da taxonomia tem rotulo proprio e mascara vazia
+GOOGLE_TYPE_LABELS = {
+    'restaurant': DEFAULT_CUISINE_LABEL,
+    'thai_restaurant': 'Tailandesa',
+    **{type_name: CUISINE_LABELS[cuisine] for type_name, cuisine in GOOGLE_TYPE_CUISINES.items()},
+}
+
+
+class CuisineFilter(NamedTuple):
+    """filtro de culinaria compilado: mascara dos codigos pedidos e termos fora da taxonomia"""
+    mask: int
+    substrings: Tuple[str, ...]
+
+
+def classify_place(types: Sequence[str], name: str = "") -> str:
+    """
+    rotulo de culinaria de um lugar, pelo nome (mais preciso) e depois pelos tipos do google
+
+    Args:
+        types: lista de tipos do google places
+        name: nome do restaurante
+
+    Returns:
+        rotulo de culinaria (DEFAULT_CUISINE_LABEL se nada for reconhecido)
+    """
+    if name:
+        name_lower = name.lower()
+        for pattern, label in NAME_KEYWORDS:
+            if pattern.search(name_lower):
+                return label
+
+    for type_name in types:
+        label = GOOGLE_TYPE_LABELS.get(type_name)
+        if label is not None:
+            return label
+
+    return DEFAULT_CUISINE_LABEL
+
+
+def classify_place_with_mask(types: Sequence[str], name: str = "") -> Tuple[str, int]:
+    """
+    rotulo e mascara de culinaria de um lugar, para guardar no restaurante na ingestao
+
+    Args:
+        types: lista de tipos do google places
+        name: nome do restaurante
+
+    Returns:
+        (rotulo, mascara de bits das culinarias atendidas pelo rotulo)
+    """
+    label = classify_place(types, name)
+    return label, cuisine_mask(label)
+
+
+@lru_cache(maxsize=4096)
+def cuisine_mask(cuisine_type: str) -> int:
+    """
+    mascara de bits das culinarias atendidas por um rotulo (calculada uma vez por rotulo distinto)
+
+    Args:
+        cuisine_type: tipo de culinaria do restaurante (ex: "Pizzaria")
+
+    Returns:
+        inteiro com o bit 1 << codigo de cada culinaria cujo termo aparece no rotulo
+    """
+    label = cuisine_type.lower()
+    mask = 0
+    for code, terms in enumerate(CUISINE_TERMS.values()):
+        if any(term in label for term in terms):
+            mask |= 1 << code
+    return mask
+
+
+def compile_cuisine_filter(cuisine_types: Optional[List[str]]) -> Optional[CuisineFilter]:
+    """
+    compila os tipos pedidos em mascara de codigos (o resultado e reaproveitado entre chamadas)
+
+    Args:
+        cuisine_types: tipos de culinaria desejados
+
+    Returns:
+        filtro compilado, ou None se nao houver filtro
+    """
+    if not cuisine_types:
+        return None
+    return _compile_cuisine_filter(tuple(cuisine_types))
+
+
+@lru_cache(maxsize=256)
+def _compile_cuisine_filter(cuisine_types: Tuple[str, ...]) -> CuisineFilter:
+    # memoizado: os filtros vindos do parser se repetem entre restaurantes e requisicoes
+    mask = 0
+    substrings = []
+    for cuisine in cuisine_types:
+        cuisine_lower = cuisine.lower()
+        code = FILTER_CODES.get(cuisine_lower)
+        if code is None:
+            # fora da taxonomia: vale a busca do texto dentro do rotulo
+            substrings.append(cuisine_lower)
+        else:
+            mask |= 1 << code
+    return CuisineFilter(mask, tuple(substrings))
+
+
+def cuisine_filter_matches(
+    cuisine_type: str, compiled: Optional[CuisineFilter], mask: Optional[int] = None
+) -> bool:
+    """
+    verifica um rotulo contra um filtro compilado
+
+    Args:
+        cuisine_type: tipo de culinaria do restaurante
+        compiled: filtro de compile_cuisine_filter (None aceita tudo)
+        mask: mascara ja calculada na ingestao (None calcula a partir do rotulo)
+
+    Returns:
+        true se o rotulo atender ao filtro
+    """
+    if compiled is None:
+        return True
+    if mask is None:
+        mask = cuisine_mask(cuisine_type)
+    if mask & compiled.mask:
+        return True
+    if compiled.substrings:
+        label = cuisine_type.lower()
+        return any(substring in label for substring in compiled.substrings)
+    return False
+
+
+def cuisines_of(cuisine_type: str) -> List[str]:
+    """
+    nomes das culinarias atendidas por um rotulo (inverso de cuisine_mask, para exibicao e testes)
+
+    Args:
+        cuisine_type: tipo de culinaria do restaurante
+
+    Returns:
+        culinarias da taxonomia, na ordem dos codigos
+    """
+    mask = cuisine_mask(cuisine_type)
+    return [name for code, name in enumerate(CUISINES) if mask >> code & 1]
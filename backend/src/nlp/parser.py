@@ -22,6 +22,10 @@ class QueryParser:
         self.distance_pattern = re.compile(r'(\d+)\s*(km|quilometros?)', re.IGNORECASE)
         self.rating_pattern = re.compile(r'(nota|estrela).*?(\d+)', re.IGNORECASE)
         self.open_now_pattern = re.compile(r'(aberto|funcionando)', re.IGNORECASE)
+        self.direction_pattern = re.compile(
+            r'(na\s+dire[çc][ãa]o\s+d[oae]s?|no\s+caminho|a\s+caminho|no\s+sentido\s+d[oae]s?|rumo\s+a)',
+            re.IGNORECASE
+        )
     
     def set_cuisine_synonyms(self, synonyms: Dict[str, List[str]]) -> None:
         """
@@ -179,6 +183,18 @@ class QueryParser:
         """
         return bool(self.open_now_pattern.search(text))
     
+    def _find_direction(self, text: str) -> bool:
+        """
+        verifica se a consulta pede restaurantes numa direcao ("na direção do centro", "no caminho")
+        
+        Args:
+            text: texto da consulta
+            
+        Returns:
+            true se mencionar uma direcao ou trajeto
+        """
+        return bool(self.direction_pattern.search(text))
+    
     def _find_sort_preference(self, text: str) -> str:
         """
         extrai preferencia de ordenacao da consulta
@@ -187,15 +203,20 @@ class QueryParser:
             text: texto da consulta
             
         Returns:
-            preferencia de ordenacao: 'distance', 'rating', 'price_low', 'price_high', 'default'
+            preferencia de ordenacao: 'nearest', 'distance', 'rating', 'price_low', 'price_high', 'default'
         """
         text_lower = text.lower()
         
+        # Padrões para "o mais perto": k vizinhos mais próximos, sem raio fixo
+        nearest_patterns = [
+            'mais perto', 'mais próximo', 'mais proximo', 'mais próxima', 'mais proxima'
+        ]
+        
         # ✅ AMPLIANDO OS PADRÕES PARA DISTÂNCIA
         distance_patterns = [
             'perto', 'proximo', 'próximo', 'perto de mim', 'proximo de mim', 'próximo de mim',
             'na minha area', 'na minha área', 'na minha regiao', 'na minha região', 
-            'mais perto', 'mais próximo', 'aqui perto', 'vizinho', 'nas redondezas',
+            'aqui perto', 'vizinho', 'nas redondezas',
             'ao lado', 'região proxima', 'região próxima', 'na esquina', 'do lado',
             'distancia', 'distância', 'localização', 'localizacao'
         ]
@@ -233,6 +254,10 @@ class QueryParser:
             if pattern in text_lower:
                 return 'price_high'
         
+        for pattern in nearest_patterns:
+            if pattern in text_lower:
+                return 'nearest'
+        
         for pattern in distance_patterns:
             if pattern in text_lower:
                 return 'distance'
@@ -280,6 +305,7 @@ class QueryParser:
         
         # Mapeamento de preferências de ordenação para títulos
         sort_titles = {
+            "nearest": "mais próximos",
             "distance": "mais próximos",
             "rating": "melhores",
             "price_low": "mais baratos",
@@ -430,6 +456,11 @@ class QueryParser:
         
         # Mapeamento de preferências de ordenação para textos de resposta
         sort_responses = {
+            "nearest": {
+                "title": "Sua lista está pronta!",
+                "subtitle": "Estes são os restaurantes mais próximos de você.",
+                "description": "Prepare-se para se surpreender a cada prato."
+            },
             "distance": {
                 "title": "Sua lista está pronta!",
                 "subtitle": "Estes são os restaurantes mais próximos e saborosos perto de você.",
@@ -525,6 +556,7 @@ class QueryParser:
         distance = self._find_distance(text)
         min_rating = self._find_min_rating(text)
         open_now = self._find_open_now(text)
+        towards = self._find_direction(text)
         sort_preference = self._find_sort_preference(text)
         
         # construir resultado
@@ -545,6 +577,9 @@ class QueryParser:
         if open_now:
             result['open_now'] = open_now
         
+        if towards:
+            result['towards'] = towards
+        
         # Adicionar preferência de ordenação
         result['sort_preference'] = sort_preference
         
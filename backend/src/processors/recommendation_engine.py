@@ -3,42 +3,148 @@ orquestrador de recomendacoes do projeto sabora
 implementa logica central para gerar recomendacoes de restaurantes
 """
 
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Union
+from itertools import islice, takewhile
 import sys
 import os
+import threading
 
 # adicionar o diretorio src ao path para imports relativos
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from utils.geo_utils import calculate_distance, is_within_radius, format_distance, calculate_distance_from_dict
-from algorithms.sorting_algorithms import bubble_sort
+from utils.geo_utils import (
+    calculate_distance, is_within_radius, format_distance, calculate_distance_from_dict,
+    calculate_distances_batch, distances_within_radius, calculate_bearing, distance_matrix,
+    DISTANCE_MODES
+)
+from algorithms.sorting_algorithms import (
+    get_sort_algorithm, get_multi_key_sort_algorithm, compile_sort_key, bucket_sort
+)
+from algorithms.selection_algorithms import top_k
+from algorithms.merge_algorithms import k_way_merge
+from algorithms.columnar_algorithms import HAS_NUMPY, build_columns, columnar_top_k, materialize
 from algorithms.search_algorithms import binary_search
-from models.restaurant import Restaurant, restaurants_to_dicts
+from algorithms.name_index import NameIndex
+from models.restaurant import Restaurant, restaurants_to_dicts, dicts_to_restaurants, PRICE_RANGE_VALUES
+from models.restaurant_table import RestaurantTable
+from models.restaurant_view import RestaurantView
+from nlp.cuisine_taxonomy import compile_cuisine_filter
+from location.spatial_index import SpatialIndex
+from location.linear_scan import LinearScan
+from location.grid_index import GridIndex
 from services.google_maps_service import google_maps_service
 from services.cache_service import cache_service
 
 
+# ordenacao por nota com desempate deterministico: nota desc, distancia asc, preco asc
+RATING_SORT_KEYS = [('rating', True), ('distance', False), ('price_value', False)]
+
+# ordem crescente dos valores de preco usada na ordenacao por baldes
+PRICE_VALUE_ORDER = sorted(set(PRICE_RANGE_VALUES.values()))
+
+# a partir desta quantidade de candidatos o ranqueamento usa o backend colunar (numpy)
+COLUMNAR_THRESHOLD = 1000
+
+# abertura do setor de rumos nas buscas "na direcao de" (45 graus para cada lado)
+SECTOR_WIDTH_DEGREES = 90.0
+
+# raio minimo e maximo das buscas "na direcao de" (o padrao e a distancia ate o destino)
+SECTOR_MIN_RADIUS_KM = 1.0
+SECTOR_MAX_RADIUS_KM = 25.0
+
+# tamanho da celula da grade de densidade alimentada pela ingestao ao vivo
+DENSITY_CELL_KM = 1.0
+
+# limite de nomes no indice alimentado pela ingestao ao vivo (os atualizados ha mais tempo saem)
+NAME_INDEX_MAX_ITEMS = 50000
+
+# raio maximo da busca por palavra-chave (o mesmo pedido a api)
+KEYWORD_MAX_RADIUS_KM = 25.0
+
+# maximo de culinarias buscadas separadamente na api (uma chamada por culinaria)
+KEYWORD_MAX_SOURCES = 3
+
+# largura padrao (para cada lado) do corredor nas buscas ao longo de uma rota
+CORRIDOR_WIDTH_KM = 0.5
+
+# maximo de vertices aceitos numa rota enviada pela api
+ROUTE_MAX_POINTS = 500
+
+# objetivos da busca em grupo: menor distancia maxima ou menor soma das distancias
+GROUP_OBJECTIVES = ('max', 'sum')
+
+# raio inicial minimo da busca em grupo (o raio cresce ate achar candidatos suficientes)
+GROUP_MIN_RADIUS_KM = 1.0
+
+# maximo de usuarios aceitos numa busca em grupo pela api
+GROUP_MAX_USERS = 10
+
+
 class RecommendationEngine:
     """
     motor de recomendacoes que orquestra todo o processo de geracao de recomendacoes
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        sort_algorithm: str = 'fast',
+        columnar_threshold: Optional[int] = COLUMNAR_THRESHOLD,
+        distance_mode: str = 'exact',
+        live_ingestion: bool = False
+    ):
+        """
+        inicializa o motor de recomendacoes
+        
+        Args:
+            sort_algorithm: algoritmo de ordenacao ('fast' em producao, 'bubble' como referencia, 'numpy')
+            columnar_threshold: quantidade de candidatos a partir da qual o ranqueamento
+                usa colunas numpy (None desativa)
+            distance_mode: 'exact' (haversine para todos) ou 'approx' (aproximacao com limite
+                de erro e haversine so perto da borda do raio)
+            live_ingestion: se true, cada resposta do google maps atualiza a grade de
+                densidade do motor (usada para decidir o raio inicial da busca por palavra-chave)
+                e o indice de nomes (usado por search_by_name)
+        """
+        if distance_mode not in DISTANCE_MODES:
+            raise ValueError(f"modo de distancia desconhecido: {distance_mode}. opcoes: {', '.join(DISTANCE_MODES)}")
         self.restaurants = []
         self.user_location = None
+        self.sort_algorithm = sort_algorithm
+        self.sort_function = get_sort_algorithm(sort_algorithm)
+        self.multi_key_sort_function = get_multi_key_sort_algorithm(sort_algorithm)
+        self.columnar_threshold = columnar_threshold
+        self.distance_mode = distance_mode
+        self.spatial_index = None
+        self._restaurant_table = None
+        # protege o catalogo e os indices derivados dele (motor compartilhado entre requisicoes)
+        self._catalog_lock = threading.Lock()
+        # contagem por celula dos lugares ja vistos (a grade tem lock proprio)
+        self.density_index = GridIndex(DENSITY_CELL_KM)
+        # nomes dos lugares ja vistos, para a busca por nome sem varrer listas
+        self.name_index = NameIndex(max_items=NAME_INDEX_MAX_ITEMS)
+        if live_ingestion:
+            google_maps_service.attach_index(self.density_index)
+            google_maps_service.attach_index(self.name_index)
     
     def set_restaurants(self, restaurants: List[Restaurant]) -> None:
         """
-        define a lista de restaurantes disponiveis
+        define o catalogo de restaurantes do motor
+        
+        o indice espacial e a tabela colunar do catalogo sao construidos sob demanda, uma
+        vez por catalogo; as requisicoes nunca alteram o catalogo
         
         Args:
             restaurants: lista de objetos restaurant
         """
-        self.restaurants = restaurants
+        with self._catalog_lock:
+            self.restaurants = restaurants
+            self.spatial_index = None
+            self._restaurant_table = None
     
     def set_user_location(self, latitude: float, longitude: float) -> None:
         """
-        define a localizacao do usuario
+        define a localizacao padrao do usuario (os fluxos de recomendacao recebem a
+        localizacao por parametro e nao alteram este valor)
         
         Args:
             latitude: latitude do usuario
@@ -68,53 +174,440 @@ class RecommendationEngine:
             keyword=keyword
         )
     
-    def calculate_distances(self) -> List[Restaurant]:
+    def search_by_name(self, query: str, limit: Optional[int] = None) -> List[Restaurant]:
+        """
+        busca pelo nome (sem acentos, por trecho) entre os restaurantes ja recebidos da api
+        
+        Args:
+            query: trecho do nome
+            limit: numero maximo de resultados (None retorna todos)
+            
+        Returns:
+            restaurantes cujo nome contem o trecho, com os que comecam por ele primeiro
+        """
+        return self.name_index.search(query, limit)
+    
+    def calculate_distances(
+        self,
+        radius_km: Optional[float] = None,
+        restaurants: Optional[List[Restaurant]] = None,
+        user_location: Optional[Dict[str, float]] = None
+    ) -> List[RestaurantView]:
         """
         calcula a distancia entre o usuario e todos os restaurantes
         
+        cada candidato e uma RestaurantView: a distancia fica na visao e o restaurante do
+        catalogo e compartilhado sem copia nem alteracao
+        
+        Args:
+            radius_km: se informado, so os restaurantes a ate radius_km sao retornados
+                (no modo 'approx' so os da borda do raio usam haversine)
+            restaurants: candidatos da requisicao (padrao: catalogo do motor)
+            user_location: {'latitude', 'longitude'} do usuario (padrao: self.user_location)
+        
         Returns:
-            lista de restaurantes com distancia calculada
+            lista de visoes dos restaurantes com distancia calculada
         """
-        if not self.user_location or not self.restaurants:
+        if restaurants is None:
+            restaurants = self.restaurants
+        if user_location is None:
+            user_location = self.user_location
+        if not user_location or not restaurants:
             return []
         
-        restaurants_with_distance = []
-        
-        for restaurant in self.restaurants:
-            try:
-                # usar a funcao de calculo de distancia existente
-                distance = calculate_distance_from_dict(self.user_location, {
-                    'latitude': restaurant.latitude,
-                    'longitude': restaurant.longitude
-                })
-                
-                # criar copia do restaurante e atualizar distancia
-                restaurant_copy = Restaurant(
-                    id=restaurant.id,
-                    name=restaurant.name,
-                    latitude=restaurant.latitude,
-                    longitude=restaurant.longitude,
-                    rating=restaurant.rating,
-                    cuisine_type=restaurant.cuisine_type,
-                    price_range=restaurant.price_range,
-                    address=restaurant.address,
-                    phone=restaurant.phone,
-                    website=restaurant.website,
-                    opening_hours=restaurant.opening_hours,
-                    features=restaurant.features
+        latitude = user_location.get('latitude')
+        longitude = user_location.get('longitude')
+        
+        try:
+            # todas as distancias em uma unica chamada vetorizada
+            lats = [restaurant.latitude for restaurant in restaurants]
+            lons = [restaurant.longitude for restaurant in restaurants]
+            if radius_km is None:
+                distances = calculate_distances_batch(latitude, longitude, lats, lons).tolist()
+                positions = range(len(distances))
+            else:
+                positions, distances = distances_within_radius(
+                    latitude, longitude, radius_km, lats, lons, mode=self.distance_mode
                 )
-                restaurant_copy.update_distance(distance, format_distance(distance))
-                restaurants_with_distance.append(restaurant_copy)
-                
-            except (AttributeError, ValueError) as e:
-                print(f"erro ao calcular distancia para restaurante {restaurant.name}: {e}")
+            candidates = [(restaurants[i], distance) for i, distance in zip(positions, distances)]
+        except (TypeError, ValueError):
+            # alguma coordenada invalida: calcular um a um para descartar so os restaurantes com erro
+            candidates = None
+        
+        if candidates is None:
+            candidates = []
+            for restaurant in restaurants:
+                try:
+                    # usar a funcao de calculo de distancia existente
+                    distance = calculate_distance_from_dict(user_location, {
+                        'latitude': restaurant.latitude,
+                        'longitude': restaurant.longitude
+                    })
+                except (AttributeError, TypeError, ValueError) as e:
+                    print(f"erro ao calcular distancia para restaurante {restaurant.name}: {e}")
+                    continue
+                if radius_km is None or distance <= radius_km:
+                    candidates.append((restaurant, distance))
+        
+        return [self._with_distance(restaurant, distance) for restaurant, distance in candidates]
+    
+    def calculate_distances_table(
+        self,
+        radius_km: Optional[float] = None,
+        restaurants: Optional[List[Restaurant]] = None,
+        user_location: Optional[Dict[str, float]] = None
+    ) -> RestaurantTable:
+        """
+        calcula as distancias do usuario ate os restaurantes direto nas colunas de um RestaurantTable
+        
+        equivale a calculate_distances, mas sem criar um objeto por candidato; restaurantes com
+        coordenadas invalidas sao descartados pela mascara da tabela
+        
+        Args:
+            radius_km: se informado, so os restaurantes a ate radius_km sao mantidos
+            restaurants: candidatos da requisicao (padrao: catalogo do motor)
+            user_location: {'latitude', 'longitude'} do usuario (padrao: self.user_location)
+        
+        Returns:
+            tabela com a coluna distance preenchida, na ordem dos restaurantes
+        """
+        if user_location is None:
+            user_location = self.user_location
+        table = self._get_restaurant_table(restaurants)
+        if not user_location or not len(table):
+            return table[:0]
+        
+        valid = table.valid_coordinates_mask()
+        if not valid.all():
+            print(f"{int((~valid).sum())} restaurantes ignorados por coordenadas invalidas")
+            table = table.filter(valid)
+        
+        latitude = user_location.get('latitude')
+        longitude = user_location.get('longitude')
+        # as colunas ja estao em microgradus int32: os calculos leem direto delas
+        if radius_km is None:
+            return table.with_distances(calculate_distances_batch(latitude, longitude, packed=table.packed))
+        positions, distances = distances_within_radius(
+            latitude, longitude, radius_km, packed=table.packed, mode=self.distance_mode
+        )
+        return table.take(positions).with_distances(distances)
+    
+    def _get_restaurant_table(self, restaurants: Optional[List[Restaurant]] = None) -> RestaurantTable:
+        # a tabela do catalogo e montada uma vez e guardada; outras listas viram uma tabela local
+        with self._catalog_lock:
+            if restaurants is None or restaurants is self.restaurants:
+                if self._restaurant_table is None:
+                    self._restaurant_table = RestaurantTable.from_restaurants(self.restaurants)
+                return self._restaurant_table
+        return RestaurantTable.from_restaurants(restaurants)
+    
+    @staticmethod
+    def _with_distance(restaurant: Restaurant, distance: float) -> RestaurantView:
+        """
+        anota a distancia ate o usuario sem copiar o restaurante
+        
+        Args:
+            restaurant: restaurante do catalogo (compartilhado, nao e alterado)
+            distance: distancia em km
+        
+        Returns:
+            visao do restaurante com distancia preenchida
+        """
+        return RestaurantView(restaurant, distance, format_distance(distance))
+    
+    def build_spatial_index(self, restaurants: Optional[List[Restaurant]] = None) -> SpatialIndex:
+        """
+        constroi um indice espacial para as consultas de vizinhos mais proximos
+        
+        Args:
+            restaurants: restaurantes a indexar (padrao: catalogo do motor)
+        
+        Returns:
+            indice espacial construido (o motor nao guarda a referencia)
+        """
+        if restaurants is None:
+            restaurants = self.restaurants
+        return SpatialIndex(self._with_valid_coordinates(restaurants))
+    
+    @staticmethod
+    def _with_valid_coordinates(restaurants: List[Restaurant]) -> List[Restaurant]:
+        valid = []
+        for restaurant in restaurants:
+            lat, lon = restaurant.latitude, restaurant.longitude
+            if lat is None or lon is None or not (-90 <= lat <= 90 and -180 <= lon <= 180):
+                print(f"coordenadas invalidas para restaurante {restaurant.name}, fora do indice")
                 continue
+            valid.append(restaurant)
+        return valid
+    
+    def _spatial_index_for(self, restaurants: List[Restaurant]) -> Union[SpatialIndex, LinearScan]:
+        # o indice do catalogo e construido uma vez e so e lido pelas requisicoes; uma lista
+        # de uma unica requisicao e varrida em lote (construir a arvore custaria mais que a consulta)
+        with self._catalog_lock:
+            if restaurants is self.restaurants:
+                if self.spatial_index is None:
+                    self.spatial_index = self.build_spatial_index(restaurants)
+                return self.spatial_index
+        return LinearScan(self._with_valid_coordinates(restaurants))
+    
+    def _request_restaurants(
+        self,
+        restaurants: Optional[List[Restaurant]],
+        latitude: float,
+        longitude: float
+    ) -> List[Restaurant]:
+        # candidatos da requisicao: lista recebida, catalogo do motor ou busca na api
+        if restaurants is not None:
+            return restaurants
+        return self.restaurants or self.get_restaurants_from_api(latitude, longitude)
+    
+    @staticmethod
+    def _matches_filters(restaurant: Restaurant, filters: Optional[Dict[str, Any]]) -> bool:
+        # nota minima, culinaria e faixa de preco, como no fluxo por palavra-chave
+        if not filters:
+            return True
+        return (
+            restaurant.matches_rating_filter(filters.get('min_rating') or 0.0)
+            and restaurant.matches_cuisine_filter(filters.get('cuisine_types'))
+            and restaurant.matches_price_filter(filters.get('price_range'))
+        )
+    
+    def get_recommendations_towards(
+        self,
+        user_latitude: float,
+        user_longitude: float,
+        target_latitude: float,
+        target_longitude: float,
+        radius_km: Optional[float] = None,
+        max_results: int = 5,
+        filters: Dict[str, Any] = None,
+        sector_width_degrees: float = SECTOR_WIDTH_DEGREES,
+        restaurants: Optional[List[Restaurant]] = None
+    ) -> List[Restaurant]:
+        """
+        recomenda restaurantes no caminho do usuario ate um destino ("na direcao do centro")
         
-        return restaurants_with_distance
+        busca no indice espacial os restaurantes no raio e dentro do setor de rumos
+        apontado para o destino, do mais proximo para o mais distante
+        
+        Args:
+            user_latitude: latitude do usuario
+            user_longitude: longitude do usuario
+            target_latitude: latitude do destino
+            target_longitude: longitude do destino
+            radius_km: raio de busca (padrao: distancia ate o destino, entre 1 e 25 km)
+            max_results: numero maximo de resultados
+            filters: filtros de nota, culinaria e preco
+            sector_width_degrees: abertura total do setor em graus
+            restaurants: candidatos da requisicao (padrao: catalogo do motor ou api)
+        
+        Returns:
+            lista de restaurantes no setor, ordenados por distancia
+        """
+        restaurants = self._request_restaurants(restaurants, user_latitude, user_longitude)
+        if not restaurants:
+            return []
+        
+        if radius_km is None:
+            target_distance = calculate_distance(user_latitude, user_longitude, target_latitude, target_longitude)
+            radius_km = min(max(target_distance, SECTOR_MIN_RADIUS_KM), SECTOR_MAX_RADIUS_KM)
+        bearing = calculate_bearing(user_latitude, user_longitude, target_latitude, target_longitude)
+        
+        index = self._spatial_index_for(restaurants)
+        matches = index.query_sector(user_latitude, user_longitude, radius_km, bearing, sector_width_degrees)
+        recommendations = [
+            self._with_distance(restaurant, distance) for restaurant, distance in matches
+            if self._matches_filters(restaurant, filters)
+        ][:max_results]
+        
+        for i, restaurant in enumerate(recommendations):
+            restaurant.update_rank(i + 1)
+            restaurant.update_recommendation_score(self._calculate_recommendation_score(restaurant))
+        
+        return recommendations
+    
+    def get_recommendations_along_route(
+        self,
+        route: List[Tuple[float, float]],
+        corridor_km: float = CORRIDOR_WIDTH_KM,
+        max_results: int = 5,
+        filters: Dict[str, Any] = None,
+        restaurants: Optional[List[Restaurant]] = None
+    ) -> List[Restaurant]:
+        """
+        recomenda restaurantes a ate corridor_km de uma rota ("no caminho para casa", entregas)
+        
+        Args:
+            route: pontos (lat, lon) da rota, comecando na posicao do usuario
+            corridor_km: distancia maxima ate a rota
+            max_results: numero maximo de resultados
+            filters: filtros de nota, culinaria e preco
+            restaurants: candidatos da requisicao (padrao: catalogo do motor ou api)
+        
+        Returns:
+            lista de restaurantes no corredor, do mais proximo do usuario para o mais distante
+        """
+        if not route:
+            return []
+        user_latitude, user_longitude = route[0]
+        restaurants = self._request_restaurants(restaurants, user_latitude, user_longitude)
+        if not restaurants:
+            return []
+        
+        index = self._spatial_index_for(restaurants)
+        matches = [
+            restaurant for restaurant, _ in index.query_corridor(route, corridor_km)
+            if self._matches_filters(restaurant, filters)
+        ]
+        distances = calculate_distances_batch(
+            user_latitude, user_longitude,
+            [restaurant.latitude for restaurant in matches],
+            [restaurant.longitude for restaurant in matches]
+        ).tolist()
+        ordered = sorted(zip(distances, range(len(matches))))[:max_results]
+        recommendations = [self._with_distance(matches[i], distance) for distance, i in ordered]
+        
+        for i, restaurant in enumerate(recommendations):
+            restaurant.update_rank(i + 1)
+            restaurant.update_recommendation_score(self._calculate_recommendation_score(restaurant))
+        
+        return recommendations
+    
+    def get_group_recommendations(
+        self,
+        user_locations: List[Tuple[float, float]],
+        max_results: int = 5,
+        objective: str = 'max',
+        filters: Dict[str, Any] = None,
+        max_distance_km: float = 25.0,
+        restaurants: Optional[List[Restaurant]] = None
+    ) -> List[Restaurant]:
+        """
+        recomenda restaurantes para um grupo ("meio do caminho" entre varios usuarios)
+        
+        para um limite B do score, todo restaurante com score <= B esta a ate B de cada usuario
+        (intersecao dos raios) e, pela desigualdade triangular, a ate (B + soma_j d(u, u_j)) / n
+        do usuario u no objetivo 'sum'. o indice espacial busca nesse raio em volta do usuario
+        mais central, a matriz de distancias calcula os scores e B dobra ate haver max_results
+        restaurantes com score <= B, o que garante o mesmo resultado da varredura completa
+        
+        Args:
+            user_locations: pontos (lat, lon) de cada usuario
+            max_results: numero maximo de resultados
+            objective: 'max' (menor distancia maxima) ou 'sum' (menor soma das distancias)
+            filters: filtros de nota, culinaria e preco
+            max_distance_km: distancia maxima de qualquer usuario ate o restaurante
+            restaurants: candidatos da requisicao (padrao: catalogo do motor ou api em volta
+                do usuario mais central)
+        
+        Returns:
+            lista de restaurantes ordenados pelo objetivo; a distancia de cada um e a
+            maior distancia ate um usuario do grupo
+        """
+        if objective not in GROUP_OBJECTIVES:
+            raise ValueError(f"objetivo desconhecido: {objective}. opcoes: {', '.join(GROUP_OBJECTIVES)}")
+        if not user_locations or max_results <= 0:
+            return []
+        
+        # usuario mais central (menor soma de distancias ate os outros) como centro da busca
+        between_users = [list(row) for row in distance_matrix(user_locations, user_locations)]
+        spread, center = min((sum(row), i) for i, row in enumerate(between_users))
+        diameter = max(max(row) for row in between_users)
+        center_latitude, center_longitude = user_locations[center]
+        
+        restaurants = self._request_restaurants(restaurants, center_latitude, center_longitude)
+        if not restaurants:
+            return []
+        index = self._spatial_index_for(restaurants)
+        
+        size = len(user_locations)
+        if objective == 'max':
+            bound, limit = max(diameter * 0.5, GROUP_MIN_RADIUS_KM), max_distance_km
+        else:
+            bound, limit = max(diameter, GROUP_MIN_RADIUS_KM), max_distance_km * size
+        
+        while True:
+            bound = min(bound, limit)
+            reach = bound if objective == 'max' else (bound + spread) / size
+            candidates = [
+                restaurant for restaurant, _ in index.query_radius(center_latitude, center_longitude,
+                                                                   min(reach, max_distance_km))
+                if self._matches_filters(restaurant, filters)
+            ]
+            scored = []
+            if candidates:
+                # colunas = candidatos; so entram os que estao no raio de todos os usuarios
+                matrix = distance_matrix(user_locations, candidates)
+                columns = zip(*(matrix if isinstance(matrix, list) else matrix.tolist()))
+                for position, distances in enumerate(columns):
+                    farthest = max(distances)
+                    score = farthest if objective == 'max' else round(sum(distances), 4)
+                    if score <= bound and farthest <= max_distance_km:
+                        scored.append((score, farthest, position))
+            
+            if len(scored) >= max_results or bound >= limit:
+                break
+            bound *= 2
+        
+        scored.sort()
+        recommendations = [
+            self._with_distance(candidates[position], farthest)
+            for _, farthest, position in scored[:max_results]
+        ]
+        for i, restaurant in enumerate(recommendations):
+            restaurant.update_rank(i + 1)
+            restaurant.update_recommendation_score(self._calculate_recommendation_score(restaurant))
+        
+        return recommendations
+    
+    def get_nearest_recommendations(
+        self,
+        user_latitude: float,
+        user_longitude: float,
+        k: int = 5,
+        filters: Dict[str, Any] = None,
+        max_distance_km: Optional[float] = None,
+        restaurants: Optional[List[Restaurant]] = None
+    ) -> List[Restaurant]:
+        """
+        recomenda os k restaurantes mais proximos que passam nos filtros, sem raio fixo
+        
+        percorre o indice espacial do mais proximo para o mais distante e para assim que
+        encontra k aprovados, em vez de calcular e ordenar as distancias de todo o catalogo
+        
+        Args:
+            user_latitude: latitude do usuario
+            user_longitude: longitude do usuario
+            k: quantidade de restaurantes
+            filters: filtros de nota, culinaria e preco
+            max_distance_km: distancia maxima opcional
+            restaurants: candidatos da requisicao (padrao: catalogo do motor ou api)
+        
+        Returns:
+            lista com ate k restaurantes, do mais proximo para o mais distante
+        """
+        restaurants = self._request_restaurants(restaurants, user_latitude, user_longitude)
+        if not restaurants or k <= 0:
+            return []
+        
+        index = self._spatial_index_for(restaurants)
+        recommendations = []
+        for restaurant, distance in index.iter_nearest(user_latitude, user_longitude, max_distance_km):
+            if not self._matches_filters(restaurant, filters):
+                continue
+            recommendations.append(self._with_distance(restaurant, distance))
+            if len(recommendations) >= k:
+                break
+        
+        for i, restaurant in enumerate(recommendations):
+            restaurant.update_rank(i + 1)
+            restaurant.update_recommendation_score(self._calculate_recommendation_score(restaurant))
+        
+        return recommendations
     
     def bubble_sort_by_distance(self, restaurants: List[Restaurant]) -> List[Restaurant]:
         """
-        ordena restaurantes por distancia usando bubble sort
+        ordena restaurantes por distancia usando o algoritmo de ordenacao do motor
         
         Args:
             restaurants: lista de restaurantes com distancia calculada
@@ -125,8 +618,33 @@ class RecommendationEngine:
         if not restaurants:
             return []
         
-        # usar o algoritmo de bubble sort existente
-        return bubble_sort(restaurants.copy(), key='distance', descending=False)
+        return self.sort_function(restaurants.copy(), key='distance', descending=False)
+    
+    def merge_sorted_sources(
+        self,
+        sources: List[Iterable[Restaurant]],
+        radius_km: float,
+        max_results: Optional[int] = None
+    ) -> List[Restaurant]:
+        """
+        intercala fontes ja ordenadas por distancia (culinarias, paginas ou tiles)
+        
+        as fontes sao consumidas sob demanda: o merge para no primeiro restaurante
+        fora do raio ou quando max_results restaurantes foram obtidos
+        
+        Args:
+            sources: iteraveis de restaurantes, cada um ordenado por distancia
+            radius_km: raio em quilometros
+            max_results: numero maximo de restaurantes (None para todos no raio)
+        
+        Returns:
+            restaurantes sem repeticao (por id), ordenados por distancia
+        """
+        merged = k_way_merge(sources, key='distance', id_key='id')
+        in_radius = takewhile(
+            lambda restaurant: restaurant.distance is not None and restaurant.distance <= radius_km, merged
+        )
+        return list(islice(in_radius, max_results))
     
     def binary_search_radius_filter(self, restaurants: List[Restaurant], radius_km: float) -> List[Restaurant]:
         """
@@ -148,23 +666,39 @@ class RecommendationEngine:
     
     def bubble_sort_by_rating(self, restaurants: List[Restaurant]) -> List[Restaurant]:
         """
-        ordena restaurantes por nota usando bubble sort
+        ordena restaurantes por nota com a variante de varios criterios do algoritmo escolhido
         
         Args:
             restaurants: lista de restaurantes
         
         Returns:
-            lista ordenada por nota (maior para menor)
+            lista ordenada por nota (maior para menor), desempatando por distancia e preco
         """
         if not restaurants:
             return []
         
-        # usar o algoritmo de bubble sort existente (decrescente para maior nota primeiro)
-        return bubble_sort(restaurants.copy(), key='rating', descending=True)
+        return self.multi_key_sort_function(restaurants.copy(), RATING_SORT_KEYS)
+    
+    def top_k_by_rating(self, restaurants: List[Restaurant], k: int) -> List[Restaurant]:
+        """
+        seleciona os k restaurantes de maior nota sem ordenar a lista inteira
+        
+        Args:
+            restaurants: lista de restaurantes
+            k: quantidade de restaurantes desejada
+        
+        Returns:
+            os k restaurantes de maior nota (maior para menor), desempatando por distancia e preco
+        """
+        if not restaurants:
+            return []
+        
+        rating_key = compile_sort_key(restaurants, RATING_SORT_KEYS)
+        return top_k(restaurants, key=rating_key, k=k)
     
     def bubble_sort_by_price_low(self, restaurants: List[Restaurant]) -> List[Restaurant]:
         """
-        ordena restaurantes por preço (mais barato primeiro)
+        ordena restaurantes por preço (mais barato primeiro) em uma passada linear
         
         Args:
             restaurants: lista de restaurantes
@@ -175,33 +709,11 @@ class RecommendationEngine:
         if not restaurants:
             return []
         
-        # Mapeamento de preços para valores numéricos
-        price_values = {
-            'baixo': 1,
-            'medio': 2,
-            'medio-alto': 3,
-            'alto': 4
-        }
-        
-        # converter para lista para poder modificar
-        sorted_list = list(restaurants)
-        n = len(sorted_list)
-        
-        for i in range(n):
-            for j in range(0, n - i - 1):
-                # obter valores numéricos dos preços
-                price1 = price_values.get(sorted_list[j].price_range.lower(), 2)
-                price2 = price_values.get(sorted_list[j + 1].price_range.lower(), 2)
-                
-                # comparar preços (mais barato primeiro)
-                if price1 > price2:
-                    sorted_list[j], sorted_list[j + 1] = sorted_list[j + 1], sorted_list[j]
-        
-        return sorted_list
+        return bucket_sort(list(restaurants), key='price_value', categories=PRICE_VALUE_ORDER)
     
     def bubble_sort_by_price_high(self, restaurants: List[Restaurant]) -> List[Restaurant]:
         """
-        ordena restaurantes por preço (mais caro primeiro)
+        ordena restaurantes por preço (mais caro primeiro) em uma passada linear
         
         Args:
             restaurants: lista de restaurantes
@@ -212,36 +724,15 @@ class RecommendationEngine:
         if not restaurants:
             return []
         
-        # Mapeamento de preços para valores numéricos
-        price_values = {
-            'baixo': 1,
-            'medio': 2,
-            'medio-alto': 3,
-            'alto': 4
-        }
-        
-        # converter para lista para poder modificar
-        sorted_list = list(restaurants)
-        n = len(sorted_list)
-        
-        for i in range(n):
-            for j in range(0, n - i - 1):
-                # obter valores numéricos dos preços
-                price1 = price_values.get(sorted_list[j].price_range.lower(), 2)
-                price2 = price_values.get(sorted_list[j + 1].price_range.lower(), 2)
-                
-                # comparar preços (mais caro primeiro)
-                if price1 < price2:
-                    sorted_list[j], sorted_list[j + 1] = sorted_list[j + 1], sorted_list[j]
-        
-        return sorted_list
+        return bucket_sort(list(restaurants), key='price_value', categories=PRICE_VALUE_ORDER, descending=True)
     
     def get_recommendations(
         self,
         user_latitude: float,
         user_longitude: float,
         radius_km: float = 25.0,  # aumentado para 25km conforme solicitado
-        max_results: int = 5
+        max_results: int = 5,
+        restaurants: Optional[List[Restaurant]] = None
     ) -> List[Restaurant]:
         """
         gera recomendacoes completas seguindo o fluxo especificado
@@ -251,46 +742,93 @@ class RecommendationEngine:
             user_longitude: longitude do usuario
             radius_km: raio de busca em quilometros
             max_results: numero maximo de resultados
+            restaurants: candidatos (padrao: busca na api)
         
         Returns:
             lista de recomendacoes ordenadas
         """
-        # passo 1: definir localizacao do usuario
-        self.set_user_location(user_latitude, user_longitude)
+        # passo 1: localizacao do usuario (local a requisicao)
+        user_location = {'latitude': user_latitude, 'longitude': user_longitude}
         
         # passo 2: obter restaurantes da api (ou mockados se nao houver api key)
-        self.restaurants = self.get_restaurants_from_api(user_latitude, user_longitude)
+        if restaurants is None:
+            restaurants = self.get_restaurants_from_api(user_latitude, user_longitude)
         
-        if not self.restaurants:
+        if not restaurants:
             return []
         
-        # passo 3: calcular distancias
-        restaurants_with_distance = self.calculate_distances()
+        if restaurants is self.restaurants and self._use_columnar(restaurants):
+            # passos 3 a 6 nas colunas do catalogo (tabela montada uma vez): so o top-k vira objeto
+            candidates = self.calculate_distances_table(radius_km, restaurants, user_location)
+            top_recommendations = self.rank_columnar(candidates, radius_km, max_results)
+        else:
+            # passo 3: calcular distancias (ja descartando quem esta fora do raio)
+            restaurants_with_distance = self.calculate_distances(radius_km, restaurants, user_location)
+            
+            if self._use_columnar(restaurants_with_distance):
+                # passos 4 a 6 em colunas extraidas das visoes (lista da requisicao: sem montar tabela)
+                top_recommendations = self.rank_columnar(restaurants_with_distance, radius_km, max_results)
+            else:
+                # passos 4 a 6: as visoes ja estao no raio, entao basta o top-k por nota
+                # (o desempate por distancia dispensa ordenar por distancia antes)
+                top_recommendations = self.top_k_by_rating(restaurants_with_distance, max_results)
         
-        if not restaurants_with_distance:
-            return []
+        # adicionar informacoes extras
+        for i, restaurant in enumerate(top_recommendations):
+            restaurant.update_rank(i + 1)
+            restaurant.update_recommendation_score(self._calculate_recommendation_score(restaurant))
         
-        # passo 4: ordenar por distancia (bubble sort)
-        restaurants_by_distance = self.bubble_sort_by_distance(restaurants_with_distance)
+        return top_recommendations
+    
+    def _use_columnar(self, restaurants: List[Restaurant]) -> bool:
+        """
+        verifica se o ranqueamento deve usar o backend colunar
         
-        # passo 5: filtrar por raio (busca binaria)
-        restaurants_in_radius = self.binary_search_radius_filter(restaurants_by_distance, radius_km)
+        Args:
+            restaurants: candidatos a ranquear
         
-        if not restaurants_in_radius:
-            return []
+        Returns:
+            true se numpy estiver disponivel e houver candidatos suficientes
+        """
+        return (
+            HAS_NUMPY
+            and self.columnar_threshold is not None
+            and len(restaurants) >= self.columnar_threshold
+        )
+    
+    def rank_columnar(
+        self,
+        restaurants: Union[List[Restaurant], RestaurantTable],
+        radius_km: float,
+        max_results: int
+    ) -> List[Restaurant]:
+        """
+        filtra por raio e seleciona os melhores por nota usando colunas numpy
         
-        # passo 6: ordenar por nota (bubble sort)
-        restaurants_by_rating = self.bubble_sort_by_rating(restaurants_in_radius)
+        produz a mesma ordem do fluxo em objetos (nota desc, distancia asc, preco asc),
+        mas so materializa os max_results restaurantes selecionados
         
-        # passo 7: retornar top resultados
-        top_recommendations = restaurants_by_rating[:max_results]
+        Args:
+            restaurants: restaurantes com distancia calculada (lista ou RestaurantTable)
+            radius_km: raio em quilometros
+            max_results: numero maximo de resultados
         
-        # adicionar informacoes extras
-        for i, restaurant in enumerate(top_recommendations):
-            restaurant.update_rank(i + 1)
-            restaurant.update_recommendation_score(self._calculate_recommendation_score(restaurant))
+        Returns:
+            os melhores restaurantes dentro do raio
+        """
+        if isinstance(restaurants, RestaurantTable):
+            in_radius = restaurants.filter_by(max_distance=radius_km)
+            return in_radius.top_k(RATING_SORT_KEYS, max_results).to_restaurants()
         
-        return top_recommendations
+        if not restaurants:
+            return []
+        
+        columns = build_columns(restaurants, [key for key, _ in RATING_SORT_KEYS])
+        in_radius = (columns['distance'] <= radius_km).nonzero()[0]
+        
+        sort_columns = [(columns[key][in_radius], descending) for key, descending in RATING_SORT_KEYS]
+        selected = columnar_top_k(sort_columns, max_results)
+        return materialize(restaurants, in_radius[selected])
     
     def _calculate_recommendation_score(self, restaurant: Restaurant) -> float:
         """
@@ -345,13 +883,15 @@ class RecommendationEngine:
         # aplicar filtros usando metodos do objeto restaurant
         filtered_recommendations = []
         
+        cuisine_filter = compile_cuisine_filter(cuisine_types)
+        
         for restaurant in recommendations:
             # filtro de nota minima
             if not restaurant.matches_rating_filter(min_rating):
                 continue
             
             # filtro de tipo de culinaria
-            if not restaurant.matches_cuisine_filter(cuisine_types):
+            if not restaurant.matches_cuisine_filter(cuisine_filter):
                 continue
             
             # filtro de faixa de preco
@@ -371,7 +911,8 @@ class RecommendationEngine:
         user_latitude: float,
         user_longitude: float,
         query: str,
-        filters: Dict[str, Any] = None
+        filters: Dict[str, Any] = None,
+        max_results: int = 5
     ) -> List[Restaurant]:
         """
         Gera recomendações usando keyword da consulta
@@ -381,6 +922,7 @@ class RecommendationEngine:
             user_longitude: longitude do usuário
             query: texto da consulta original
             filters: filtros aplicados
+            max_results: numero maximo de resultados
             
         Returns:
             lista de restaurantes recomendados
@@ -390,45 +932,114 @@ class RecommendationEngine:
         print(f"   🔤 Query: '{query}'")
         print(f"   🎯 Filtros: {filters}")
         
-        # Definir localização do usuário
-        self.set_user_location(user_latitude, user_longitude)
+        # Localização do usuário (local à requisição: o motor é compartilhado)
+        user_location = {'latitude': user_latitude, 'longitude': user_longitude}
         print("✅ KEYWORD: Localização definida")
         
         # Extrair keyword da consulta
         print("🔍 KEYWORD: Extraindo keyword da consulta...")
-        keyword = self._extract_keyword_from_query(query, filters)
+        keyword = self.extract_keyword_from_query(query, filters)
         print(f"   🎯 Keyword extraída: '{keyword}'")
         
-        # Obter restaurantes da API com keyword
-        print(f"🌐 KEYWORD: Buscando restaurantes na API com keyword '{keyword}'...")
-        self.restaurants = self.get_restaurants_from_api(user_latitude, user_longitude, keyword)
-        print(f"   📊 Restaurantes obtidos da API: {len(self.restaurants)}")
+        # Várias culinárias: uma busca por culinária na API, intercaladas por distância depois
+        cuisine_keywords = list(dict.fromkeys(filters.get('cuisine_types') or ())) if filters else []
+        if len(cuisine_keywords) > 1:
+            sources = []
+            for cuisine_keyword in cuisine_keywords[:KEYWORD_MAX_SOURCES]:
+                print(f"🌐 KEYWORD: Buscando restaurantes na API com keyword '{cuisine_keyword}'...")
+                sources.append(self.get_restaurants_from_api(user_latitude, user_longitude, cuisine_keyword))
+            restaurants = [restaurant for source in sources for restaurant in source]
+        else:
+            # Obter restaurantes da API com keyword
+            print(f"🌐 KEYWORD: Buscando restaurantes na API com keyword '{keyword}'...")
+            restaurants = self.get_restaurants_from_api(user_latitude, user_longitude, keyword)
+            sources = [restaurants]
+        print(f"   📊 Restaurantes obtidos da API: {len(restaurants)}")
         
-        if not self.restaurants:
+        if not restaurants:
             print("❌ KEYWORD: Nenhum restaurante obtido da API")
             return []
         
-        # Calcular distâncias
-        print("📏 KEYWORD: Calculando distâncias...")
-        restaurants_with_distance = self.calculate_distances()
-        print(f"   📊 Restaurantes com distância calculada: {len(restaurants_with_distance)}")
+        # Calcular distâncias (só até o maior raio da expansão)
+        initial_radius_km = filters.get('radius_km', 25.0) if filters else 25.0
         
-        if not restaurants_with_distance:
-            print("❌ KEYWORD: Erro ao calcular distâncias")
-            return []
+        # "no caminho": corredor ao longo da rota informada pelo cliente
+        if filters and filters.get('towards') and filters.get('route'):
+            print("🛣️ KEYWORD: Buscando restaurantes ao longo da rota...")
+            route = [tuple(point) for point in filters['route']]
+            if route[0] != (user_latitude, user_longitude):
+                route.insert(0, (user_latitude, user_longitude))
+            return self.get_recommendations_along_route(
+                route, filters.get('corridor_km', CORRIDOR_WIDTH_KM), max_results, filters,
+                restaurants=restaurants
+            )
+        
+        # "na direção de": setor de rumos até o destino informado pelo cliente
+        target_location = filters.get('target_location') if filters else None
+        if filters and filters.get('towards') and target_location:
+            print("🧭 KEYWORD: Buscando restaurantes na direção do destino...")
+            return self.get_recommendations_towards(
+                user_latitude, user_longitude,
+                target_location['latitude'], target_location['longitude'],
+                radius_km=filters.get('radius_km'), max_results=max_results, filters=filters,
+                restaurants=restaurants
+            )
+        
+        # "o mais perto": k vizinhos mais próximos pelo índice espacial, sem expansão de raio
+        # (o raio pedido pelo usuário é respeitado, até o alcance da busca na API)
+        if filters and filters.get('sort_preference') == 'nearest':
+            print("📍 KEYWORD: Buscando os mais próximos pelo índice espacial...")
+            return self.get_nearest_recommendations(
+                user_latitude, user_longitude, max_results, filters,
+                max_distance_km=min(initial_radius_km, KEYWORD_MAX_RADIUS_KM), restaurants=restaurants
+            )
         
-        # Ordenar por distância
-        print("📏 KEYWORD: Ordenando por distância...")
-        restaurants_by_distance = self.bubble_sort_by_distance(restaurants_with_distance)
+        print("📏 KEYWORD: Calculando distâncias...")
+        max_radius_km = max(initial_radius_km, 25.0)
+        if len(sources) > 1:
+            # cada fonte é ordenada sozinha e o merge remove os repetidos entre culinárias
+            print("📏 KEYWORD: Ordenando cada culinária por distância e intercalando...")
+            restaurants_by_distance = self.merge_sorted_sources(
+                [self.bubble_sort_by_distance(self.calculate_distances(max_radius_km, source, user_location))
+                 for source in sources],
+                max_radius_km
+            )
+        else:
+            restaurants_with_distance = self.calculate_distances(max_radius_km, restaurants, user_location)
+            print(f"   📊 Restaurantes com distância calculada: {len(restaurants_with_distance)}")
+            
+            # Ordenar por distância
+            print("📏 KEYWORD: Ordenando por distância...")
+            restaurants_by_distance = self.bubble_sort_by_distance(restaurants_with_distance)
         print(f"   📊 Restaurantes ordenados por distância: {len(restaurants_by_distance)}")
         
+        if not restaurants_by_distance:
+            print("❌ KEYWORD: Nenhum restaurante com distância válida até o raio máximo")
+            return []
+        
         # Filtrar por raio com expansão gradual se necessário
-        initial_radius_km = filters.get('radius_km', 25.0) if filters else 25.0
         print(f"🔍 KEYWORD: Filtrando por raio inicial de {initial_radius_km}km...")
         
+        sort_preference = filters.get('sort_preference', 'default') if filters else 'default'
+        
+        # Sem raio pedido e com ordenação por distância, a grade de densidade indica o menor raio com
+        # max_results lugares; esse raio (e os seguintes) só é aceito com max_results aprovados nos
+        # filtros, então o resultado é o mesmo do raio máximo (os mais próximos aprovados)
+        seeded = False
+        if not (filters and 'radius_km' in filters) and sort_preference not in ('rating', 'price_low', 'price_high'):
+            density_radius = self.density_index.radius_for_count(
+                user_latitude, user_longitude, max_results, KEYWORD_MAX_RADIUS_KM
+            )
+            if density_radius is not None:
+                print(f"   📊 Grade de densidade: {max_results} lugares esperados em {density_radius:.1f}km")
+                initial_radius_km = density_radius
+                seeded = True
+        
         # Tentar diferentes raios se não encontrar resultados
-        radius_options = [initial_radius_km, 5.0, 10.0, 15.0, 20.0, 25.0]
+        # (cada raio é uma bissecção O(log n) sobre a lista já ordenada, sem extrair as distâncias)
+        radius_options = [initial_radius_km, 5.0, 10.0, 15.0, 20.0, KEYWORD_MAX_RADIUS_KM]
         restaurants_in_radius = []
+        approved_restaurants = None
         final_radius = initial_radius_km
         
         for radius in radius_options:
@@ -439,83 +1050,97 @@ class RecommendationEngine:
             restaurants_in_radius = self.binary_search_radius_filter(restaurants_by_distance, radius)
             print(f"      📊 Restaurantes encontrados: {len(restaurants_in_radius)}")
             
-            if restaurants_in_radius:
+            if seeded and radius < KEYWORD_MAX_RADIUS_KM:
+                approved_restaurants = self._apply_keyword_filters(restaurants_in_radius, filters)
+                accepted = len(approved_restaurants) >= max_results
+            else:
+                accepted = bool(restaurants_in_radius)
+            if accepted:
                 final_radius = radius
                 print(f"   ✅ Encontrados {len(restaurants_in_radius)} restaurantes no raio de {radius}km")
                 break
+            approved_restaurants = None
         
         if not restaurants_in_radius:
             print("❌ KEYWORD: Nenhum restaurante encontrado mesmo expandindo o raio")
             return []
         
+        # Aplicar filtros adicionais antes de ordenar, para ranquear apenas os aprovados
+        if approved_restaurants is None:
+            approved_restaurants = self._apply_keyword_filters(restaurants_in_radius, filters)
+        
         # Determinar ordenação baseada na preferência do usuário
-        sort_preference = filters.get('sort_preference', 'default') if filters else 'default'
         print(f"📊 KEYWORD: Preferência de ordenação: {sort_preference}")
         
-        # ✅ CORREÇÃO: Ordenar baseado na preferência
+        # ✅ CORREÇÃO: Ordenar baseado na preferência, mantendo apenas os max_results primeiros
         if sort_preference == 'rating':
-            print("⭐ KEYWORD: Ordenando por nota...")
-            sorted_restaurants = self.bubble_sort_by_rating(restaurants_in_radius)
+            print("⭐ KEYWORD: Selecionando os melhores por nota...")
+            filtered_recommendations = self.top_k_by_rating(approved_restaurants, max_results)
         elif sort_preference == 'price_low':
             print("💰 KEYWORD: Ordenando por preço (mais barato primeiro)...")
-            sorted_restaurants = self.bubble_sort_by_price_low(restaurants_in_radius)
+            filtered_recommendations = self.bubble_sort_by_price_low(approved_restaurants)[:max_results]
         elif sort_preference == 'price_high':
             print("💰 KEYWORD: Ordenando por preço (mais caro primeiro)...")
-            sorted_restaurants = self.bubble_sort_by_price_high(restaurants_in_radius)
+            filtered_recommendations = self.bubble_sort_by_price_high(approved_restaurants)[:max_results]
         else:
             # ✅ CORREÇÃO: PADRÃO É SEMPRE POR DISTÂNCIA (inclusive 'distance' e 'default')
             print("📏 KEYWORD: Ordenação padrão por distância (mais próximo primeiro)...")
-            sorted_restaurants = restaurants_in_radius  # Já está ordenado por distância
+            filtered_recommendations = approved_restaurants[:max_results]  # Já está ordenado por distância
         
-        print(f"   📊 Restaurantes ordenados: {len(sorted_restaurants)}")
+        print(f"📊 KEYWORD: {len(filtered_recommendations)} restaurantes aprovados nos filtros")
+        
+        # Adicionar informações extras
+        print("📋 KEYWORD: Adicionando informações extras...")
+        for i, restaurant in enumerate(filtered_recommendations):
+            restaurant.update_rank(i + 1)
+            restaurant.update_recommendation_score(self._calculate_recommendation_score(restaurant))
+            print(f"   {i+1}. {restaurant.name} - Score: {restaurant.recommendation_score}")
+        
+        print(f"✅ KEYWORD: Retornando {len(filtered_recommendations)} recomendações finais")
+        return filtered_recommendations
+
+    def _apply_keyword_filters(self, restaurants: List[Restaurant], filters: Dict[str, Any] = None) -> List[Restaurant]:
+        """
+        Aplica os filtros de nota, culinária e preço da busca por palavra-chave
         
-        # Aplicar filtros adicionais
+        Args:
+            restaurants: candidatos (a ordem é mantida)
+            filters: filtros aplicados
+            
+        Returns:
+            restaurantes aprovados em todos os filtros
+        """
         print("🔍 KEYWORD: Aplicando filtros adicionais...")
-        filtered_recommendations = []
-        max_results = 5
+        min_rating = filters.get('min_rating', 0.0) if filters else 0.0
+        cuisine_types = filters.get('cuisine_types') if filters else None
+        price_range = filters.get('price_range') if filters else None
+        cuisine_filter = compile_cuisine_filter(cuisine_types)
+        approved_restaurants = []
         
-        for i, restaurant in enumerate(sorted_restaurants):
+        for i, restaurant in enumerate(restaurants):
             print(f"   🔍 Verificando restaurante {i+1}: {restaurant.name}")
             
             # Filtro de nota mínima
-            min_rating = filters.get('min_rating', 0.0) if filters else 0.0
             if not restaurant.matches_rating_filter(min_rating):
                 print(f"      ❌ Reprovado no filtro de nota (mínima: {min_rating}, atual: {restaurant.rating})")
                 continue
             
             # Filtro de tipo de culinária
-            cuisine_types = filters.get('cuisine_types') if filters else None
-            if not restaurant.matches_cuisine_filter(cuisine_types):
+            if not restaurant.matches_cuisine_filter(cuisine_filter):
                 print(f"      ❌ Reprovado no filtro de culinária (esperado: {cuisine_types}, atual: {restaurant.cuisine_type})")
                 continue
             
             # Filtro de faixa de preço
-            price_range = filters.get('price_range') if filters else None
             if not restaurant.matches_price_filter(price_range):
                 print(f"      ❌ Reprovado no filtro de preço (esperado: {price_range}, atual: {restaurant.price_range})")
                 continue
             
             print(f"      ✅ Aprovado em todos os filtros")
-            filtered_recommendations.append(restaurant)
-            
-            # Parar quando atingir o máximo de resultados
-            if len(filtered_recommendations) >= max_results:
-                print(f"      🛑 Máximo de resultados atingido ({max_results})")
-                break
-        
-        print(f"📊 KEYWORD: {len(filtered_recommendations)} restaurantes aprovados nos filtros")
-        
-        # Adicionar informações extras
-        print("📋 KEYWORD: Adicionando informações extras...")
-        for i, restaurant in enumerate(filtered_recommendations):
-            restaurant.update_rank(i + 1)
-            restaurant.update_recommendation_score(self._calculate_recommendation_score(restaurant))
-            print(f"   {i+1}. {restaurant.name} - Score: {restaurant.recommendation_score}")
+            approved_restaurants.append(restaurant)
         
-        print(f"✅ KEYWORD: Retornando {len(filtered_recommendations)} recomendações finais")
-        return filtered_recommendations
+        return approved_restaurants
 
-    def _extract_keyword_from_query(self, query: str, filters: Dict[str, Any] = None) -> str:
+    def extract_keyword_from_query(self, query: str, filters: Dict[str, Any] = None) -> str:
         """
         Extrai keyword da consulta para busca na API
         
@@ -536,8 +1161,11 @@ class RecommendationEngine:
             return keyword
         
         # Se não há filtros específicos, usar palavras-chave da consulta
+        # e os termos corrigidos de erros de digitação pelo validador
         query_lower = query.lower()
-        print(f"   🔍 Procurando termos na query: '{query_lower}'")
+        corrected_terms = [term.replace('_', ' ') for term in filters.get('corrected_terms', ())] if filters else []
+        search_text = ' '.join([query_lower] + corrected_terms)
+        print(f"   🔍 Procurando termos na query: '{search_text}'")
         
         # Mapear termos comuns para keywords
         keyword_mapping = {
@@ -566,10 +1194,16 @@ class RecommendationEngine:
         }
         
         for term, keyword in keyword_mapping.items():
-            if term in query_lower:
+            if term in search_text:
                 print(f"   ✅ Termo encontrado: '{term}' -> '{keyword}'")
                 return keyword
         
+        # Sem mapeamento, os termos corrigidos substituem a digitação original
+        if corrected_terms:
+            keyword = ' '.join(corrected_terms)
+            print(f"   ✅ Usando termos corrigidos: '{keyword}'")
+            return keyword
+        
         # Se não encontrou mapeamento específico, usar a consulta original
         print(f"   ⚠️ Nenhum termo mapeado encontrado, usando query original: '{query}'")
         return query
@@ -599,32 +1233,8 @@ class RecommendationEngine:
             # Tentar buscar do cache primeiro
             cached_restaurants = cache_service.get(user_latitude, user_longitude, query, filters)
             if cached_restaurants:
-                # Converter de volta para objetos Restaurant
-                restaurants = []
-                for restaurant_dict in cached_restaurants:
-                    restaurant = Restaurant(
-                        id=restaurant_dict.get('id'),
-                        name=restaurant_dict.get('name'),
-                        latitude=restaurant_dict.get('latitude'),
-                        longitude=restaurant_dict.get('longitude'),
-                        rating=restaurant_dict.get('rating'),
-                        cuisine_type=restaurant_dict.get('cuisine_type'),
-                        price_range=restaurant_dict.get('price_range'),
-                        address=restaurant_dict.get('address'),
-                        phone=restaurant_dict.get('phone'),
-                        website=restaurant_dict.get('website'),
-                        opening_hours=restaurant_dict.get('opening_hours'),
-                        features=restaurant_dict.get('features', [])
-                    )
-                    # Adicionar campos calculados
-                    if 'distance_km' in restaurant_dict:
-                        restaurant.distance_km = restaurant_dict['distance_km']
-                    if 'distance_formatted' in restaurant_dict:
-                        restaurant.distance_formatted = restaurant_dict['distance_formatted']
-                    
-                    restaurants.append(restaurant)
-                
-                return restaurants
+                # converter de volta para objetos restaurant (distancia, posicao e score vem do to_dict)
+                return dicts_to_restaurants(cached_restaurants)
         
         # Se não encontrou no cache, gerar recomendações com keyword
         recommendations = self.get_recommendations_with_keyword(
@@ -672,7 +1282,7 @@ def get_recommendations(
     """
     engine = RecommendationEngine()
     engine.set_restaurants(restaurants)
-    return engine.get_recommendations(user_latitude, user_longitude, radius_km, max_results)
+    return engine.get_recommendations(user_latitude, user_longitude, radius_km, max_results, restaurants)
 
 
 # testes unitarios
@@ -5,6 +5,13 @@ import redis
 from typing import Optional, Dict, Any, List
 from datetime import timedelta
 import logging
+from utils.geo_utils import geohash_encode, geohash_cover
+
+# Precisão do geohash no prefixo das chaves (células de ~5km x 5km)
+CACHE_GEOHASH_PRECISION = 5
+
+# Chaves pedidas por iteração do SCAN e por DELETE (o Redis não bloqueia como no KEYS)
+CACHE_SCAN_COUNT = 500
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -58,9 +65,14 @@ class CacheService:
             'filters': filters or {}
         }
         
-        # Gerar hash MD5 da string JSON
+        # Gerar hash MD5 da string JSON, prefixado pelo geohash da localização
+        # para que a invalidação por região só toque as células afetadas
         cache_string = json.dumps(cache_data, sort_keys=True)
-        return f"sabora:recommendations:{hashlib.md5(cache_string.encode()).hexdigest()}"
+        try:
+            cell = geohash_encode(latitude, longitude, CACHE_GEOHASH_PRECISION)
+        except ValueError:
+            cell = 'invalid'
+        return f"sabora:recommendations:{cell}:{hashlib.md5(cache_string.encode()).hexdigest()}"
     
     def get(self, latitude: float, longitude: float, query: str, filters: Dict = None) -> Optional[List[Dict]]:
         """
@@ -142,24 +154,25 @@ class CacheService:
             return 0
         
         try:
-            # Buscar todas as chaves do cache
-            pattern = "sabora:recommendations:*"
-            keys = self.redis_client.keys(pattern)
+            # Células de geohash que intersectam o raio
+            cells = set(geohash_cover(latitude, longitude, radius_km, CACHE_GEOHASH_PRECISION))
+            
+            # Um único SCAN incremental pelo prefixo (cada SCAN percorre o keyspace inteiro, então
+            # um por célula multiplicaria o custo); ficam as chaves cuja célula está na cobertura
+            prefix = "sabora:recommendations:"
+            keys = []
+            for key in self.redis_client.scan_iter(match=f"{prefix}*", count=CACHE_SCAN_COUNT):
+                key_text = key.decode() if isinstance(key, bytes) else key
+                if key_text[len(prefix):].split(':', 1)[0] in cells:
+                    keys.append(key)
             
             invalidated_count = 0
-            
-            for key in keys:
+            for start in range(0, len(keys), CACHE_SCAN_COUNT):
+                batch = keys[start:start + CACHE_SCAN_COUNT]
                 try:
-                    # Recuperar dados da chave para verificar localização
-                    cached_data = self.redis_client.get(key)
-                    if cached_data:
-                        # Aqui você poderia implementar lógica mais sofisticada
-                        # para verificar se a localização está no raio
-                        # Por simplicidade, vamos invalidar todas as chaves
-                        self.redis_client.delete(key)
-                        invalidated_count += 1
+                    invalidated_count += self.redis_client.delete(*batch)
                 except Exception as e:
-                    logger.error(f"Erro ao invalidar chave {key}: {e}")
+                    logger.error(f"Erro ao invalidar {len(batch)} chaves: {e}")
             
             logger.info(f"Invalidadas {invalidated_count} chaves de cache")
             return invalidated_count
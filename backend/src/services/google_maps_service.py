@@ -7,6 +7,7 @@ import os
 import requests
 from typing import List, Dict, Any, Optional
 from models.restaurant import Restaurant
+from nlp.cuisine_taxonomy import classify_place, classify_place_with_mask
 
 
 class GoogleMapsService:
@@ -23,6 +24,7 @@ class GoogleMapsService:
         """
         self.api_key = api_key or os.getenv('GOOGLE_MAPS_API_KEY')
         self.base_url = 'https://maps.googleapis.com/maps/api'
+        self.restaurant_indexes = []
         
         if not self.api_key:
             print("⚠️ AVISO: GOOGLE_MAPS_API_KEY não configurada. Usando dados mockados.")
@@ -95,7 +97,7 @@ class GoogleMapsService:
             
             for i, place in enumerate(results):
                 print(f"   🔍 Convertendo lugar {i+1}: {place.get('name', 'Sem nome')}")
-                restaurant = self._place_to_restaurant(place, latitude, longitude)
+                restaurant = self._place_to_restaurant(place)
                 if restaurant:
                     restaurants.append(restaurant)
                     print(f"      ✅ Convertido: {restaurant.name}")
@@ -103,6 +105,7 @@ class GoogleMapsService:
                     print(f"      ❌ Falha na conversão")
             
             print(f"✅ MAPS: {len(restaurants)} restaurantes convertidos com sucesso")
+            self._update_indexes(restaurants)
             return restaurants
             
         except Exception as e:
@@ -111,14 +114,39 @@ class GoogleMapsService:
             print(f"   📋 Traceback: {traceback.format_exc()}")
             return []
     
-    def _place_to_restaurant(self, place: Dict[str, Any], user_lat: float, user_lon: float) -> Optional[Restaurant]:
+    def attach_index(self, index) -> None:
+        """
+        registra um indice espacial para ser atualizado a cada busca
+        
+        Args:
+            index: indice com add que substitui pelo id (ex: GridIndex, SpatialIndex ou NameIndex)
+        """
+        if index not in self.restaurant_indexes:
+            self.restaurant_indexes.append(index)
+    
+    def _update_indexes(self, restaurants: List[Restaurant]) -> None:
+        """
+        insere ou substitui (pelo id) os restaurantes recebidos nos indices registrados
+        
+        Args:
+            restaurants: restaurantes convertidos da resposta da api
+        """
+        for index in self.restaurant_indexes:
+            for restaurant in restaurants:
+                try:
+                    index.add(restaurant)
+                except ValueError as e:
+                    print(f"⚠️ MAPS: Restaurante ignorado no índice: {e}")
+    
+    def _place_to_restaurant(self, place: Dict[str, Any]) -> Optional[Restaurant]:
         """
         converte resultado da api do google para objeto restaurant
         
+        a distancia ate o usuario nao e calculada aqui: o motor de recomendacao a anota
+        por requisicao, sem alterar o restaurante compartilhado
+        
         Args:
             place: dados do lugar da api do google
-            user_lat: latitude do usuario
-            user_lon: longitude do usuario
             
         Returns:
             objeto restaurant ou None se invalido
@@ -136,18 +164,13 @@ class GoogleMapsService:
             lat = location.get('lat', 0)
             lng = location.get('lng', 0)
             
-            # tipos de culinaria
+            # tipos de culinaria: rotulo e mascara classificados uma vez, aqui na ingestao
             types = place.get('types', [])
-            cuisine_type = self._extract_cuisine_type(types, name)
+            cuisine_type, cuisine_mask = classify_place_with_mask(types, name)
             
             # converter price_level para string
             price_range = self._price_level_to_range(price_level)
             
-            # calcular distancia
-            from utils.geo_utils import calculate_distance, format_distance
-            distance = calculate_distance(user_lat, user_lon, lat, lng)
-            distance_formatted = format_distance(distance)
-            
             # criar objeto restaurant
             restaurant = Restaurant(
                 id=hash(place_id) % 1000000,  # id unico baseado no place_id
@@ -158,8 +181,7 @@ class GoogleMapsService:
                 cuisine_type=cuisine_type,
                 price_range=price_range,
                 address=vicinity,
-                distance=distance,
-                distance_formatted=distance_formatted
+                cuisine_mask=cuisine_mask
             )
             
             return restaurant
@@ -179,88 +201,8 @@ class GoogleMapsService:
         Returns:
             tipo de culinaria
         """
-        # Primeiro, tentar extrair do nome do restaurante (mais preciso)
-        if name:
-            name_lower = name.lower()
-            
-            # Mapeamento de palavras-chave para tipos de culinária
-            name_keywords = {
-                'japonesa': 'Japonesa',
-                'japonês': 'Japonesa',
-                'japanese': 'Japonesa',
-                'sushi': 'Japonesa',
-                'temaki': 'Japonesa',
-                'sashimi': 'Japonesa',
-                'yaki': 'Japonesa',
-                'izakaya': 'Japonesa',
-                'oriental': 'Japonesa',  # Muitos restaurantes japoneses usam "oriental"
-                'italiana': 'Italiana',
-                'italian': 'Italiana',
-                'pizza': 'Pizzaria',
-                'chinesa': 'Chinesa',
-                'chinese': 'Chinesa',
-                'brasileira': 'Brasileira',
-                'brazilian': 'Brasileira',
-                'brasileiro': 'Brasileira',
-                'pastel': 'Brasileira',  # Pastel é tipicamente brasileiro
-                'pastelaria': 'Brasileira',
-                'churrasco': 'Brasileira',
-                'churrascaria': 'Brasileira',
-                'feijoada': 'Brasileira',
-                'nordestina': 'Brasileira',
-                'nordestino': 'Brasileira',
-                'regional': 'Brasileira',
-                'mexicana': 'Mexicana',
-                'mexican': 'Mexicana',
-                'indiana': 'Indiana',
-                'indian': 'Indiana',
-                'árabe': 'Árabe',
-                'arabic': 'Árabe',
-                'mediterrânea': 'Mediterrânea',
-                'mediterranean': 'Mediterrânea',
-                'frutos do mar': 'Frutos do Mar',
-                'seafood': 'Frutos do Mar',
-                'ceviche': 'Frutos do Mar',
-                'vegana': 'Vegana',
-                'vegan': 'Vegana',
-                'vegetariana': 'Vegetariana',
-                'vegetarian': 'Vegetariana',
-                'fast food': 'Fast Food',
-                'padaria': 'Padaria',
-                'bakery': 'Padaria',
-                'café': 'Café',
-                'cafe': 'Café',
-                'bar': 'Bar'
-            }
-            
-            for keyword, cuisine_type in name_keywords.items():
-                if keyword in name_lower:
-                    return cuisine_type
-        
-        # Se não encontrou no nome, tentar extrair dos tipos específicos do Google
-        cuisine_mapping = {
-            'restaurant': 'Restaurante',
-            'italian_restaurant': 'Italiana',
-            'japanese_restaurant': 'Japonesa',
-            'chinese_restaurant': 'Chinesa',
-            'indian_restaurant': 'Indiana',
-            'mexican_restaurant': 'Mexicana',
-            'thai_restaurant': 'Tailandesa',
-            'brazilian_restaurant': 'Brasileira',
-            'seafood_restaurant': 'Frutos do Mar',
-            'steakhouse': 'Churrascaria',
-            'pizza_restaurant': 'Pizzaria',
-            'bakery': 'Padaria',
-            'cafe': 'Café',
-            'bar': 'Bar',
-            'fast_food': 'Fast Food'
-        }
-        
-        for type_name in types:
-            if type_name in cuisine_mapping:
-                return cuisine_mapping[type_name]
-        
-        return 'Restaurante'
+        # vocabulario compilado uma vez em nlp.cuisine_taxonomy (nome primeiro, depois os tipos)
+        return classify_place(types, name)
     
     def _price_level_to_range(self, price_level: int) -> str:
         """
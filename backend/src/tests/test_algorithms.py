@@ -0,0 +1,343 @@
+"""
+testes dos algoritmos de ordenacao e busca do projeto sabora
+"""
+
+import sys
+import os
+import random
+
+# adicionar o diretorio src ao path para imports relativos
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from models.restaurant import Restaurant
+from algorithms.sorting_algorithms import (
+    bubble_sort, fast_sort, get_sort_algorithm, multi_key_sort, compile_sort_key, bucket_sort, SORT_ALGORITHMS
+)
+from processors.recommendation_engine import RecommendationEngine
+from algorithms.selection_algorithms import top_k
+from algorithms.search_algorithms import binary_search
+from algorithms.name_index import NameIndex, normalize_text
+from algorithms.fuzzy_search import DeletionIndex, edit_distance
+from algorithms.merge_algorithms import k_way_merge
+from utils.search_validator import search_validator
+from algorithms.columnar_algorithms import (
+    HAS_NUMPY, build_column, columnar_argsort, columnar_lexsort, columnar_top_k,
+    columnar_radius_cutoff, columnar_sort
+)
+
+
+def _make_restaurants(count: int, seed: int = 42):
+    """cria restaurantes sinteticos com distancia e nota aleatorias"""
+    rng = random.Random(seed)
+    restaurants = []
+    for i in range(count):
+        restaurant = Restaurant(
+            id=i, name=f"restaurante {i}", latitude=-9.6498, longitude=-35.7089,
+            rating=round(rng.uniform(3.0, 5.0), 1), cuisine_type="brasileira",
+            price_range=rng.choice(['baixo', 'medio', 'medio-alto', 'alto']), address=f"rua {i}"
+        )
+        restaurant.distance = round(rng.uniform(0.1, 25.0), 2)
+        restaurants.append(restaurant)
+    return restaurants
+
+
+def test_fast_sort_matches_bubble_sort():
+    """testa se o fast_sort produz a mesma ordem estavel do bubble_sort"""
+    print("=== teste do fast_sort ===")
+
+    restaurants = _make_restaurants(200)
+
+    for key, descending in [('distance', False), ('rating', True), ('name', False)]:
+        expected = bubble_sort(restaurants.copy(), key=key, descending=descending)
+        result = fast_sort(restaurants.copy(), key=key, descending=descending)
+        assert [r.id for r in result] == [r.id for r in expected]
+
+    print("✅ fast_sort equivalente ao bubble_sort")
+
+
+def test_fast_sort_with_dicts_and_missing_values():
+    """testa o fast_sort com dicionarios e valores ausentes"""
+    items = [
+        {'nome': 'a', 'distancia': 2.0},
+        {'nome': 'b', 'distancia': None},
+        {'nome': 'c', 'distancia': 0.5},
+        {'nome': 'd'},
+    ]
+
+    result = fast_sort(items.copy(), key='distancia')
+    assert [item['nome'] for item in result] == ['c', 'a', 'b', 'd']
+    assert fast_sort([], key='distancia') == []
+
+
+def test_get_sort_algorithm():
+    """testa a selecao de algoritmo de ordenacao"""
+    assert get_sort_algorithm('bubble') is bubble_sort
+    assert get_sort_algorithm('fast') is fast_sort
+
+    try:
+        get_sort_algorithm('inexistente')
+        assert False, "deveria lancar ValueError"
+    except ValueError:
+        pass
+
+
+def test_top_k_matches_sorted_head():
+    """testa se o top_k retorna o mesmo prefixo da ordenacao completa"""
+    print("\n=== teste do top_k ===")
+
+    restaurants = _make_restaurants(500)
+
+    for key, descending in [('rating', True), ('distance', False)]:
+        expected = fast_sort(restaurants.copy(), key=key, descending=descending)[:5]
+        result = top_k(restaurants, key=key, k=5, descending=descending)
+        assert [r.id for r in result] == [r.id for r in expected]
+
+    assert top_k(restaurants, key='rating', k=0) == []
+    assert len(top_k(restaurants[:3], key='rating', k=5)) == 3
+
+    print("✅ top_k equivalente ao prefixo ordenado")
+
+
+def test_multi_key_sort_matches_chained_passes():
+    """testa se a chave composta equivale a passadas estaveis encadeadas"""
+    restaurants = _make_restaurants(300)
+    sort_keys = [('rating', True), ('distance', False), ('price_value', False)]
+
+    expected = restaurants.copy()
+    for key, descending in reversed(sort_keys):
+        fast_sort(expected, key=key, descending=descending)
+
+    result = multi_key_sort(restaurants.copy(), sort_keys)
+    assert [r.id for r in result] == [r.id for r in expected]
+
+    composite_key = compile_sort_key(restaurants, sort_keys)
+    head = top_k(restaurants, key=composite_key, k=5)
+    assert [r.id for r in head] == [r.id for r in expected[:5]]
+
+
+def test_multi_key_sort_with_text_keys():
+    """testa o fallback para criterios de texto decrescentes"""
+    items = [
+        {'nome': 'b', 'nota': 4.0},
+        {'nome': 'a', 'nota': 4.0},
+        {'nome': 'c', 'nota': None},
+        {'nome': 'd', 'nota': 5.0},
+    ]
+
+    result = multi_key_sort(items.copy(), [('nota', True), ('nome', False)])
+    assert [item['nome'] for item in result] == ['d', 'a', 'b', 'c']
+
+    result = multi_key_sort(items.copy(), [('nome', True)])
+    assert [item['nome'] for item in result] == ['d', 'c', 'b', 'a']
+
+
+def test_rating_sort_uses_selected_algorithm():
+    """testa se a ordenacao por nota do motor usa a variante de cada algoritmo"""
+    restaurants = _make_restaurants(150)
+    expected = [r.id for r in multi_key_sort(restaurants.copy(), [('rating', True), ('distance', False), ('price_value', False)])]
+
+    for name in SORT_ALGORITHMS:
+        if name == 'numpy' and not HAS_NUMPY:
+            continue
+        engine = RecommendationEngine(sort_algorithm=name)
+        assert [r.id for r in engine.bubble_sort_by_rating(restaurants)] == expected
+
+
+def test_bucket_sort_is_stable():
+    """testa a ordenacao por baldes para faixas de preco"""
+    restaurants = _make_restaurants(200)
+    categories = [1, 2, 3, 4]
+
+    for descending in [False, True]:
+        expected = fast_sort(restaurants.copy(), key='price_value', descending=descending)
+        result = bucket_sort(restaurants.copy(), key='price_value', categories=categories, descending=descending)
+        assert [r.id for r in result] == [r.id for r in expected]
+
+    items = [{'preco': 'alto'}, {'preco': 'outro'}, {'preco': 'baixo'}]
+    result = bucket_sort(items, key='preco', categories=['baixo', 'medio', 'alto'])
+    assert [item['preco'] for item in result] == ['baixo', 'alto', 'outro']
+
+
+def test_name_index_substring_search():
+    """testa a busca por substring no indice de trigramas"""
+    print("\n=== teste do indice de nomes ===")
+
+    names = ['Sushi Bar Japonês', 'Cantina da Praia', 'Pizzaria do Bairro', 'Praia Grill',
+             'Churrascaria Fogo no Chão', 'Japa da Esquina', 'Café', 'O Quintal']
+    restaurants = [{'name': name} for name in names]
+    index = NameIndex(restaurants)
+
+    for query in ['praia', 'JAPONES', 'chao', 'ca', 'da ', 'inexistente', 'pizza']:
+        expected = {name for name in names if normalize_text(query) in normalize_text(name)}
+        result = {item['name'] for item in index.search(query)}
+        assert result == expected, query
+
+    # prefixos primeiro, depois nomes mais curtos
+    assert [item['name'] for item in index.search('praia')] == ['Praia Grill', 'Cantina da Praia']
+    assert len(index.search('a', limit=2)) == 2
+    assert index.search('   ') == []
+    # a consulta nao e aparada, como em linear_search
+    assert [item['name'] for item in index.search(' praia')] == ['Cantina da Praia']
+    assert len(index.search('')) == len(names)
+
+    # insercao incremental
+    index.add({'name': 'Praiana'})
+    assert [item['name'] for item in index.search('praia')][:2] == ['Praiana', 'Praia Grill']
+
+    # mesmo id substitui o item anterior
+    index.add({'id': 7, 'name': 'Bar do Porto'})
+    index.add({'id': 7, 'name': 'Bar da Praia'})
+    assert [item['name'] for item in index.search('bar d')] == ['Bar da Praia']
+    assert len(index) == len(names) + 2
+
+    # reenvios do mesmo lugar nao crescem o indice; o limite descarta os atualizados ha mais tempo
+    places = [{'id': i, 'name': f'Lugar {i} da Praia'} for i in range(20)]
+    repeated = NameIndex(places)
+    posting_count = sum(map(len, repeated.postings.values()))
+    for _ in range(200):
+        repeated.add_many(places)
+    assert len(repeated) == len(repeated.items) == 20
+    assert sum(map(len, repeated.postings.values())) == posting_count
+    for round_number in range(30):
+        repeated.add_many([{'id': i, 'name': f'Novo {i} {round_number}'} for i in range(20)])
+    assert len(repeated) == 20 and len(repeated.items) <= 40
+    assert [item['name'] for item in repeated.search('novo 3 2')] == ['Novo 3 29']
+
+    capped = NameIndex(max_items=30)
+    capped.add_many({'id': i, 'name': f'casa {i}'} for i in range(100))
+    assert len(capped) == 30
+    assert sorted(item['id'] for item in capped.search('casa')) == list(range(70, 100))
+
+    print("✅ indice de nomes funcionando corretamente")
+
+
+def test_edit_distance():
+    """testa a distancia de edicao com transposicoes e limite"""
+    assert edit_distance('sushi', 'sushi') == 0
+    assert edit_distance('suchi', 'sushi') == 1
+    assert edit_distance('habbibs', 'habibs') == 1
+    assert edit_distance('pizza', 'pziza') == 1
+    assert edit_distance('kitten', 'sitting') == 3
+    assert edit_distance('kitten', 'sitting', max_distance=2) == 3
+    assert edit_distance('', 'abc') == 3
+
+
+def test_deletion_index_matches_brute_force():
+    """testa se o indice de delecoes encontra os mesmos termos que a busca exaustiva"""
+    print("\n=== teste do indice de delecoes ===")
+
+    vocabulary = {
+        'mcdonalds': ['mcdonalds', "mcdonald's", 'mc donalds', 'mequi'],
+        'habibs': ["habib's", 'habibs', 'habib'],
+        'japonesa': ['japonesa', 'japonês', 'sushi', 'temaki'],
+        'italiana': ['italiana', 'pizza', 'pizzaria', 'lasanha'],
+    }
+    index = DeletionIndex(max_distance=2)
+    index.add_vocabulary(vocabulary)
+
+    for query in ['mequi', 'mc donals', 'habbibs', 'suchi', 'piza', 'japones', 'xyz', 'lasagna']:
+        for max_distance in [1, 2]:
+            expected = sorted(
+                term for term in index.terms
+                if edit_distance(normalize_text(query), term) <= max_distance
+            )
+            result = sorted(term for term, _, _ in index.lookup(query, max_distance))
+            assert result == expected, (query, max_distance)
+
+    assert index.lookup('habbibs')[0][2] == 'habibs'
+    assert index.lookup('mc donals')[0][2] == 'mcdonalds'
+    assert index.lookup('suchi')[0][2] == 'japonesa'
+    assert 'Japonês' in index
+
+    print("✅ indice de delecoes funcionando corretamente")
+
+
+def test_fuzzy_food_keywords_avoid_false_positives():
+    """testa se o validador corrige erros de digitacao sem aceitar palavras parecidas por acaso"""
+    for query in ['habbibs', 'mc donals', 'churascaria', 'temakk']:
+        assert search_validator.validate_search_query(query).is_valid, query
+
+    # os termos corrigidos voltam no resultado e viram a keyword da busca na api
+    result = search_validator.validate_search_query('habbibs')
+    assert result.corrected_terms == ['habibs']
+    assert search_validator.validate_search_query('pizza').corrected_terms == []
+    engine = RecommendationEngine()
+    assert engine.extract_keyword_from_query('habbibs', {'corrected_terms': result.corrected_terms}) == 'habibs'
+    assert engine.extract_keyword_from_query('mc donals', {'corrected_terms': ['mcdonalds']}) == 'mcdonalds'
+
+    # palavras curtas nao sao corrigidas ("pisa" -> "pita", "dente" -> "dende")
+    assert search_validator._find_fuzzy_food_keywords(['pisa']) == []
+    assert not search_validator.validate_search_query('pasta de dente').is_valid
+
+
+def test_k_way_merge_is_lazy_and_deduplicates():
+    """testa o merge preguicoso de fontes ordenadas com remocao de repetidos"""
+    restaurants = _make_restaurants(90)
+    sources = [
+        fast_sort(restaurants[0:40], key='distance'),
+        fast_sort(restaurants[30:70], key='distance'),
+        fast_sort(restaurants[60:90], key='distance'),
+    ]
+
+    merged = list(k_way_merge(sources, key='distance'))
+    expected = fast_sort(restaurants.copy(), key='distance')
+    assert [r.distance for r in merged] == [r.distance for r in expected]
+    assert len({r.id for r in merged}) == len(merged) == 90
+
+    consumed = []
+
+    def tracked(source):
+        for restaurant in source:
+            consumed.append(restaurant)
+            yield restaurant
+
+    stream = k_way_merge([tracked(source) for source in sources], key='distance')
+    first = [next(stream) for _ in range(3)]
+    assert [r.distance for r in first] == [r.distance for r in expected[:3]]
+    assert len(consumed) <= 3 + len(sources)
+
+    descending = [{'id': 1, 'nota': 5}, {'id': 2, 'nota': 3}], [{'id': 1, 'nota': 4}, {'id': 3, 'nota': 1}]
+    result = list(k_way_merge(descending, key='nota', descending=True))
+    assert [item['id'] for item in result] == [1, 2, 3]
+
+    # fontes com valores ausentes: ausentes no final, sem comparar None
+    missing = [{'id': 1, 'nota': 5}, {'id': 4, 'nota': None}], [{'id': 2, 'nota': 3}, {'id': 5, 'nota': None}]
+    assert [item['id'] for item in k_way_merge(missing, key='nota', descending=True)] == [1, 2, 4, 5]
+    ascending = [{'id': 2, 'nota': 3}, {'id': 4, 'nota': None}], [{'id': 1, 'nota': 5}]
+    assert [item['id'] for item in k_way_merge(ascending, key='nota')] == [2, 1, 4]
+
+
+def test_columnar_backend_matches_python_sorts():
+    """testa se o backend colunar produz a mesma ordem dos algoritmos em objetos"""
+    if not HAS_NUMPY:
+        print("⚠️ numpy indisponivel, backend colunar nao testado")
+        return
+
+    print("\n=== teste do backend colunar ===")
+
+    restaurants = _make_restaurants(2000)
+    restaurants[7].distance = None
+
+    for key, descending in [('distance', False), ('rating', True)]:
+        expected = fast_sort(restaurants.copy(), key=key, descending=descending)
+        assert columnar_sort(restaurants.copy(), key=key, descending=descending) == expected
+
+        column = build_column(restaurants, key)
+        order = columnar_argsort(column, descending)
+        assert [restaurants[i] for i in order] == expected
+
+    sort_keys = [('rating', True), ('distance', False), ('price_value', False)]
+    sort_columns = [(build_column(restaurants, key), descending) for key, descending in sort_keys]
+    expected = multi_key_sort(restaurants.copy(), sort_keys)
+    assert [restaurants[i] for i in columnar_lexsort(sort_columns)] == expected
+
+    for k in [1, 5, 50, 5000]:
+        assert [restaurants[i] for i in columnar_top_k(sort_columns, k)] == expected[:k]
+
+    by_distance = fast_sort(restaurants.copy(), key='distance')
+    distances = build_column(by_distance, 'distance')
+    for limit in [0.5, 5.0, 25.0]:
+        expected_count = binary_search(by_distance, key='distance', limit_value=limit) + 1
+        assert columnar_radius_cutoff(distances, limit) == expected_count
+
+    print("✅ backend colunar equivalente aos algoritmos em objetos")
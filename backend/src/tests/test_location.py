@@ -0,0 +1,427 @@
+"""
+testes dos indices espaciais do projeto sabora
+"""
+
+import sys
+import os
+import random
+from itertools import islice
+
+# adicionar o diretorio src ao path para imports relativos
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from models.restaurant import Restaurant
+from utils.geo_utils import calculate_distance, calculate_bearing, point_segment_distances_batch
+from location.spatial_index import SpatialIndex
+from location.grid_index import GridIndex
+from location.linear_scan import LinearScan
+from processors.recommendation_engine import RecommendationEngine
+from services.google_maps_service import GoogleMapsService, google_maps_service
+
+
+CENTER = (-9.6498, -35.7089)
+
+
+def _make_restaurants(count: int, seed: int = 42, spread: float = 0.3):
+    """cria restaurantes espalhados em torno de maceio"""
+    rng = random.Random(seed)
+    return [
+        Restaurant(
+            id=i, name=f"restaurante {i}",
+            latitude=CENTER[0] + rng.uniform(-spread, spread),
+            longitude=CENTER[1] + rng.uniform(-spread, spread),
+            rating=round(rng.uniform(3.0, 5.0), 1), cuisine_type="brasileira",
+            price_range="medio", address=f"rua {i}"
+        )
+        for i in range(count)
+    ]
+
+
+def _brute_force(restaurants, lat, lon):
+    """distancias de todos os restaurantes, ordenadas como nos indices"""
+    return sorted(
+        ((calculate_distance(lat, lon, r.latitude, r.longitude), i, r) for i, r in enumerate(restaurants)),
+        key=lambda match: (match[0], match[1])
+    )
+
+
+def test_spatial_index_matches_brute_force():
+    """testa as consultas por raio e k vizinhos contra a varredura completa"""
+    print("=== teste do indice espacial ===")
+
+    restaurants = _make_restaurants(3000)
+    index = SpatialIndex(restaurants)
+    assert len(index) == 3000
+
+    rng = random.Random(7)
+    for _ in range(20):
+        lat = CENTER[0] + rng.uniform(-0.3, 0.3)
+        lon = CENTER[1] + rng.uniform(-0.3, 0.3)
+        expected = _brute_force(restaurants, lat, lon)
+
+        for km in [0.5, 2.0, 10.0]:
+            result = index.query_radius(lat, lon, km)
+            assert [(r.id, d) for r, d in result] == [(r.id, d) for d, _, r in expected if d <= km]
+
+        for k in [1, 7, 50]:
+            result = index.query_knn(lat, lon, k)
+            assert [(r.id, d) for r, d in result] == [(r.id, d) for d, _, r in expected[:k]]
+
+    print("✅ indice espacial equivalente a varredura completa")
+
+
+def test_spatial_index_iter_nearest():
+    """testa a iteracao incremental do mais proximo para o mais distante"""
+    restaurants = _make_restaurants(2000)
+    index = SpatialIndex(restaurants[:1800])
+    for restaurant in restaurants[1800:]:
+        index.add(restaurant)  # parte fica no buffer pendente
+    index.remove(5)
+
+    live = [r for r in restaurants if r.id != 5]
+    expected = _brute_force(live, *CENTER)
+
+    nearest = list(islice(index.iter_nearest(*CENTER), 60))
+    assert [d for _, d in nearest] == [d for d, _, _ in expected[:60]]
+    assert {r.id for r, _ in nearest[:59]} <= {r.id for _, _, r in expected[:60]}
+    assert [d for _, d in nearest[:10]] == [d for _, d in index.query_knn(*CENTER, 10)]
+
+    bounded = list(index.iter_nearest(*CENTER, max_km=3.0))
+    assert sorted(r.id for r, _ in bounded) == sorted(r.id for d, _, r in expected if d <= 3.0)
+    assert list(SpatialIndex().iter_nearest(*CENTER)) == []
+
+
+def test_engine_nearest_recommendations():
+    """testa o modo 'o mais perto' do motor com filtros"""
+    restaurants = _make_restaurants(500)
+    for restaurant in restaurants[::4]:
+        restaurant.cuisine_type = 'japonesa'
+
+    engine = RecommendationEngine()
+    engine.set_restaurants(restaurants)
+    filters = {'cuisine_types': ['japonesa'], 'min_rating': 4.0}
+    result = engine.get_nearest_recommendations(*CENTER, k=5, filters=filters)
+
+    expected = [r for d, _, r in _brute_force(restaurants, *CENTER)
+                if r.cuisine_type == 'japonesa' and r.rating >= 4.0]
+    assert [r.id for r in result] == [r.id for r in expected[:5]]
+    assert [r.rank for r in result] == [1, 2, 3, 4, 5]
+    assert all(r.distance is not None for r in result)
+
+    # pela busca com palavra-chave, um raio menor que o alcance da api nao e alargado
+    engine.get_restaurants_from_api = lambda lat, lon, keyword=None: restaurants
+    bounded = engine.get_recommendations_with_keyword(
+        *CENTER, 'japonesa', {**filters, 'sort_preference': 'nearest', 'radius_km': 8.0}, max_results=50
+    )
+    assert [r.id for r in bounded] == [r.id for d, _, r in _brute_force(expected, *CENTER) if d <= 8.0][:50]
+    assert bounded and all(r.distance <= 8.0 for r in bounded)
+
+
+def test_spatial_index_query_sector():
+    """testa a consulta por setor de rumos contra a varredura completa"""
+    restaurants = _make_restaurants(2000)
+    index = SpatialIndex(restaurants)
+
+    for bearing, width in [(0.0, 90.0), (350.0, 40.0), (135.0, 10.0), (200.0, 360.0)]:
+        expected = [
+            (r.id, d) for d, _, r in _brute_force(restaurants, *CENTER)
+            if d <= 8.0 and abs((calculate_bearing(*CENTER, r.latitude, r.longitude) - bearing + 180) % 360 - 180)
+            <= width / 2
+        ]
+        assert [(r.id, d) for r, d in index.query_sector(*CENTER, 8.0, bearing, width)] == expected
+
+
+def test_spatial_index_query_corridor():
+    """testa a consulta por corredor ao longo de uma rota contra a varredura completa"""
+    restaurants = _make_restaurants(3000)
+    index = SpatialIndex(restaurants[:2500])
+    index.add_many(restaurants[2500:])
+
+    rng = random.Random(11)
+    route = [CENTER]
+    for _ in range(60):
+        lat, lon = route[-1]
+        route.append((lat + rng.uniform(-0.004, 0.008), lon + rng.uniform(-0.004, 0.008)))
+
+    lats = [r.latitude for r in restaurants]
+    lons = [r.longitude for r in restaurants]
+    nearest = [min(values) for values in zip(*(
+        point_segment_distances_batch(*start, *end, lats, lons) for start, end in zip(route, route[1:])
+    ))]
+    for km in [0.2, 1.0]:
+        expected = sorted((d, i) for i, d in enumerate(nearest) if d <= km)
+        assert [(r.id, d) for r, d in index.query_corridor(route, km)] == [(i, d) for d, i in expected]
+
+    assert index.query_corridor([], 1.0) == []
+    assert index.query_corridor(route[:1], 1.0) == index.query_radius(*CENTER, 1.0)
+
+
+def test_engine_recommendations_along_route():
+    """testa o modo "no caminho" do motor com uma rota"""
+    restaurants = _make_restaurants(1000, spread=0.1)
+    engine = RecommendationEngine()
+    engine.set_restaurants(restaurants)
+
+    route = [CENTER, (CENTER[0] + 0.03, CENTER[1]), (CENTER[0] + 0.03, CENTER[1] + 0.03)]
+    result = engine.get_recommendations_along_route(route, 0.3, max_results=8)
+    assert len(result) == 8
+    assert [r.distance for r in result] == sorted(r.distance for r in result)
+    corridor = {r.id for r, _ in SpatialIndex(restaurants).query_corridor(route, 0.3)}
+    assert {r.id for r in result} <= corridor
+
+
+def test_engine_group_recommendations():
+    """testa a busca em grupo ("meio do caminho") contra a varredura completa, nos dois objetivos"""
+    restaurants = _make_restaurants(3000)
+    engine = RecommendationEngine()
+    engine.set_restaurants(restaurants)
+
+    rng = random.Random(13)
+    for size in [2, 4, 8]:
+        users = [(CENTER[0] + rng.uniform(-0.08, 0.08), CENTER[1] + rng.uniform(-0.08, 0.08)) for _ in range(size)]
+        distances = [[calculate_distance(lat, lon, r.latitude, r.longitude) for lat, lon in users] for r in restaurants]
+
+        for objective in ['max', 'sum']:
+            expected = sorted(
+                (max(row) if objective == 'max' else round(sum(row), 4), max(row), r.id)
+                for r, row in zip(restaurants, distances) if max(row) <= 25.0
+            )
+            result = engine.get_group_recommendations(users, 6, objective)
+            assert [(r.id, r.distance) for r in result] == [(i, farthest) for _, farthest, i in expected[:6]]
+
+    try:
+        engine.get_group_recommendations([CENTER], 5, 'median')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("ValueError esperado para objetivo desconhecido")
+
+
+def test_engine_recommendations_towards():
+    """testa o modo "na direcao de" do motor: so restaurantes a caminho do destino"""
+    restaurants = _make_restaurants(1000, spread=0.1)
+    engine = RecommendationEngine()
+    engine.set_restaurants(restaurants)
+
+    target = (CENTER[0] + 0.05, CENTER[1])  # ~5.6 km ao norte
+    result = engine.get_recommendations_towards(*CENTER, *target, max_results=10, filters={'min_rating': 4.0})
+    assert len(result) == 10
+    assert [r.distance for r in result] == sorted(r.distance for r in result)
+    for restaurant in result:
+        bearing = calculate_bearing(*CENTER, restaurant.latitude, restaurant.longitude)
+        assert min(bearing, 360 - bearing) <= 45.0
+        assert restaurant.rating >= 4.0 and restaurant.distance <= 5.6
+
+
+def test_linear_scan_matches_spatial_index():
+    """testa se a varredura em lote responde as consultas na mesma ordem do indice"""
+    restaurants = _make_restaurants(1500)
+    restaurants.append(Restaurant(id=7, name="duplicado", latitude=CENTER[0], longitude=CENTER[1],
+                                  rating=4.0, cuisine_type="brasileira", price_range="medio", address="rua 7"))
+    index, scan = SpatialIndex(restaurants), LinearScan(restaurants)
+    route = [CENTER, (CENTER[0] + 0.05, CENTER[1]), (CENTER[0] + 0.05, CENTER[1] + 0.05)]
+
+    def ids(matches):
+        return [(r.id, d) for r, d in matches]
+
+    assert len(scan) == len(index)
+    assert ids(scan.query_radius(*CENTER, 5.0)) == ids(index.query_radius(*CENTER, 5.0))
+    assert ids(scan.query_sector(*CENTER, 8.0, 30.0, 60.0)) == ids(index.query_sector(*CENTER, 8.0, 30.0, 60.0))
+    assert ids(scan.query_corridor(route, 0.5)) == ids(index.query_corridor(route, 0.5))
+    assert ids(scan.query_knn(*CENTER, 12)) == ids(index.query_knn(*CENTER, 12))
+    assert ids(islice(scan.iter_nearest(*CENTER, 4.0), 40)) == ids(islice(index.iter_nearest(*CENTER, 4.0), 40))
+    assert list(LinearScan().iter_nearest(*CENTER)) == [] and LinearScan().query_corridor(route, 1.0) == []
+
+
+def test_engine_request_lists_match_catalog_index():
+    """testa se os modos do motor dao o mesmo resultado com a lista da requisicao e com o catalogo"""
+    restaurants = _make_restaurants(1000, spread=0.1)
+    engine = RecommendationEngine()
+    engine.set_restaurants(restaurants)
+    request_list = list(restaurants)
+    users = [CENTER, (CENTER[0] + 0.04, CENTER[1] - 0.03), (CENTER[0] - 0.02, CENTER[1] + 0.05)]
+    route = [CENTER, (CENTER[0] + 0.03, CENTER[1]), (CENTER[0] + 0.03, CENTER[1] + 0.03)]
+
+    def ids(result):
+        return [(r.id, r.distance, r.rank) for r in result]
+
+    for candidates in [None, request_list]:
+        results = [
+            engine.get_nearest_recommendations(*CENTER, k=8, restaurants=candidates),
+            engine.get_recommendations_towards(*CENTER, *users[1], max_results=8, restaurants=candidates),
+            engine.get_recommendations_along_route(route, 0.3, max_results=8, restaurants=candidates),
+            engine.get_group_recommendations(users, 6, 'max', restaurants=candidates),
+            engine.get_group_recommendations(users, 6, 'sum', restaurants=candidates),
+        ]
+        if candidates is None:
+            expected = results
+            assert engine.spatial_index is not None
+        else:
+            assert [ids(result) for result in results] == [ids(result) for result in expected]
+
+
+def test_spatial_index_incremental_updates():
+    """testa insercoes, substituicoes e remocoes sem reconstruir manualmente"""
+    restaurants = _make_restaurants(500)
+    index = SpatialIndex(restaurants[:300])
+    for restaurant in restaurants[300:]:
+        index.add(restaurant)
+
+    for restaurant_id in range(0, 500, 3):
+        assert index.remove(restaurant_id)
+    assert not index.remove(0)
+
+    moved = _make_restaurants(1, seed=99)[0]
+    moved.id = 1
+    index.add(moved)
+
+    live = {r.id: r for r in restaurants if r.id % 3 != 0}
+    live[1] = moved
+    assert len(index) == len(live)
+    assert 0 not in index and 1 in index
+
+    ordered = sorted(live.values(), key=lambda r: (r.id == 1, r.id))
+    expected = _brute_force(ordered, *CENTER)
+    result = index.query_radius(*CENTER, 15.0)
+    assert [r.id for r, _ in result] == [r.id for d, _, r in expected if d <= 15.0]
+    assert [r.id for r, _ in index.query_knn(*CENTER, 10)] == [r.id for _, _, r in expected[:10]]
+
+    index.rebuild()
+    assert [r.id for r, _ in index.query_radius(*CENTER, 15.0)] == [r.id for r, _ in result]
+
+
+def test_grid_index_matches_brute_force():
+    """testa a grade uniforme contra a varredura completa, com atualizacoes no lugar"""
+    print("\n=== teste da grade uniforme ===")
+
+    restaurants = _make_restaurants(3000)
+    index = GridIndex.for_radius(2.0, restaurants)
+    assert len(index) == 3000
+    assert sum(index.cell_counts().values()) == 3000
+
+    rng = random.Random(7)
+    for _ in range(20):
+        lat = CENTER[0] + rng.uniform(-0.3, 0.3)
+        lon = CENTER[1] + rng.uniform(-0.3, 0.3)
+        expected = _brute_force(restaurants, lat, lon)
+        for km in [0.5, 2.0, 10.0]:
+            in_radius = [(r.id, d) for d, _, r in expected if d <= km]
+            assert [(r.id, d) for r, d in index.query_radius(lat, lon, km)] == in_radius
+            assert index.estimate_count(lat, lon, km) >= len(in_radius)
+
+        radius = index.radius_for_count(lat, lon, 40, 25.0)
+        assert radius is not None
+        assert len(index.query_radius(lat, lon, radius)) >= 40
+
+    for restaurant_id in range(0, 3000, 2):
+        assert index.remove(restaurant_id)
+    assert not index.remove(0)
+    assert len(index) == 1500 and 0 not in index
+
+    expected = _brute_force([r for r in restaurants if r.id % 2], *CENTER)
+    assert [r.id for r, _ in index.query_radius(*CENTER, 5.0)] == [r.id for d, _, r in expected if d <= 5.0]
+
+    print("✅ grade uniforme equivalente a varredura completa")
+
+
+def test_grid_index_antimeridian():
+    """testa consultas que cruzam o antimeridiano"""
+    west = Restaurant(id='w', name='oeste', latitude=0.0, longitude=179.99, rating=4.0,
+                      cuisine_type='brasileira', price_range='medio', address='a')
+    east = Restaurant(id='e', name='leste', latitude=0.0, longitude=-179.99, rating=4.0,
+                      cuisine_type='brasileira', price_range='medio', address='b')
+    index = GridIndex(0.7, [west, east])
+    assert [r.id for r, _ in index.query_radius(0.0, 180.0, 5.0)] == ['w', 'e']
+
+    # consultas perto do antimeridiano (sem estar nele), com a ultima coluna parcial
+    rng = random.Random(3)
+    restaurants = [
+        Restaurant(id=i, name=f"r{i}", latitude=rng.uniform(-0.5, 0.5),
+                   longitude=(rng.uniform(179.5, 180.5) + 180) % 360 - 180, rating=4.0,
+                   cuisine_type='brasileira', price_range='medio', address='c')
+        for i in range(400)
+    ]
+    restaurants.append(Restaurant(id=400, name='borda', latitude=-0.2914, longitude=-179.9922, rating=4.0,
+                                  cuisine_type='brasileira', price_range='medio', address='d'))
+    for cell_km in [5.0, 0.7, 3.3]:
+        index = GridIndex(cell_km, restaurants)
+        for lat, lon, km in [(-0.2752, 179.7488, 30.0), (0.1, -179.8, 25.0), (0.0, 179.95, 8.0), (0.3, -179.99, 2.0)]:
+            expected = [(r.id, d) for d, _, r in _brute_force(restaurants, lat, lon) if d <= km]
+            assert [(r.id, d) for r, d in index.query_radius(lat, lon, km)] == expected
+
+
+def test_engine_keyword_density_radius():
+    """testa a ingestao ao vivo (grade de densidade e nomes) e o raio inicial da busca por palavra-chave"""
+    print("\n=== teste do raio pela grade de densidade ===")
+
+    engine = RecommendationEngine(live_ingestion=True)
+    for index in (engine.density_index, engine.name_index):
+        assert index in google_maps_service.restaurant_indexes
+        google_maps_service.restaurant_indexes.remove(index)
+
+    restaurants = _make_restaurants(400, seed=5, spread=0.1)
+    service = GoogleMapsService()
+    service.attach_index(engine.density_index)
+    service.attach_index(engine.name_index)
+    service._update_indexes(restaurants)
+    service._update_indexes(restaurants[:50])
+    assert len(engine.density_index) == 400 and len(engine.name_index) == 400
+
+    found = engine.search_by_name('Restaurante 12')
+    assert [r.id for r in found] == [12] + list(range(120, 130))
+
+    # culinaria rara: os filtros contam antes de aceitar o raio da grade
+    for restaurant in restaurants:
+        restaurant.cuisine_type = 'Japonesa' if restaurant.id % 25 == 0 else 'Brasileira'
+    engine.get_restaurants_from_api = lambda lat, lon, keyword=None: restaurants
+    radius = engine.density_index.radius_for_count(*CENTER, 5, 25.0)
+    assert radius is not None and radius < 5.0
+
+    # com a grade aquecida o resultado e o mesmo de um motor sem grade (raio maximo)
+    fresh = RecommendationEngine()
+    fresh.get_restaurants_from_api = engine.get_restaurants_from_api
+    for filters in [None, {'cuisine_types': ['japonesa']}, {'sort_preference': 'rating'},
+                    {'sort_preference': 'rating', 'cuisine_types': ['japonesa']}, {'radius_km': 2.0}]:
+        expected = fresh.get_recommendations_with_keyword(*CENTER, 'restaurante', filters, max_results=5)
+        results = engine.get_recommendations_with_keyword(*CENTER, 'restaurante', filters, max_results=5)
+        assert [(r.id, r.distance) for r in results] == [(r.id, r.distance) for r in expected], filters
+        assert len(results) == 5 or filters == {'radius_km': 2.0}
+
+    japanese = engine.get_recommendations_with_keyword(*CENTER, 'japonesa', {'cuisine_types': ['japonesa']}, 5)
+    assert max(r.distance for r in japanese) > radius
+
+    print(f"✅ grade de densidade (raio {radius:.2f}km) sem truncar resultados filtrados")
+
+
+def test_engine_keyword_merges_cuisine_sources():
+    """testa a busca por varias culinarias: uma fonte por culinaria, intercaladas sem repeticao"""
+    print("\n=== teste da busca por varias culinarias ===")
+
+    restaurants = _make_restaurants(300, seed=9, spread=0.2)
+    for restaurant in restaurants:
+        restaurant.cuisine_type = 'Japonesa' if restaurant.id % 2 else 'Italiana'
+    by_keyword = {
+        'japonesa': [r for r in restaurants if r.id % 2],
+        # a segunda fonte repete parte da primeira, como acontece com as respostas do google
+        'italiana': [r for r in restaurants if not r.id % 2] + [r for r in restaurants if r.id % 6 == 1],
+    }
+    calls = []
+
+    engine = RecommendationEngine()
+    engine.get_restaurants_from_api = lambda lat, lon, keyword=None: calls.append(keyword) or by_keyword[keyword]
+    filters = {'cuisine_types': ['japonesa', 'italiana'], 'radius_km': 3.0}
+    results = engine.get_recommendations_with_keyword(*CENTER, 'japonesa ou italiana', filters, max_results=8)
+
+    assert calls == ['japonesa', 'italiana']
+    expected = [r.id for d, _, r in _brute_force(restaurants, *CENTER) if d <= 3.0][:8]
+    assert [r.id for r in results] == expected
+
+    # distancias ausentes encerram o merge em vez de quebrar a comparacao
+    views = engine.calculate_distances(None, restaurants[:3], {'latitude': CENTER[0], 'longitude': CENTER[1]})
+    views = sorted(views, key=lambda view: view.distance)
+    assert engine.merge_sorted_sources([views, [Restaurant(
+        id=999, name='sem distancia', latitude=0.0, longitude=0.0, rating=4.0,
+        cuisine_type='Italiana', price_range='medio', address='x'
+    )]], 50.0) == views
+
+    print("✅ culinarias buscadas separadamente e intercaladas por distancia")
@@ -0,0 +1,345 @@
+"""
+testes dos modelos de dados do projeto sabora
+"""
+
+import sys
+import os
+import random
+from fnmatch import fnmatchcase
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, fields
+
+# adicionar o diretorio src ao path para imports relativos
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from models.restaurant import Restaurant, restaurants_to_dicts, dicts_to_restaurants
+from models.restaurant_table import RestaurantTable
+from models.restaurant_view import RestaurantView
+from nlp.cuisine_taxonomy import (
+    CUISINE_CODES, CUISINE_LABELS, CUISINE_TERMS, classify_place, classify_place_with_mask, compile_cuisine_filter,
+    cuisine_mask, cuisines_of
+)
+from services.google_maps_service import GoogleMapsService
+from algorithms.columnar_algorithms import HAS_NUMPY
+from utils.geo_utils import format_distance
+from algorithms.sorting_algorithms import multi_key_sort
+from processors.recommendation_engine import RecommendationEngine
+from services.cache_service import CacheService, cache_service
+
+
+def _make_restaurant(**overrides):
+    """cria um restaurante de teste com distancia e posicao preenchidas"""
+    data = dict(
+        id=1, name='restaurante a', latitude=-9.6498, longitude=-35.7089, rating=4.5,
+        cuisine_type='brasileira', price_range='medio', address='rua a, 123',
+        features=['wifi', 'delivery']
+    )
+    data.update(overrides)
+    restaurant = Restaurant(**data)
+    restaurant.update_distance(1.25, '1.2 km')
+    restaurant.update_rank(2)
+    restaurant.update_recommendation_score(87.5)
+    return restaurant
+
+
+def test_restaurant_to_dict_matches_asdict():
+    """testa se o to_dict manual gera o mesmo dicionario (e a mesma ordem) do asdict"""
+    print("=== teste da serializacao do restaurante ===")
+
+    for restaurant in [_make_restaurant(), _make_restaurant(features=[], phone='82 9999-0000'),
+                       Restaurant(2, 'b', 0.0, 0.0, 3.0, 'italiana', 'alto', 'rua b')]:
+        data = restaurant.to_dict()
+        # a mascara de culinarias e derivada de cuisine_type e nao e serializada
+        expected = asdict(restaurant)
+        del expected['cuisine_mask']
+        assert data == expected
+        assert list(data) == [f.name for f in fields(Restaurant) if f.name != 'cuisine_mask']
+
+    # a lista de caracteristicas e copiada, como no asdict
+    restaurant = _make_restaurant()
+    data = restaurant.to_dict()
+    data['features'].append('musica ao vivo')
+    assert restaurant.features == ['wifi', 'delivery']
+
+    restaurants = [_make_restaurant(id=i) for i in range(5)]
+    assert dicts_to_restaurants(restaurants_to_dicts(restaurants)) == restaurants
+
+    print("✅ serializacao equivalente ao asdict")
+
+
+def test_restaurant_uses_slots():
+    """testa se o restaurante nao tem __dict__ e rejeita atributos desconhecidos"""
+    restaurant = _make_restaurant()
+    assert not hasattr(restaurant, '__dict__')
+    try:
+        restaurant.distance_km = 1.0
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("AttributeError esperado para atributo fora dos slots")
+
+
+def test_cached_recommendations_keep_distance():
+    """testa se as recomendacoes lidas do cache mantem distancia, posicao e score"""
+    restaurants = [_make_restaurant(id=i, name=f"restaurante {i}") for i in range(3)]
+    query, filters = 'teste de cache dos modelos', {'sort_preference': 'distance'}
+    cache_service.set(-9.6498, -35.7089, query, filters, restaurants_to_dicts(restaurants))
+    cached = RecommendationEngine().get_recommendations_with_cache(-9.6498, -35.7089, query, filters)
+    assert cached == restaurants
+
+
+class _ScanOnlyRedis:
+    """redis em memoria que so aceita SCAN (KEYS falha, como deveria em producao)"""
+
+    def __init__(self, keys):
+        self.data = dict.fromkeys(keys, b'[]')
+        self.scans = []
+
+    def keys(self, pattern):
+        raise AssertionError("KEYS bloqueia o redis; use scan_iter")
+
+    def scan_iter(self, match=None, count=None):
+        # como o redis-py sem decode_responses: chaves em bytes
+        self.scans.append(match)
+        return iter([key.encode() for key in list(self.data) if fnmatchcase(key, match)])
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key.decode(), None) is not None for key in keys)
+
+
+def test_cache_invalidation_scans_only_covered_cells():
+    """testa se a invalidacao por regiao faz um unico SCAN e apaga so as celulas de geohash do raio"""
+    service = CacheService('redis://127.0.0.1:1/0')
+    near = service._generate_cache_key(-9.6498, -35.7089, 'pizza', {})
+    far = service._generate_cache_key(-23.5505, -46.6333, 'pizza', {})
+    service.redis_client = _ScanOnlyRedis([near, far])
+    service.cache_enabled = True
+
+    assert service.invalidate_by_location(-9.6498, -35.7089, 25.0) == 1
+    assert list(service.redis_client.data) == [far]
+    assert service.redis_client.scans == ['sabora:recommendations:*']
+
+
+def _make_catalog(count: int, seed: int = 7):
+    """cria um catalogo variado (culinarias, precos, notas ausentes) em torno de maceio"""
+    rng = random.Random(seed)
+    cuisines = ['japonesa', 'Sushi Bar', 'italiana', 'pizzaria', 'brasileira', 'churrascaria', 'café']
+    return [
+        Restaurant(
+            id=f"place-{i}", name=f"restaurante {i}",
+            latitude=-9.6498 + rng.uniform(-0.2, 0.2), longitude=-35.7089 + rng.uniform(-0.2, 0.2),
+            rating=None if i % 17 == 0 else round(rng.uniform(3.0, 5.0), 1),
+            cuisine_type=rng.choice(cuisines), price_range=rng.choice(['baixo', 'Medio', 'alto', '$$']),
+            address=f"rua {i}", features=['wifi'] if i % 2 else []
+        )
+        for i in range(count)
+    ]
+
+
+def test_restaurant_table_matches_objects():
+    """testa se a tabela colunar filtra, ordena e materializa como os objetos restaurant"""
+    if not HAS_NUMPY:
+        print("⚠️ numpy indisponivel, RestaurantTable nao testado")
+        return
+
+    print("\n=== teste do RestaurantTable ===")
+
+    restaurants = _make_catalog(500)
+    for i, restaurant in enumerate(restaurants):
+        if i % 3:
+            restaurant.update_distance(round(i * 0.01, 2), format_distance(round(i * 0.01, 2)))
+    table = RestaurantTable.from_restaurants(restaurants)
+    assert len(table) == 500
+    assert table.ids == [r.id for r in restaurants]
+    assert table.to_dicts()[1] == restaurants[1].to_dict()
+    assert [r.price_range for r in table[10:20].to_restaurants()] == [r.price_range for r in restaurants[10:20]]
+
+    for cuisine_types, price_range, min_rating, max_distance in [
+        (['japonesa'], None, None, None),
+        (['italiana', 'brasileira'], 'medio', 4.0, None),
+        (None, None, 3.5, 4.0),
+    ]:
+        expected = [
+            r.id for r in restaurants
+            if r.matches_cuisine_filter(cuisine_types) and r.matches_price_filter(price_range)
+            and (not min_rating or (r.rating is not None and r.rating >= min_rating))
+            and (max_distance is None or (r.distance is not None and r.distance <= max_distance))
+        ]
+        result = table.filter_by(max_distance=max_distance, min_rating=min_rating,
+                                 cuisine_types=cuisine_types, price_range=price_range)
+        assert result.ids == expected
+
+    with_distance = [r for r in restaurants if r.distance is not None]
+    sort_keys = [('rating', True), ('distance', False), ('price_value', False)]
+    expected = [r.id for r in multi_key_sort(with_distance.copy(), sort_keys)]
+    sub_table = RestaurantTable.from_restaurants(with_distance)
+    assert sub_table.sort(sort_keys).ids == expected
+    assert sub_table.top_k(sort_keys, 7).ids == expected[:7]
+
+    print("✅ RestaurantTable equivalente aos objetos")
+
+
+def _same_ranking(result, expected):
+    """mesmos restaurantes e posicoes; distancias a menos de 1 m (a tabela usa microgradus int32)"""
+    assert [(r.id, r.rank) for r in result] == [(r.id, r.rank) for r in expected]
+    assert all(abs(a.distance - b.distance) < 1e-3 for a, b in zip(result, expected))
+
+
+def test_engine_table_ranking_matches_object_flow():
+    """testa se o ranqueamento em colunas do motor devolve as mesmas recomendacoes do fluxo em objetos"""
+    if not HAS_NUMPY:
+        return
+
+    restaurants = _make_catalog(3000)
+    restaurants[5].latitude = None
+    restaurants[6].longitude = 200.0
+
+    engine = RecommendationEngine()
+    engine.set_restaurants(restaurants)
+    engine.set_user_location(-9.6498, -35.7089)
+    for radius_km in [2.0, 10.0]:
+        objects = engine.calculate_distances(radius_km)
+        table = engine.calculate_distances_table(radius_km)
+        assert table.ids == [r.id for r in objects]
+
+        in_radius = engine.binary_search_radius_filter(engine.bubble_sort_by_distance(objects), radius_km)
+        expected = engine.top_k_by_rating(in_radius, 10)
+        _same_ranking(engine.rank_columnar(table, radius_km, 10), expected)
+        assert engine.rank_columnar(objects, radius_km, 10) == expected
+
+    # a tabela do catalogo e montada uma vez; listas da requisicao nao montam tabela
+    catalog_table = engine._get_restaurant_table()
+    from_catalog = engine.get_recommendations(-9.6498, -35.7089, 10.0, 10, restaurants)
+    from_request = engine.get_recommendations(-9.6498, -35.7089, 10.0, 10, list(restaurants))
+    _same_ranking(from_catalog, from_request)
+    assert engine._get_restaurant_table() is catalog_table
+    assert all(view.restaurant is restaurants[int(view.id.split('-')[1])] for view in from_catalog)
+
+
+def test_restaurant_view_annotates_without_copying():
+    """testa se a visao le os campos do restaurante base e guarda so as anotacoes da requisicao"""
+    base = Restaurant('place-1', 'restaurante a', -9.6498, -35.7089, 4.5, 'japonesa', 'alto', 'rua a', features=['wifi'])
+    view = RestaurantView(base, 1.5, '1.5 km')
+    view.update_rank(1)
+    view.update_recommendation_score(90.0)
+
+    assert view.name == 'restaurante a' and view.price_value == 4
+    assert view.matches_cuisine_filter(['japonesa']) and view.is_within_radius(0, 0, 2.0)
+    assert RestaurantView(view).restaurant is base
+
+    expected = _make_restaurant(id='place-1', cuisine_type='japonesa', price_range='alto', address='rua a', features=['wifi'])
+    expected.update_distance(1.5, '1.5 km')
+    expected.update_rank(1)
+    expected.update_recommendation_score(90.0)
+    assert view.to_dict() == expected.to_dict()
+    assert view == expected and expected == view
+    assert dicts_to_restaurants(restaurants_to_dicts([view])) == [expected]
+
+    # o restaurante base nao recebe as anotacoes e nao pode ser alterado pela visao
+    assert base.distance is None and base.rank is None and base.recommendation_score is None
+    try:
+        view.name = 'outro'
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("AttributeError esperado ao alterar o restaurante pela visao")
+
+
+def test_concurrent_requests_share_catalog():
+    """testa se requisicoes concorrentes no mesmo motor anotam distancias independentes"""
+    restaurants = _make_catalog(300)
+    for restaurant in restaurants:
+        restaurant.rating = restaurant.rating or 4.0  # o score de recomendacao exige nota
+    users = [(-9.6498 + 0.02 * i, -35.7089 - 0.02 * i) for i in range(8)]
+    engine = RecommendationEngine(columnar_threshold=None)
+    engine.set_restaurants(restaurants)
+
+    def request(user):
+        user_location = {'latitude': user[0], 'longitude': user[1]}
+        views = engine.calculate_distances(restaurants=restaurants, user_location=user_location)
+        ranked = engine.get_recommendations(*user, 10.0, 5, restaurants)
+        nearest = engine.get_nearest_recommendations(*user, k=5)
+        return (
+            {view.id: view.distance for view in views},
+            [(view.id, view.rank) for view in ranked],
+            [(view.id, view.distance) for view in nearest]
+        )
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(request, users * 4))
+
+    assert results == [request(user) for user in users * 4]
+    assert results[0] != results[1]
+    assert engine.restaurants is restaurants and engine.user_location is None
+    assert all(r.distance is None and r.rank is None for r in restaurants)
+
+
+def _legacy_cuisine_matches(cuisine_type, cuisine_types):
+    """busca por substring da versao anterior a taxonomia (referencia do teste)"""
+    if not cuisine_types:
+        return True
+    label = cuisine_type.lower()
+    for cuisine in cuisine_types:
+        cuisine_lower = cuisine.lower()
+        if cuisine_lower in label:
+            return True
+        if any(term in label for term in CUISINE_TERMS.get(cuisine_lower, ())):
+            return True
+    return False
+
+
+def test_cuisine_taxonomy_matches_legacy_filter():
+    """testa se o filtro por mascara de bits aceita o mesmo que a busca por substring"""
+    print("\n=== teste da taxonomia de culinarias ===")
+
+    labels = ['Japonesa', 'Pizzaria', 'Brasileira', 'Churrascaria', 'Frutos do Mar', 'Vegetariana', 'Café',
+              'Restaurante', 'Tailandesa', 'Sushi Bar', 'Árabe', 'Fast Food', 'Padaria', 'cervejaria artesanal']
+    filters = [['japonesa'], ['italiana', 'bar'], ['Brasileira'], ['vegana'], ['nordestina'], ['tailandesa'],
+               ['frutos do mar', 'padaria'], ['fast food'], ['sushi'], [], None]
+    for label in labels:
+        for cuisine_types in filters:
+            restaurant = Restaurant(1, 'a', 0.0, 0.0, 4.0, label, 'medio', 'rua a')
+            expected = _legacy_cuisine_matches(label, cuisine_types)
+            assert restaurant.matches_cuisine_filter(cuisine_types) == expected, (label, cuisine_types)
+            assert restaurant.matches_cuisine_filter(compile_cuisine_filter(cuisine_types)) == expected
+
+    # chaves sem acento (como as de nlp.synonyms.CULINARIA) caem na mesma culinaria
+    for unaccented, label in [('arabe', 'Árabe'), ('mediterranea', 'Mediterrânea'), ('cafe', 'Café')]:
+        assert compile_cuisine_filter([unaccented]).mask == compile_cuisine_filter([label]).mask
+        assert Restaurant(1, 'a', 0.0, 0.0, 4.0, label, 'medio', 'rua a').matches_cuisine_filter([unaccented])
+
+    assert cuisines_of('Pizzaria') == ['italiana']
+    assert cuisines_of('Sushi Bar') == ['japonesa', 'bar']
+    assert cuisine_mask('Restaurante') == 0
+
+    # rotulos do google: nome primeiro (mais preciso), depois o primeiro tipo conhecido
+    assert classify_place(['restaurant', 'bar'], 'Temakeria Sushi Express') == 'Japonesa'
+    assert classify_place(['bar', 'restaurant'], 'Casa do Chopp') == 'Bar'
+    assert classify_place(['point_of_interest'], '') == 'Restaurante'
+
+    # rotulos derivados de CUISINE_TERMS: o nome e o tipo do google levam a mesma culinaria
+    for cuisine, label in CUISINE_LABELS.items():
+        assert cuisine_mask(label) >> CUISINE_CODES[cuisine] & 1, label
+    assert classify_place([], 'Pizza da Vila') == classify_place(['pizza_restaurant'], 'Vila') == 'Italiana'
+    assert classify_place([], 'Restaurante Japão') == 'Restaurante'
+    assert classify_place_with_mask(['restaurant'], 'Sushi da Praça') == ('Japonesa', cuisine_mask('Japonesa'))
+
+    # a mascara e guardada na ingestao e usada pelos filtros (objetos e tabela)
+    restaurant = GoogleMapsService()._place_to_restaurant({
+        'place_id': 'abc', 'name': 'Cantina Pizza Nostra', 'rating': 4.2, 'types': ['restaurant'],
+        'geometry': {'location': {'lat': -9.65, 'lng': -35.71}}
+    })
+    assert (restaurant.cuisine_type, restaurant.cuisine_mask) == ('Italiana', cuisine_mask('Italiana'))
+    assert restaurant.matches_cuisine_filter(['italiana']) and not restaurant.matches_cuisine_filter(['japonesa'])
+    stored = Restaurant(2, 'b', 0.0, 0.0, 4.0, 'Casa do Chef', 'medio', 'rua b',
+                        cuisine_mask=cuisine_mask('Japonesa'))
+    assert stored.matches_cuisine_filter(['japonesa'])
+    # ao carregar de um dicionario (ex: cache), a mascara vem do rotulo, nao do dicionario
+    assert 'cuisine_mask' not in restaurant.to_dict()
+    loaded = Restaurant.from_dict({**restaurant.to_dict(), 'cuisine_mask': cuisine_mask('Japonesa')})
+    assert loaded.cuisine_mask == cuisine_mask('Italiana')
+    if HAS_NUMPY:
+        table = RestaurantTable.from_restaurants([restaurant, stored])
+        assert table.filter_by(cuisine_types=['japonesa']).ids == [2]
+
+    print("✅ taxonomia equivalente a busca por substring")
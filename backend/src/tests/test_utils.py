@@ -0,0 +1,345 @@
+"""
+testes dos utilitarios geograficos do projeto sabora
+"""
+
+import sys
+import os
+import math
+import random
+
+# adicionar o diretorio src ao path para imports relativos
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils import geo_utils
+from utils.geo_utils import (
+    calculate_distance, calculate_distances_batch, prepare_coordinates, geohash_encode, geohash_decode,
+    geohash_bounds, geohash_neighbors, geohash_cover, distance_to_bounds, is_within_radius,
+    approximate_distances_batch, approximate_distance_error_bound, distances_within_radius,
+    distance_matrix, iter_distance_matrix, pack_coordinates, unpack_coordinates, to_microdegrees,
+    from_microdegrees, calculate_bearing, calculate_bearings_batch, positions_in_sector,
+    point_segment_distances_batch, geographic_midpoint
+)
+
+
+def _make_points(count: int, seed: int = 42):
+    """cria coordenadas aleatorias em torno de maceio"""
+    rng = random.Random(seed)
+    lats = [rng.uniform(-10.5, -8.5) for _ in range(count)]
+    lons = [rng.uniform(-36.5, -34.5) for _ in range(count)]
+    return lats, lons
+
+
+def test_calculate_distances_batch_matches_scalar():
+    """testa se o calculo em lote produz as mesmas distancias do calculo ponto a ponto"""
+    print("=== teste do haversine em lote ===")
+
+    lat, lon = -9.6498, -35.7089
+    lats, lons = _make_points(500)
+    lats.append(lat)
+    lons.append(lon)
+
+    expected = [calculate_distance(lat, lon, lats[i], lons[i]) for i in range(len(lats))]
+    prepared = prepare_coordinates(lats, lons)
+
+    for result in [calculate_distances_batch(lat, lon, lats, lons),
+                   calculate_distances_batch(lat, lon, prepared=prepared)]:
+        assert len(result) == len(expected)
+        assert all(abs(a - b) <= 1e-4 for a, b in zip(result, expected))
+        assert result[-1] == 0.0
+
+    # caminho sem numpy
+    original_np = geo_utils.np
+    geo_utils.np = None
+    try:
+        result = calculate_distances_batch(lat, lon, lats, lons)
+    finally:
+        geo_utils.np = original_np
+    assert list(result) == expected
+
+    assert len(calculate_distances_batch(lat, lon, [], [])) == 0
+
+    print("✅ haversine em lote equivalente ao calculo individual")
+
+
+def test_calculate_distances_batch_validation():
+    """testa a validacao das coordenadas no calculo em lote"""
+    invalid_calls = [
+        ((-91, 0, [0.0], [0.0]), "latitude do centro"),
+        ((0, 181, [0.0], [0.0]), "longitude do centro"),
+        ((0, 0, [0.0, 95.0], [0.0, 0.0]), "latitude dos alvos"),
+        ((0, 0, [0.0], [-200.0]), "longitude dos alvos"),
+        ((0, 0, [0.0, 1.0], [0.0]), "tamanhos diferentes"),
+    ]
+
+    for args, description in invalid_calls:
+        try:
+            calculate_distances_batch(*args)
+        except ValueError:
+            continue
+        raise AssertionError(f"ValueError esperado: {description}")
+
+
+def test_geohash_encode_decode():
+    """testa o geohash contra valores conhecidos e a volta decode -> encode"""
+    print("\n=== teste do geohash ===")
+
+    assert geohash_encode(57.64911, 10.40744, 11) == 'u4pruydqqvj'
+    assert geohash_encode(42.6, -5.6, 5) == 'ezs42'
+    assert geohash_encode(-90, -180, 4) == '0000'
+    assert geohash_encode(90, 180, 4) == 'zzzz'
+
+    lats, lons = _make_points(200)
+    for lat, lon in zip(lats, lons):
+        for precision in [1, 5, 8, 12]:
+            geohash = geohash_encode(lat, lon, precision)
+            lat_min, lat_max, lon_min, lon_max = geohash_bounds(geohash)
+            assert lat_min <= lat <= lat_max and lon_min <= lon <= lon_max
+            assert geohash_encode(*geohash_decode(geohash), precision) == geohash
+
+    for invalid in ['', 'a', '0' * 13]:
+        try:
+            geohash_decode(invalid)
+        except ValueError:
+            continue
+        raise AssertionError(f"ValueError esperado para {invalid!r}")
+
+    print("✅ geohash equivalente aos valores de referencia")
+
+
+def test_geohash_neighbors():
+    """testa os vizinhos, incluindo antimeridiano e polo"""
+    geohash = geohash_encode(-9.6498, -35.7089, 7)
+    lat_min, lat_max, lon_min, lon_max = geohash_bounds(geohash)
+    height, width = lat_max - lat_min, lon_max - lon_min
+    center_lat, center_lon = geohash_decode(geohash)
+
+    neighbors = geohash_neighbors(geohash)
+    assert neighbors['n'] == geohash_encode(center_lat + height, center_lon, 7)
+    assert neighbors['se'] == geohash_encode(center_lat - height, center_lon + width, 7)
+    assert neighbors['w'] == geohash_encode(center_lat, center_lon - width, 7)
+
+    assert geohash_neighbors(geohash_encode(0.0, 179.99, 3))['e'] == geohash_encode(0.0, -179.99, 3)
+    assert set(geohash_neighbors('u')) == {'e', 'se', 's', 'sw', 'w'}
+
+
+def test_geohash_cover():
+    """testa se a cobertura contem todos os pontos do circulo e so celulas que o intersectam"""
+    rng = random.Random(3)
+    for lat, lon, radius in [(-9.6498, -35.7089, 2.0), (-9.6498, -35.7089, 25.0), (0.01, 179.99, 3.0)]:
+        for precision in [None, 6]:
+            cover = geohash_cover(lat, lon, radius, precision)
+            cells = set(cover)
+            size = len(cover[0])
+            assert len(cells) == len(cover)
+
+            for _ in range(500):
+                point_lat = lat + rng.uniform(-0.3, 0.3)
+                point_lon = (lon + rng.uniform(-0.3, 0.3) + 180) % 360 - 180
+                if calculate_distance(lat, lon, point_lat, point_lon) <= radius:
+                    assert geohash_encode(point_lat, point_lon, size) in cells
+
+            for geohash in cover:
+                assert distance_to_bounds(lat, lon, *geohash_bounds(geohash)) <= radius * 1.01 + 1e-4
+
+    assert len(geohash_cover(-9.6498, -35.7089, 2.0)) <= 9
+
+
+def test_is_within_radius_uses_longitude_correction():
+    """testa o atalho retangular com a correcao de cos(lat) na longitude"""
+    # a 60 graus, 0.4 grau de longitude sao ~22 km (o atalho antigo descartava o ponto)
+    assert is_within_radius(60.0, 0.0, 60.0, 0.4, 25.0)
+    assert not is_within_radius(60.0, 0.0, 60.0, 0.5, 25.0)
+    assert is_within_radius(0.0, 179.9, 0.0, -179.9, 25.0)
+
+    lats, lons = _make_points(300)
+    for lat, lon in zip(lats, lons):
+        expected = calculate_distance(-9.6498, -35.7089, lat, lon) <= 50.0
+        assert is_within_radius(-9.6498, -35.7089, lat, lon, 50.0) == expected
+
+
+def test_approximate_distances_within_bounds():
+    """testa se a distancia aproximada fica dentro do erro garantido e preserva o filtro por raio"""
+    if geo_utils.np is None:
+        print("⚠️ numpy nao instalado, teste da distancia aproximada ignorado")
+        return
+
+    print("\n=== teste da distancia aproximada ===")
+
+    lat, lon = -9.6498, -35.7089
+    lats, lons = _make_points(2000)
+    approximate = approximate_distances_batch(lat, lon, lats, lons)
+    bound = approximate_distance_error_bound(lat, 200.0)
+    assert approximate_distance_error_bound(lat, 25.0) < 3e-6
+
+    for i in range(len(lats)):
+        exact = calculate_distance(lat, lon, lats[i], lons[i])
+        assert abs(approximate[i] - exact) <= exact * bound + 1e-4
+
+    for radius in [0.5, 5.0, 25.0, 80.0]:
+        exact_positions, exact_distances = distances_within_radius(lat, lon, radius, lats, lons, mode='exact')
+        positions, distances = distances_within_radius(lat, lon, radius, lats, lons, mode='approx')
+        assert positions == exact_positions
+        assert all(abs(a - b) <= b * bound + 1e-4 for a, b in zip(distances, exact_distances))
+
+    print("✅ distancia aproximada dentro do limite de erro")
+
+
+def test_distance_matrix_matches_scalar():
+    """testa a matriz de distancias e a versao em blocos contra o calculo ponto a ponto"""
+    print("\n=== teste da matriz de distancias ===")
+
+    lats, lons = _make_points(120)
+    points = list(zip(lats[:7], lons[:7]))
+    targets = [{'latitude': lat, 'longitude': lon} for lat, lon in zip(lats[7:], lons[7:])]
+    expected = [[calculate_distance(p_lat, p_lon, t['latitude'], t['longitude']) for t in targets]
+                for p_lat, p_lon in points]
+
+    matrix = distance_matrix(points, targets)
+    assert [list(row) for row in matrix] == expected
+
+    # blocos pequenos: linhas e colunas divididas
+    for max_cells in [1, 10, 200]:
+        blocks = list(iter_distance_matrix(points, targets, max_cells))
+        assert all(len(block) * len(block[0]) <= max(max_cells, len(block[0])) for _, _, block in blocks)
+        assert [list(row) for row in distance_matrix(points, targets, max_cells)] == expected
+
+    # caminho sem numpy
+    original_np = geo_utils.np
+    geo_utils.np = None
+    try:
+        matrix = distance_matrix(points, targets)
+    finally:
+        geo_utils.np = original_np
+    assert all(abs(a - b) <= 1e-4 for row, expected_row in zip(matrix, expected) for a, b in zip(row, expected_row))
+
+    assert len(distance_matrix([], targets)) == 0
+
+    print("✅ matriz de distancias equivalente ao calculo individual")
+
+
+def test_packed_coordinates():
+    """testa as coordenadas compactas em microgradus e os calculos em lote sobre elas"""
+    print("\n=== teste das coordenadas compactas ===")
+
+    assert to_microdegrees(-9.6498) == -9649800
+    assert from_microdegrees(to_microdegrees(-35.7089)) == -35.7089
+
+    lat, lon = -9.6498, -35.7089
+    lats, lons = _make_points(500)
+    lats[:2], lons[:2] = [90.0, -90.0], [180.0, -180.0]
+    packed = pack_coordinates(lats, lons)
+    unpacked_lats, unpacked_lons = unpack_coordinates(packed)
+    assert all(abs(a - b) <= 5e-7 for a, b in zip(unpacked_lats + unpacked_lons, lats + lons))
+    if geo_utils.np is not None:
+        assert packed.lat_e6.dtype.itemsize == 4 and packed.lat_e6.nbytes == 4 * len(lats)
+
+    # erro de posicao de no maximo ~8 cm por ponto, mais o arredondamento em 4 casas
+    expected = [calculate_distance(lat, lon, a, b) for a, b in zip(lats, lons)]
+    assert all(abs(a - b) <= 3e-4 for a, b in zip(calculate_distances_batch(lat, lon, packed=packed), expected))
+    assert [list(row) for row in distance_matrix([(lat, lon)], packed)] == \
+        [list(calculate_distances_batch(lat, lon, packed=packed))]
+
+    # so pontos colados na borda podem mudar de lado
+    inside = {i for i, distance in enumerate(expected) if distance <= 50.0}
+    for mode in ['exact', 'approx']:
+        positions, _ = distances_within_radius(lat, lon, 50.0, packed=packed, mode=mode)
+        assert all(abs(expected[i] - 50.0) <= 3e-4 for i in set(positions) ^ inside)
+
+    # caminho sem numpy
+    original_np = geo_utils.np
+    geo_utils.np = None
+    try:
+        fallback = pack_coordinates(lats, lons)
+        fallback_distances = calculate_distances_batch(lat, lon, packed=fallback)
+    finally:
+        geo_utils.np = original_np
+    assert list(fallback.lat_e6) == list(packed.lat_e6) and list(fallback.lon_e6) == list(packed.lon_e6)
+    assert all(abs(a - b) <= 1e-4 for a, b in zip(fallback_distances, calculate_distances_batch(lat, lon, packed=packed)))
+
+    for args in [([0.0, 91.0], [0.0, 0.0]), ([0.0], [181.0]), ([0.0], [])]:
+        try:
+            pack_coordinates(*args)
+        except ValueError:
+            continue
+        raise AssertionError(f"ValueError esperado: {args}")
+
+    print("✅ coordenadas compactas equivalentes as coordenadas em float")
+
+
+def test_bearings_batch_and_sector():
+    """testa os rumos em lote contra calculate_bearing e o teste de setor com a virada 360 -> 0"""
+    lat, lon = -9.6498, -35.7089
+    lats, lons = _make_points(300)
+    expected = [calculate_bearing(lat, lon, a, b) for a, b in zip(lats, lons)]
+
+    original_np = geo_utils.np
+    try:
+        for numpy_module in [original_np, None]:
+            geo_utils.np = numpy_module
+            bearings = calculate_bearings_batch(lat, lon, lats, lons)
+            assert all(abs(a - b) <= 1e-9 for a, b in zip(bearings, expected))
+            assert positions_in_sector([10.0, 350.0, 90.0, 180.0], 0.0, 45.0) == [0, 1]
+            assert positions_in_sector([10.0, 190.0], 200.0, 360.0) == [0, 1]
+            assert positions_in_sector(bearings, 45.0, 90.0) == [i for i, b in enumerate(expected) if b <= 90.0]
+    finally:
+        geo_utils.np = original_np
+
+    try:
+        positions_in_sector([0.0], 0.0, 0.0)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("ValueError esperado para abertura zero")
+
+
+def _slerp(start, end, fraction):
+    """ponto do arco de circulo maximo entre start e end"""
+    vectors = []
+    for lat, lon in (start, end):
+        lat_rad, lon_rad = math.radians(lat), math.radians(lon)
+        vectors.append((math.cos(lat_rad) * math.cos(lon_rad), math.cos(lat_rad) * math.sin(lon_rad), math.sin(lat_rad)))
+    angle = math.acos(min(sum(p * q for p, q in zip(*vectors)), 1.0))
+    if angle == 0:
+        return start
+    point = [(math.sin((1 - fraction) * angle) * p + math.sin(fraction * angle) * q) / math.sin(angle)
+             for p, q in zip(*vectors)]
+    return math.degrees(math.asin(point[2])), math.degrees(math.atan2(point[1], point[0]))
+
+
+def test_point_segment_distances():
+    """testa a distancia ate um trecho contra a amostragem densa do arco"""
+    rng = random.Random(5)
+    segments = [((-9.65, -35.75), (-9.60, -35.70)), ((-9.65, -35.75), (-9.65, -35.75)), ((0.0, 179.9), (0.1, -179.9))]
+    for start, end in segments:
+        lats = [start[0] + rng.uniform(-0.2, 0.2) for _ in range(40)]
+        lons = [(start[1] + rng.uniform(-0.2, 0.2) + 180) % 360 - 180 for _ in range(40)]
+        samples = [_slerp(start, end, step / 2000) for step in range(2001)]
+        expected = [min(calculate_distance(lat, lon, *sample) for sample in samples) for lat, lon in zip(lats, lons)]
+
+        original_np = geo_utils.np
+        try:
+            for numpy_module in [original_np, None]:
+                geo_utils.np = numpy_module
+                result = point_segment_distances_batch(*start, *end, lats, lons)
+                # a amostragem so superestima (pontos a cada ~4 m no arco)
+                assert all(0 <= b - a <= 1e-3 for a, b in zip(result, expected))
+        finally:
+            geo_utils.np = original_np
+
+
+def test_geographic_midpoint():
+    """testa o ponto medio na esfera, inclusive para grupos que cruzam o antimeridiano"""
+    lat, lon = geographic_midpoint([(-9.65, -35.75), (-9.60, -35.70)])
+    assert abs(lat - -9.625) < 1e-3 and abs(lon - -35.725) < 1e-3
+
+    lat, lon = geographic_midpoint([(10.0, 179.8), (10.2, -179.8), (10.1, 179.9)])
+    assert abs(lat - 10.1) < 1e-2 and abs(abs(lon) - 179.97) < 1e-2
+    assert all(calculate_distance(lat, lon, *point) < 30.0 for point in [(10.0, 179.8), (10.2, -179.8)])
+
+    assert geographic_midpoint([(0.0, 0.0), (0.0, 180.0)]) == (0.0, 0.0)
+    try:
+        geographic_midpoint([])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("ValueError esperado para lista vazia")
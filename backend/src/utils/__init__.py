@@ -8,7 +8,22 @@ from .geo_utils import (
     calculate_distance_from_dict,
     is_within_radius_from_dict,
     format_distance,
-    calculate_bearing
+    calculate_bearing,
+    prepare_coordinates,
+    pack_coordinates,
+    unpack_coordinates,
+    calculate_distances_batch,
+    calculate_bearings_batch,
+    positions_in_sector,
+    geographic_midpoint,
+    point_segment_distances_batch,
+    geohash_encode,
+    geohash_decode,
+    geohash_bounds,
+    geohash_neighbors,
+    geohash_cover,
+    distance_matrix,
+    iter_distance_matrix
 )
 
 __all__ = [
@@ -17,5 +32,20 @@ __all__ = [
     'calculate_distance_from_dict',
     'is_within_radius_from_dict',
     'format_distance',
-    'calculate_bearing'
+    'calculate_bearing',
+    'prepare_coordinates',
+    'pack_coordinates',
+    'unpack_coordinates',
+    'calculate_distances_batch',
+    'calculate_bearings_batch',
+    'positions_in_sector',
+    'geographic_midpoint',
+    'point_segment_distances_batch',
+    'geohash_encode',
+    'geohash_decode',
+    'geohash_bounds',
+    'geohash_neighbors',
+    'geohash_cover',
+    'distance_matrix',
+    'iter_distance_matrix'
 ]
@@ -4,12 +4,58 @@ implementa funcoes para calculo de distancia e verificacao de raio usando a form
 """
 
 import math
-from typing import Union, Dict
+from array import array
+from typing import Union, Dict, List, NamedTuple, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy e opcional: sem ele os calculos em lote usam array('d')
+    np = None
 
 
 # constantes para melhor performance
 EARTH_RADIUS_KM = 6371.0
 RADIANS_PER_DEGREE = math.pi / 180
+KM_PER_DEGREE = EARTH_RADIUS_KM * RADIANS_PER_DEGREE
+
+# modos de calculo de distancia por raio (distances_within_radius)
+DISTANCE_MODES = ('exact', 'approx')
+
+# meia unidade da ultima casa decimal das distancias (arredondadas em 4 casas)
+DISTANCE_ROUNDING_KM = 0.00005
+
+# coordenadas compactas: inteiros de 32 bits em microgradus (1e-6 grau, ~11 cm no equador)
+MICRODEGREES_PER_DEGREE = 1_000_000
+RADIANS_PER_MICRODEGREE = RADIANS_PER_DEGREE / MICRODEGREES_PER_DEGREE
+
+
+class PreparedCoordinates(NamedTuple):
+    """
+    coordenadas pre-processadas para calculos de distancia em lote
+    
+    Attributes:
+        lat_rad: latitudes em radianos
+        lon_rad: longitudes em radianos
+        cos_lat: cosseno de cada latitude
+    """
+    lat_rad: Sequence[float]
+    lon_rad: Sequence[float]
+    cos_lat: Sequence[float]
+
+
+class PackedCoordinates(NamedTuple):
+    """
+    coordenadas em microgradus guardadas em arrays contiguos de int32
+    
+    ocupam 8 bytes por ponto (contra ~64 bytes de dois floats python em listas)
+    e podem ser passadas direto para os calculos em lote
+    
+    Attributes:
+        lat_e6: latitudes em microgradus
+        lon_e6: longitudes em microgradus
+    """
+    lat_e6: Sequence[int]
+    lon_e6: Sequence[int]
 
 
 def calculate_distance(
@@ -101,13 +147,15 @@ def is_within_radius(
     if radius_km < 0:
         raise ValueError("raio deve ser um valor positivo")
     
-    # otimizacao: verificacao rapida usando aproximacao retangular
-    # para distancias pequenas, evita calculo completo de haversine
+    # otimizacao: verificacao rapida usando a caixa que envolve o circulo
+    # para pontos claramente fora, evita calculo completo de haversine
     lat_diff = abs(center_lat - target_lat)
     lon_diff = abs(center_lon - target_lon)
+    lon_diff = min(lon_diff, 360 - lon_diff)
     
-    # aproximacao rapida: 1 grau ≈ 111 km
-    if lat_diff > radius_km / 111 or lon_diff > radius_km / 111:
+    # a distancia nunca e menor que o arco em latitude, e a longitude de um ponto
+    # no circulo nao passa de asin(sin(raio) / cos(lat)) (o grau de longitude encolhe com cos(lat))
+    if lat_diff > radius_km / KM_PER_DEGREE or lon_diff > max_longitude_offset(center_lat, radius_km):
         return False
     
     distance = calculate_distance(center_lat, center_lon, target_lat, target_lon)
@@ -232,3 +280,958 @@ def calculate_bearing(
     
     # normalizar para 0-360 graus
     return (bearing_deg + 360) % 360
+
+
+def _validate_center(lat: Union[float, int], lon: Union[float, int]) -> None:
+    if not -90 <= lat <= 90:
+        raise ValueError("latitude deve estar entre -90 e 90 graus")
+    if not -180 <= lon <= 180:
+        raise ValueError("longitude deve estar entre -180 e 180 graus")
+
+
+def prepare_coordinates(lats: Sequence[float], lons: Sequence[float]) -> PreparedCoordinates:
+    """
+    valida as coordenadas uma unica vez e pre-calcula radianos e cos(lat)
+    
+    o resultado pode ser reaproveitado em varios calculos em lote sobre o mesmo catalogo
+    
+    Args:
+        lats: latitudes em graus decimais
+        lons: longitudes em graus decimais
+    
+    Returns:
+        PreparedCoordinates com arrays numpy (ou array('d') sem numpy)
+    
+    Raises:
+        ValueError: se os tamanhos forem diferentes ou alguma coordenada estiver fora dos limites
+    """
+    if len(lats) != len(lons):
+        raise ValueError("lats e lons devem ter o mesmo tamanho")
+    
+    if np is not None:
+        lat_values = np.asarray(lats, dtype=np.float64)
+        lon_values = np.asarray(lons, dtype=np.float64)
+        if lat_values.size and not (np.all(lat_values >= -90) and np.all(lat_values <= 90)):
+            raise ValueError("latitude deve estar entre -90 e 90 graus")
+        if lon_values.size and not (np.all(lon_values >= -180) and np.all(lon_values <= 180)):
+            raise ValueError("longitude deve estar entre -180 e 180 graus")
+        lat_rad = lat_values * RADIANS_PER_DEGREE
+        return PreparedCoordinates(lat_rad, lon_values * RADIANS_PER_DEGREE, np.cos(lat_rad))
+    
+    lat_values = array('d', lats)
+    lon_values = array('d', lons)
+    if lat_values and not (-90 <= min(lat_values) and max(lat_values) <= 90):
+        raise ValueError("latitude deve estar entre -90 e 90 graus")
+    if lon_values and not (-180 <= min(lon_values) and max(lon_values) <= 180):
+        raise ValueError("longitude deve estar entre -180 e 180 graus")
+    lat_rad = array('d', [value * RADIANS_PER_DEGREE for value in lat_values])
+    return PreparedCoordinates(
+        lat_rad,
+        array('d', [value * RADIANS_PER_DEGREE for value in lon_values]),
+        array('d', [math.cos(value) for value in lat_rad])
+    )
+
+
+def to_microdegrees(value: Union[float, int]) -> int:
+    """
+    converte graus decimais para microgradus inteiros (arredondando)
+    
+    Example:
+        >>> to_microdegrees(-9.6498)
+        -9649800
+    """
+    return round(value * MICRODEGREES_PER_DEGREE)
+
+
+def from_microdegrees(value: int) -> float:
+    """
+    converte microgradus inteiros para graus decimais
+    
+    Example:
+        >>> from_microdegrees(-35708900)
+        -35.7089
+    """
+    return value / MICRODEGREES_PER_DEGREE
+
+
+def pack_coordinates(lats: Sequence[float], lons: Sequence[float]) -> PackedCoordinates:
+    """
+    valida as coordenadas e guarda em microgradus int32 (erro maximo de 0.5e-6 grau por eixo)
+    
+    Args:
+        lats: latitudes em graus decimais
+        lons: longitudes em graus decimais
+    
+    Returns:
+        PackedCoordinates com arrays numpy int32 (ou array('i') sem numpy)
+    
+    Raises:
+        ValueError: se os tamanhos forem diferentes ou alguma coordenada estiver fora dos limites
+    """
+    if len(lats) != len(lons):
+        raise ValueError("lats e lons devem ter o mesmo tamanho")
+    
+    if np is not None:
+        lat_values = np.asarray(lats, dtype=np.float64)
+        lon_values = np.asarray(lons, dtype=np.float64)
+        if lat_values.size and not (np.all(lat_values >= -90) and np.all(lat_values <= 90)):
+            raise ValueError("latitude deve estar entre -90 e 90 graus")
+        if lon_values.size and not (np.all(lon_values >= -180) and np.all(lon_values <= 180)):
+            raise ValueError("longitude deve estar entre -180 e 180 graus")
+        return PackedCoordinates(
+            np.rint(lat_values * MICRODEGREES_PER_DEGREE).astype(np.int32),
+            np.rint(lon_values * MICRODEGREES_PER_DEGREE).astype(np.int32)
+        )
+    
+    if lats and not (-90 <= min(lats) and max(lats) <= 90):
+        raise ValueError("latitude deve estar entre -90 e 90 graus")
+    if lons and not (-180 <= min(lons) and max(lons) <= 180):
+        raise ValueError("longitude deve estar entre -180 e 180 graus")
+    return PackedCoordinates(
+        array('i', [to_microdegrees(value) for value in lats]),
+        array('i', [to_microdegrees(value) for value in lons])
+    )
+
+
+def unpack_coordinates(packed: PackedCoordinates) -> Tuple[List[float], List[float]]:
+    """
+    converte coordenadas compactas de volta para listas de graus decimais
+    
+    Args:
+        packed: resultado de pack_coordinates
+    
+    Returns:
+        tupla (latitudes, longitudes)
+    """
+    return (
+        [from_microdegrees(value) for value in packed.lat_e6],
+        [from_microdegrees(value) for value in packed.lon_e6]
+    )
+
+
+def _prepare_packed(packed: PackedCoordinates) -> PreparedCoordinates:
+    # radianos direto dos inteiros (ja validados em pack_coordinates), sem passar por graus
+    if np is not None:
+        lat_rad = packed.lat_e6 * RADIANS_PER_MICRODEGREE
+        return PreparedCoordinates(lat_rad, packed.lon_e6 * RADIANS_PER_MICRODEGREE, np.cos(lat_rad))
+    lat_rad = array('d', [value * RADIANS_PER_MICRODEGREE for value in packed.lat_e6])
+    return PreparedCoordinates(
+        lat_rad,
+        array('d', [value * RADIANS_PER_MICRODEGREE for value in packed.lon_e6]),
+        array('d', [math.cos(value) for value in lat_rad])
+    )
+
+
+def calculate_distances_batch(
+    lat: Union[float, int],
+    lon: Union[float, int],
+    lats: Sequence[float] = None,
+    lons: Sequence[float] = None,
+    prepared: PreparedCoordinates = None,
+    packed: PackedCoordinates = None
+):
+    """
+    calcula a distancia de haversine de um ponto para varios pontos em uma unica chamada
+    
+    a validacao e feita uma vez por lote; com numpy o calculo e vetorizado,
+    sem numpy usa um laco sobre array('d') com radianos e cos(lat) pre-calculados
+    
+    Args:
+        lat: latitude do ponto central (em graus decimais)
+        lon: longitude do ponto central (em graus decimais)
+        lats: latitudes dos pontos alvo (ignorado se prepared for informado)
+        lons: longitudes dos pontos alvo (ignorado se prepared for informado)
+        prepared: resultado de prepare_coordinates para reaproveitar entre chamadas
+        packed: coordenadas compactas de pack_coordinates (ignorado se prepared for informado)
+    
+    Returns:
+        distancias em quilometros, arredondadas como em calculate_distance
+        (array numpy, ou array('d') sem numpy)
+    
+    Raises:
+        ValueError: se alguma coordenada estiver fora dos limites validos
+    
+    Example:
+        >>> calculate_distances_batch(-9.6498, -35.7089, [-9.6500, -9.6498], [-35.7090, -35.7089])
+        array([0.0248, 0.    ])
+    """
+    _validate_center(lat, lon)
+    if prepared is None:
+        prepared = _prepare_packed(packed) if packed is not None else prepare_coordinates(lats, lons)
+    
+    center_lat_rad = lat * RADIANS_PER_DEGREE
+    center_lon_rad = lon * RADIANS_PER_DEGREE
+    center_cos_lat = math.cos(center_lat_rad)
+    
+    if np is not None:
+        sin_dlat_half = np.sin((prepared.lat_rad - center_lat_rad) * 0.5)
+        sin_dlon_half = np.sin((prepared.lon_rad - center_lon_rad) * 0.5)
+        a = sin_dlat_half * sin_dlat_half + center_cos_lat * prepared.cos_lat * sin_dlon_half * sin_dlon_half
+        c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+        return np.round(EARTH_RADIUS_KM * c, 4)
+    
+    distances = array('d', bytes(8 * len(prepared.lat_rad)))
+    for i, (lat_rad, lon_rad, cos_lat) in enumerate(zip(prepared.lat_rad, prepared.lon_rad, prepared.cos_lat)):
+        sin_dlat_half = math.sin((lat_rad - center_lat_rad) * 0.5)
+        sin_dlon_half = math.sin((lon_rad - center_lon_rad) * 0.5)
+        a = sin_dlat_half * sin_dlat_half + center_cos_lat * cos_lat * sin_dlon_half * sin_dlon_half
+        distances[i] = round(EARTH_RADIUS_KM * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a)), 4)
+    return distances
+
+
+def calculate_bearings_batch(
+    lat: Union[float, int],
+    lon: Union[float, int],
+    lats: Sequence[float] = None,
+    lons: Sequence[float] = None,
+    prepared: PreparedCoordinates = None,
+    packed: PackedCoordinates = None
+):
+    """
+    calcula o rumo (como em calculate_bearing) de um ponto para varios pontos em uma unica chamada
+    
+    Args:
+        lat: latitude do ponto de origem (em graus decimais)
+        lon: longitude do ponto de origem (em graus decimais)
+        lats: latitudes dos destinos (ignorado se prepared ou packed for informado)
+        lons: longitudes dos destinos (ignorado se prepared ou packed for informado)
+        prepared: resultado de prepare_coordinates para reaproveitar entre chamadas
+        packed: coordenadas compactas de pack_coordinates (ignorado se prepared for informado)
+    
+    Returns:
+        rumos em graus (0-360, onde 0° = norte), como array numpy (ou array('d') sem numpy)
+    
+    Raises:
+        ValueError: se alguma coordenada estiver fora dos limites validos
+    """
+    _validate_center(lat, lon)
+    if prepared is None:
+        prepared = _prepare_packed(packed) if packed is not None else prepare_coordinates(lats, lons)
+    
+    lat1_rad = lat * RADIANS_PER_DEGREE
+    lon1_rad = lon * RADIANS_PER_DEGREE
+    sin_lat1 = math.sin(lat1_rad)
+    cos_lat1 = math.cos(lat1_rad)
+    
+    if np is not None:
+        dlon = prepared.lon_rad - lon1_rad
+        y = np.sin(dlon) * prepared.cos_lat
+        x = cos_lat1 * np.sin(prepared.lat_rad) - sin_lat1 * prepared.cos_lat * np.cos(dlon)
+        return (np.arctan2(y, x) / RADIANS_PER_DEGREE + 360) % 360
+    
+    bearings = array('d', bytes(8 * len(prepared.lat_rad)))
+    for i, (lat_rad, lon_rad, cos_lat) in enumerate(zip(prepared.lat_rad, prepared.lon_rad, prepared.cos_lat)):
+        dlon = lon_rad - lon1_rad
+        y = math.sin(dlon) * cos_lat
+        x = cos_lat1 * math.sin(lat_rad) - sin_lat1 * cos_lat * math.cos(dlon)
+        bearings[i] = (math.atan2(y, x) / RADIANS_PER_DEGREE + 360) % 360
+    return bearings
+
+
+def positions_in_sector(bearings, bearing: float, width_degrees: float) -> List[int]:
+    """
+    posicoes dos rumos dentro do setor centrado em bearing com abertura width_degrees
+    
+    Args:
+        bearings: rumos em graus (ex: resultado de calculate_bearings_batch)
+        bearing: rumo central do setor em graus
+        width_degrees: abertura total do setor em graus (0-360)
+    
+    Returns:
+        lista de posicoes, na ordem original
+    
+    Raises:
+        ValueError: se a abertura estiver fora de (0, 360]
+    
+    Example:
+        >>> positions_in_sector([10.0, 350.0, 90.0], 0.0, 45.0)
+        [0, 1]
+    """
+    if not 0 < width_degrees <= 360:
+        raise ValueError("abertura do setor deve estar entre 0 e 360 graus")
+    half_width = width_degrees * 0.5
+    
+    if np is not None:
+        # diferenca com sinal em [-180, 180), que trata a virada 360 -> 0
+        offsets = (np.asarray(bearings, dtype=np.float64) - bearing + 180) % 360 - 180
+        return (np.abs(offsets) <= half_width).nonzero()[0].tolist()
+    return [i for i, value in enumerate(bearings) if abs((value - bearing + 180) % 360 - 180) <= half_width]
+
+
+def _unit_vector(lat: float, lon: float) -> Tuple[float, float, float]:
+    # ponto na esfera unitaria (x, y, z)
+    lat_rad = lat * RADIANS_PER_DEGREE
+    lon_rad = lon * RADIANS_PER_DEGREE
+    cos_lat = math.cos(lat_rad)
+    return cos_lat * math.cos(lon_rad), cos_lat * math.sin(lon_rad), math.sin(lat_rad)
+
+
+def _cross(u, v):
+    return u[1] * v[2] - u[2] * v[1], u[2] * v[0] - u[0] * v[2], u[0] * v[1] - u[1] * v[0]
+
+
+def geographic_midpoint(points: Sequence[Tuple[float, float]]) -> Tuple[float, float]:
+    """
+    ponto medio de varios pontos pela media dos vetores na esfera unitaria
+    
+    diferente da media aritmetica das longitudes, funciona para grupos que cruzam o
+    antimeridiano (ex: 179.9 e -179.9 resultam em 180, nao em 0)
+    
+    Args:
+        points: pontos (lat, lon) em graus decimais
+    
+    Returns:
+        tupla (lat, lon) do ponto medio; se os vetores se anularem (pontos antipodas),
+        o primeiro ponto
+    
+    Raises:
+        ValueError: se a lista estiver vazia
+    """
+    if not points:
+        raise ValueError("pelo menos um ponto e necessario")
+    
+    x = y = z = 0.0
+    for lat, lon in points:
+        unit_x, unit_y, unit_z = _unit_vector(lat, lon)
+        x += unit_x
+        y += unit_y
+        z += unit_z
+    
+    if math.sqrt(x * x + y * y + z * z) < 1e-12:
+        return points[0]
+    
+    lat = math.atan2(z, math.sqrt(x * x + y * y)) / RADIANS_PER_DEGREE
+    lon = math.atan2(y, x) / RADIANS_PER_DEGREE
+    return lat, lon
+
+
+def point_segment_distances_batch(
+    lat1: Union[float, int],
+    lon1: Union[float, int],
+    lat2: Union[float, int],
+    lon2: Union[float, int],
+    lats: Sequence[float] = None,
+    lons: Sequence[float] = None,
+    prepared: PreparedCoordinates = None,
+    packed: PackedCoordinates = None
+):
+    """
+    distancia de varios pontos ate o trecho de rota (arco de circulo maximo) entre dois pontos
+    
+    na esfera unitaria, a normal n do plano do trecho da a distancia ate o circulo maximo
+    (asin |p.n|); se a projecao do ponto cair fora do arco vale a distancia ate a ponta mais perto
+    
+    Args:
+        lat1, lon1: inicio do trecho (em graus decimais)
+        lat2, lon2: fim do trecho (em graus decimais)
+        lats: latitudes dos pontos (ignorado se prepared ou packed for informado)
+        lons: longitudes dos pontos (ignorado se prepared ou packed for informado)
+        prepared: resultado de prepare_coordinates para reaproveitar entre chamadas
+        packed: coordenadas compactas de pack_coordinates (ignorado se prepared for informado)
+    
+    Returns:
+        distancias em quilometros arredondadas em 4 casas (array numpy, ou array('d') sem numpy)
+    
+    Raises:
+        ValueError: se alguma coordenada estiver fora dos limites validos
+    """
+    _validate_center(lat1, lon1)
+    _validate_center(lat2, lon2)
+    if prepared is None:
+        prepared = _prepare_packed(packed) if packed is not None else prepare_coordinates(lats, lons)
+    
+    to_start = calculate_distances_batch(lat1, lon1, prepared=prepared)
+    to_end = calculate_distances_batch(lat2, lon2, prepared=prepared)
+    
+    start = _unit_vector(lat1, lon1)
+    end = _unit_vector(lat2, lon2)
+    normal = _cross(start, end)
+    norm = math.sqrt(normal[0] * normal[0] + normal[1] * normal[1] + normal[2] * normal[2])
+    if norm < 1e-12:
+        # trecho degenerado (pontas iguais): so a distancia ate as pontas
+        if np is not None:
+            return np.minimum(to_start, to_end)
+        return array('d', map(min, to_start, to_end))
+    normal = (normal[0] / norm, normal[1] / norm, normal[2] / norm)
+    # a projecao cai no arco se estiver do lado de dentro dos planos que passam pelas duas pontas
+    start_plane = _cross(normal, start)
+    end_plane = _cross(end, normal)
+    
+    if np is not None:
+        x = prepared.cos_lat * np.cos(prepared.lon_rad)
+        y = prepared.cos_lat * np.sin(prepared.lon_rad)
+        z = np.sin(prepared.lat_rad)
+        inside = ((x * start_plane[0] + y * start_plane[1] + z * start_plane[2] >= 0)
+                  & (x * end_plane[0] + y * end_plane[1] + z * end_plane[2] >= 0))
+        offset = np.abs(x * normal[0] + y * normal[1] + z * normal[2])
+        cross_track = np.round(EARTH_RADIUS_KM * np.arcsin(np.minimum(offset, 1.0)), 4)
+        return np.where(inside, cross_track, np.minimum(to_start, to_end))
+    
+    distances = array('d', bytes(8 * len(prepared.lat_rad)))
+    for i, (lat_rad, lon_rad, cos_lat) in enumerate(zip(prepared.lat_rad, prepared.lon_rad, prepared.cos_lat)):
+        point = (cos_lat * math.cos(lon_rad), cos_lat * math.sin(lon_rad), math.sin(lat_rad))
+        if (sum(p * q for p, q in zip(point, start_plane)) >= 0
+                and sum(p * q for p, q in zip(point, end_plane)) >= 0):
+            offset = abs(sum(p * q for p, q in zip(point, normal)))
+            distances[i] = round(EARTH_RADIUS_KM * math.asin(min(offset, 1.0)), 4)
+        else:
+            distances[i] = min(to_start[i], to_end[i])
+    return distances
+
+
+# alfabeto base32 do geohash (sem a, i, l, o)
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_DECODE_MAP = {char: value for value, char in enumerate(GEOHASH_ALPHABET)}
+GEOHASH_MAX_PRECISION = 12
+GEOHASH_DEFAULT_PRECISION = 9
+
+# direcoes de geohash_neighbors como (passos em latitude, passos em longitude)
+GEOHASH_DIRECTIONS = {
+    'n': (1, 0), 'ne': (1, 1), 'e': (0, 1), 'se': (-1, 1),
+    's': (-1, 0), 'sw': (-1, -1), 'w': (0, -1), 'nw': (1, -1)
+}
+
+
+def _spread_bits(value: int) -> int:
+    # intercala zeros entre os bits (ate 32 bits): abcd -> 0a0b0c0d
+    value &= 0xFFFFFFFF
+    value = (value | (value << 16)) & 0x0000FFFF0000FFFF
+    value = (value | (value << 8)) & 0x00FF00FF00FF00FF
+    value = (value | (value << 4)) & 0x0F0F0F0F0F0F0F0F
+    value = (value | (value << 2)) & 0x3333333333333333
+    return (value | (value << 1)) & 0x5555555555555555
+
+
+def _compact_bits(value: int) -> int:
+    # inverso de _spread_bits: pega os bits das posicoes pares
+    value &= 0x5555555555555555
+    value = (value | (value >> 1)) & 0x3333333333333333
+    value = (value | (value >> 2)) & 0x0F0F0F0F0F0F0F0F
+    value = (value | (value >> 4)) & 0x00FF00FF00FF00FF
+    value = (value | (value >> 8)) & 0x0000FFFF0000FFFF
+    return (value | (value >> 16)) & 0xFFFFFFFF
+
+
+def _geohash_bits(precision: int):
+    # bits de latitude e de longitude (a longitude fica com o bit extra quando o total e impar)
+    if not 1 <= precision <= GEOHASH_MAX_PRECISION:
+        raise ValueError(f"precisao do geohash deve estar entre 1 e {GEOHASH_MAX_PRECISION}")
+    total = 5 * precision
+    return total // 2, total - total // 2
+
+
+def _geohash_from_cell(lat_index: int, lon_index: int, precision: int) -> str:
+    total = 5 * precision
+    if total % 2:
+        code = _spread_bits(lon_index) | (_spread_bits(lat_index) << 1)
+    else:
+        code = _spread_bits(lat_index) | (_spread_bits(lon_index) << 1)
+    return ''.join(GEOHASH_ALPHABET[(code >> shift) & 31] for shift in range(total - 5, -1, -5))
+
+
+def _geohash_cell(lat: float, lon: float, precision: int):
+    # indices inteiros (linha, coluna) da celula na grade do geohash
+    lat_bits, lon_bits = _geohash_bits(precision)
+    lat_index = min(int((lat + 90) / 180 * (1 << lat_bits)), (1 << lat_bits) - 1)
+    lon_index = min(int((lon + 180) / 360 * (1 << lon_bits)), (1 << lon_bits) - 1)
+    return lat_index, lon_index
+
+
+def geohash_encode(lat: Union[float, int], lon: Union[float, int], precision: int = GEOHASH_DEFAULT_PRECISION) -> str:
+    """
+    codifica um ponto em geohash
+    
+    as coordenadas sao quantizadas em inteiros e os bits sao intercalados de uma vez
+    (sem a bisseccao caractere a caractere)
+    
+    Args:
+        lat: latitude em graus decimais
+        lon: longitude em graus decimais
+        precision: numero de caracteres (1-12)
+    
+    Returns:
+        str: geohash do ponto
+    
+    Raises:
+        ValueError: se as coordenadas ou a precisao forem invalidas
+    
+    Example:
+        >>> geohash_encode(-9.6498, -35.7089, 7)
+        '7nq957m'
+    """
+    _validate_center(lat, lon)
+    lat_index, lon_index = _geohash_cell(lat, lon, precision)
+    return _geohash_from_cell(lat_index, lon_index, precision)
+
+
+def _geohash_to_cell(geohash: str):
+    precision = len(geohash)
+    _geohash_bits(precision)
+    code = 0
+    for char in geohash.lower():
+        value = GEOHASH_DECODE_MAP.get(char)
+        if value is None:
+            raise ValueError(f"caractere invalido no geohash: {char!r}")
+        code = (code << 5) | value
+
+    if (5 * precision) % 2:
+        return _compact_bits(code >> 1), _compact_bits(code), precision
+    return _compact_bits(code), _compact_bits(code >> 1), precision
+
+
+def _cell_bounds(lat_index: int, lon_index: int, precision: int):
+    lat_bits, lon_bits = _geohash_bits(precision)
+    lat_size = 180 / (1 << lat_bits)
+    lon_size = 360 / (1 << lon_bits)
+    lat_min = -90 + lat_index * lat_size
+    lon_min = -180 + lon_index * lon_size
+    return lat_min, lat_min + lat_size, lon_min, lon_min + lon_size
+
+
+def geohash_bounds(geohash: str) -> Tuple[float, float, float, float]:
+    """
+    retorna a caixa coberta por um geohash
+    
+    Args:
+        geohash: geohash a decodificar
+    
+    Returns:
+        tupla (lat_min, lat_max, lon_min, lon_max)
+    
+    Raises:
+        ValueError: se o geohash for vazio, longo demais ou tiver caracteres invalidos
+    """
+    return _cell_bounds(*_geohash_to_cell(geohash))
+
+
+def geohash_decode(geohash: str) -> Tuple[float, float]:
+    """
+    decodifica um geohash para o centro da sua celula
+    
+    Args:
+        geohash: geohash a decodificar
+    
+    Returns:
+        tupla (latitude, longitude) do centro da celula
+    
+    Raises:
+        ValueError: se o geohash for vazio, longo demais ou tiver caracteres invalidos
+    """
+    lat_min, lat_max, lon_min, lon_max = geohash_bounds(geohash)
+    return (lat_min + lat_max) * 0.5, (lon_min + lon_max) * 0.5
+
+
+def geohash_neighbors(geohash: str) -> Dict[str, str]:
+    """
+    retorna os geohashes vizinhos de mesma precisao
+    
+    a longitude da a volta no antimeridiano; nos polos nao ha vizinhos ao norte (ou ao sul)
+    
+    Args:
+        geohash: geohash central
+    
+    Returns:
+        dicionario direcao ('n', 'ne', 'e', 'se', 's', 'sw', 'w', 'nw') -> geohash
+    """
+    lat_index, lon_index, precision = _geohash_to_cell(geohash)
+    lat_bits, lon_bits = _geohash_bits(precision)
+
+    neighbors = {}
+    for direction, (lat_step, lon_step) in GEOHASH_DIRECTIONS.items():
+        neighbor_lat = lat_index + lat_step
+        if not 0 <= neighbor_lat < (1 << lat_bits):
+            continue
+        neighbor_lon = (lon_index + lon_step) % (1 << lon_bits)
+        neighbors[direction] = _geohash_from_cell(neighbor_lat, neighbor_lon, precision)
+    return neighbors
+
+
+def distance_to_bounds(
+    lat: Union[float, int],
+    lon: Union[float, int],
+    lat_min: float,
+    lat_max: float,
+    lon_min: float,
+    lon_max: float
+) -> float:
+    """
+    distancia (em km) do ponto ate o ponto mais proximo de uma caixa lat/lon
+    
+    a latitude e limitada as bordas e a longitude vai para a borda mais proxima
+    (considerando o antimeridiano); para caixas pequenas o erro e desprezivel
+    
+    Returns:
+        float: distancia em quilometros (0 se o ponto estiver dentro da caixa)
+    """
+    nearest_lat = min(max(lat, lat_min), lat_max)
+    if lon_min <= lon <= lon_max:
+        nearest_lon = lon
+    else:
+        to_min = (lon_min - lon) % 360
+        to_max = (lon - lon_max) % 360
+        nearest_lon = lon_min if to_min <= to_max else lon_max
+    return calculate_distance(lat, lon, nearest_lat, nearest_lon)
+
+
+def geohash_precision_for_radius(lat: Union[float, int], radius_km: float) -> int:
+    """
+    maior precisao cuja celula, na latitude dada, tem altura e largura de pelo menos radius_km
+    
+    com ela a cobertura de um circulo cabe em no maximo 3x3 celulas
+    
+    Args:
+        lat: latitude do centro
+        radius_km: raio em quilometros
+    
+    Returns:
+        int: precisao entre 1 e 12
+    """
+    km_per_degree = EARTH_RADIUS_KM * RADIANS_PER_DEGREE
+    cos_lat = max(math.cos(lat * RADIANS_PER_DEGREE), 1e-12)
+    for precision in range(GEOHASH_MAX_PRECISION, 0, -1):
+        lat_bits, lon_bits = _geohash_bits(precision)
+        height_km = 180 / (1 << lat_bits) * km_per_degree
+        width_km = 360 / (1 << lon_bits) * km_per_degree * cos_lat
+        if min(height_km, width_km) >= radius_km:
+            return precision
+    return 1
+
+
+def geohash_cover(
+    lat: Union[float, int],
+    lon: Union[float, int],
+    radius_km: float,
+    precision: int = None
+) -> List[str]:
+    """
+    geohashes que intersectam o circulo de raio radius_km em torno do ponto
+    
+    as celulas da caixa que envolve o circulo sao enumeradas pelos indices inteiros
+    e so ficam as que tem algum ponto dentro do raio
+    
+    Args:
+        lat: latitude do centro
+        lon: longitude do centro
+        radius_km: raio em quilometros
+        precision: precisao dos geohashes (padrao: geohash_precision_for_radius)
+    
+    Returns:
+        lista ordenada de geohashes
+    
+    Raises:
+        ValueError: se as coordenadas, o raio ou a precisao forem invalidos
+    """
+    _validate_center(lat, lon)
+    if radius_km < 0:
+        raise ValueError("raio deve ser positivo")
+    if precision is None:
+        precision = geohash_precision_for_radius(lat, radius_km)
+    lat_bits, lon_bits = _geohash_bits(precision)
+
+    span = radius_km / (EARTH_RADIUS_KM * RADIANS_PER_DEGREE)
+    lat_low, lat_high = max(lat - span, -90), min(lat + span, 90)
+    first_row = _geohash_cell(lat_low, 0, precision)[0]
+    last_row = _geohash_cell(lat_high, 0, precision)[0]
+
+    widest = max(abs(lat_low), abs(lat_high)) * RADIANS_PER_DEGREE
+    lon_span = span / math.cos(widest) if widest < math.pi / 2 else 360
+    columns_count = 1 << lon_bits
+    if lon_span >= 180:
+        columns = range(columns_count)
+    else:
+        lon_size = 360 / columns_count
+        first = math.floor((lon - lon_span + 180) / lon_size)
+        last = math.floor((lon + lon_span + 180) / lon_size)
+        columns = sorted({column % columns_count for column in range(first, last + 1)})
+
+    # margem pequena porque o ponto mais proximo da celula e aproximado
+    limit = radius_km * 1.01 + 1e-4
+    cover = []
+    for row in range(first_row, last_row + 1):
+        for column in columns:
+            if distance_to_bounds(lat, lon, *_cell_bounds(row, column, precision)) <= limit:
+                cover.append(_geohash_from_cell(row, column, precision))
+    cover.sort()
+    return cover
+
+
+def max_longitude_offset(lat: Union[float, int], radius_km: float) -> float:
+    """
+    maior diferenca de longitude (em graus) de um ponto a ate radius_km do centro
+    
+    Args:
+        lat: latitude do centro
+        radius_km: raio em quilometros
+    
+    Returns:
+        float: diferenca maxima em graus (180 quando o circulo alcanca um polo)
+    """
+    sin_angle = math.sin(min(radius_km / EARTH_RADIUS_KM, math.pi / 2))
+    cos_lat = math.cos(lat * RADIANS_PER_DEGREE)
+    if sin_angle >= cos_lat:
+        return 180.0
+    return math.asin(sin_angle / cos_lat) / RADIANS_PER_DEGREE
+
+
+def approximate_distance_error_bound(lat: Union[float, int], radius_km: float) -> float:
+    """
+    erro relativo maximo de approximate_distances_batch para pontos a ate radius_km do centro
+    
+    a aproximacao troca sin(x) por x e asin(y) por y na formula de haversine, entao
+    d * sqrt(1 - s^2) <= aproximada <= d / (1 - m^2 / 6), onde m e a maior meia diferenca
+    de latitude ou longitude (em radianos) e s = aproximada / 2R
+    
+    Args:
+        lat: latitude do centro
+        radius_km: raio em quilometros
+    
+    Returns:
+        float: erro relativo (ex: ~2e-6 para 25 km em maceio, menos de 5 cm)
+    """
+    angle = min(radius_km / EARTH_RADIUS_KM, math.pi)
+    half_lon = max_longitude_offset(lat, radius_km) * RADIANS_PER_DEGREE * 0.5
+    largest_half = max(angle * 0.5, half_lon)
+    shrink = max(1 - largest_half * largest_half / 6, 1e-12)
+    half_chord = min(math.sin(angle * 0.5) / shrink, 1 - 1e-12)
+    return max(1 / shrink - 1, 1 - math.sqrt(1 - half_chord * half_chord))
+
+
+def approximate_distances_batch(
+    lat: Union[float, int],
+    lon: Union[float, int],
+    lats: Sequence[float] = None,
+    lons: Sequence[float] = None,
+    prepared: PreparedCoordinates = None
+):
+    """
+    distancia aproximada (plana, com cos(lat) dos dois pontos) de um ponto para varios pontos
+    
+    aproximada = R * sqrt(dlat^2 + cos(lat1) * cos(lat2) * dlon^2), sem sin nem atan2;
+    o erro relativo para pontos ate um raio e limitado por approximate_distance_error_bound
+    
+    Args:
+        lat: latitude do ponto central (em graus decimais)
+        lon: longitude do ponto central (em graus decimais)
+        lats: latitudes dos pontos alvo (ignorado se prepared for informado)
+        lons: longitudes dos pontos alvo (ignorado se prepared for informado)
+        prepared: resultado de prepare_coordinates para reaproveitar entre chamadas
+    
+    Returns:
+        array numpy com as distancias aproximadas em quilometros, sem arredondamento
+    
+    Raises:
+        ImportError: se numpy nao estiver instalado
+        ValueError: se alguma coordenada estiver fora dos limites validos
+    """
+    if np is None:
+        raise ImportError("numpy e necessario para approximate_distances_batch")
+    _validate_center(lat, lon)
+    if prepared is None:
+        prepared = prepare_coordinates(lats, lons)
+    
+    center_lat_rad = lat * RADIANS_PER_DEGREE
+    dlat = prepared.lat_rad - center_lat_rad
+    # menor diferenca de longitude (o haversine tem periodo 2pi em dlon)
+    dlon = np.abs(prepared.lon_rad - lon * RADIANS_PER_DEGREE)
+    dlon = np.minimum(dlon, 2 * math.pi - dlon)
+    
+    return EARTH_RADIUS_KM * np.sqrt(dlat * dlat + math.cos(center_lat_rad) * prepared.cos_lat * dlon * dlon)
+
+
+def distances_within_radius(
+    lat: Union[float, int],
+    lon: Union[float, int],
+    radius_km: float,
+    lats: Sequence[float] = None,
+    lons: Sequence[float] = None,
+    prepared: PreparedCoordinates = None,
+    mode: str = 'exact',
+    packed: PackedCoordinates = None
+):
+    """
+    posicoes e distancias dos pontos a ate radius_km do centro
+    
+    no modo 'exact' todas as distancias usam haversine; no modo 'approx' a primeira fase usa
+    approximate_distances_batch e so os pontos na faixa de incerteza perto da borda
+    vao para o haversine. o conjunto de pontos e sempre o mesmo do modo exato; as distancias
+    dos pontos claramente dentro do raio ficam com o erro de approximate_distance_error_bound
+    
+    Args:
+        lat: latitude do ponto central (em graus decimais)
+        lon: longitude do ponto central (em graus decimais)
+        radius_km: raio em quilometros
+        lats: latitudes dos pontos alvo (ignorado se prepared for informado)
+        lons: longitudes dos pontos alvo (ignorado se prepared for informado)
+        prepared: resultado de prepare_coordinates para reaproveitar entre chamadas
+        mode: 'exact' ou 'approx' (sem numpy, 'approx' usa o caminho exato)
+        packed: coordenadas compactas de pack_coordinates (ignorado se prepared for informado)
+    
+    Returns:
+        tupla (posicoes, distancias) em listas, na ordem original, com distancias arredondadas em 4 casas
+    
+    Raises:
+        ValueError: se o modo, o raio ou alguma coordenada forem invalidos
+    """
+    if mode not in DISTANCE_MODES:
+        raise ValueError(f"modo de distancia desconhecido: {mode}. opcoes: {', '.join(DISTANCE_MODES)}")
+    if radius_km < 0:
+        raise ValueError("raio deve ser positivo")
+    if prepared is None:
+        prepared = _prepare_packed(packed) if packed is not None else prepare_coordinates(lats, lons)
+    
+    if np is None:
+        distances = calculate_distances_batch(lat, lon, prepared=prepared).tolist()
+        positions = [i for i, distance in enumerate(distances) if distance <= radius_km]
+        return positions, [distances[i] for i in positions]
+    
+    if mode == 'exact':
+        distances = calculate_distances_batch(lat, lon, prepared=prepared)
+        positions = (distances <= radius_km).nonzero()[0]
+        return positions.tolist(), distances[positions].tolist()
+    
+    approximate = approximate_distances_batch(lat, lon, prepared=prepared)
+    # faixas garantidas pelo limite de erro, com a folga do arredondamento para que o resultado
+    # coincida com round(haversine, 4) <= radius_km
+    error = approximate_distance_error_bound(lat, radius_km + DISTANCE_ROUNDING_KM)
+    inside = approximate <= (radius_km - DISTANCE_ROUNDING_KM) * (1 - error)
+    uncertain = ~inside & (approximate <= (radius_km + DISTANCE_ROUNDING_KM) * (1 + error))
+    
+    uncertain_positions = uncertain.nonzero()[0]
+    if uncertain_positions.size:
+        exact = calculate_distances_batch(lat, lon, prepared=PreparedCoordinates(
+            prepared.lat_rad[uncertain_positions],
+            prepared.lon_rad[uncertain_positions],
+            prepared.cos_lat[uncertain_positions]
+        ))
+        approximate[uncertain_positions] = exact
+        inside[uncertain_positions] = exact <= radius_km
+    
+    positions = inside.nonzero()[0]
+    return positions.tolist(), np.round(approximate[positions], 4).tolist()
+
+
+# maximo de celulas por bloco em iter_distance_matrix (~8 MB por array float64 temporario)
+DISTANCE_MATRIX_CHUNK_CELLS = 1_000_000
+
+
+def _coordinates_of(items) -> PreparedCoordinates:
+    # aceita coordenadas ja preparadas ou compactas, pares (lat, lon), dicionarios ou objetos com latitude/longitude
+    if isinstance(items, PreparedCoordinates):
+        return items
+    if isinstance(items, PackedCoordinates):
+        return _prepare_packed(items)
+    lats = []
+    lons = []
+    for item in items:
+        if isinstance(item, dict):
+            lats.append(item['latitude'])
+            lons.append(item['longitude'])
+        elif hasattr(item, 'latitude'):
+            lats.append(item.latitude)
+            lons.append(item.longitude)
+        else:
+            lats.append(item[0])
+            lons.append(item[1])
+    return prepare_coordinates(lats, lons)
+
+
+def _haversine_block(points: PreparedCoordinates, targets: PreparedCoordinates):
+    # distancias de todos os pontos para todos os alvos por broadcasting (linhas = pontos)
+    sin_dlat_half = np.subtract.outer(points.lat_rad, targets.lat_rad)
+    sin_dlat_half *= 0.5
+    np.sin(sin_dlat_half, out=sin_dlat_half)
+    sin_dlon_half = np.subtract.outer(points.lon_rad, targets.lon_rad)
+    sin_dlon_half *= 0.5
+    np.sin(sin_dlon_half, out=sin_dlon_half)
+    
+    a = sin_dlat_half
+    a *= sin_dlat_half
+    sin_dlon_half *= sin_dlon_half
+    sin_dlon_half *= np.multiply.outer(points.cos_lat, targets.cos_lat)
+    a += sin_dlon_half
+    
+    c = np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    c *= 2 * EARTH_RADIUS_KM
+    return np.round(c, 4, out=c)
+
+
+def iter_distance_matrix(points, targets, max_cells: int = DISTANCE_MATRIX_CHUNK_CELLS):
+    """
+    gera a matriz de distancias pontos x alvos em blocos, com memoria limitada
+    
+    cada bloco tem no maximo max_cells celulas: as linhas (pontos) sao agrupadas e,
+    se um unico ponto ja passar do limite, as colunas (alvos) tambem sao divididas
+    
+    Args:
+        points: pontos de origem ((lat, lon), dicionarios, objetos, PreparedCoordinates ou PackedCoordinates)
+        targets: alvos, nos mesmos formatos (ex: lista de Restaurant)
+        max_cells: maximo de celulas por bloco
+    
+    Yields:
+        tuplas (linha_inicial, coluna_inicial, bloco) com distancias em km arredondadas em 4 casas
+        (bloco e um array numpy 2d, ou lista de array('d') sem numpy)
+    
+    Raises:
+        ValueError: se alguma coordenada estiver fora dos limites validos
+    """
+    points = _coordinates_of(points)
+    targets = _coordinates_of(targets)
+    rows, columns = len(points.lat_rad), len(targets.lat_rad)
+    if not rows or not columns:
+        return
+    
+    if np is None:
+        # sem numpy: uma linha por ponto com o laco de calculate_distances_batch
+        for row in range(rows):
+            center_lat = points.lat_rad[row] / RADIANS_PER_DEGREE
+            center_lon = points.lon_rad[row] / RADIANS_PER_DEGREE
+            yield row, 0, [calculate_distances_batch(center_lat, center_lon, prepared=targets)]
+        return
+    
+    column_step = min(columns, max(max_cells, 1))
+    row_step = max(1, max_cells // column_step)
+    for row in range(0, rows, row_step):
+        row_slice = slice(row, row + row_step)
+        point_block = PreparedCoordinates(points.lat_rad[row_slice], points.lon_rad[row_slice], points.cos_lat[row_slice])
+        for column in range(0, columns, column_step):
+            column_slice = slice(column, column + column_step)
+            target_block = PreparedCoordinates(
+                targets.lat_rad[column_slice], targets.lon_rad[column_slice], targets.cos_lat[column_slice]
+            )
+            yield row, column, _haversine_block(point_block, target_block)
+
+
+def distance_matrix(points, targets, max_cells: int = DISTANCE_MATRIX_CHUNK_CELLS):
+    """
+    matriz de distancias de cada ponto para cada alvo (ex: varios usuarios x restaurantes)
+    
+    substitui M x N chamadas a calculate_distance por operacoes em arrays; os temporarios
+    sao limitados a max_cells celulas por vez, mas o resultado completo tem M x N celulas
+    (para matrizes grandes, consumir iter_distance_matrix diretamente)
+    
+    Args:
+        points: pontos de origem ((lat, lon), dicionarios, objetos, PreparedCoordinates ou PackedCoordinates)
+        targets: alvos, nos mesmos formatos (ex: lista de Restaurant)
+        max_cells: maximo de celulas por bloco intermediario
+    
+    Returns:
+        matriz M x N em km arredondada em 4 casas (array numpy, ou lista de array('d') sem numpy)
+    
+    Raises:
+        ValueError: se alguma coordenada estiver fora dos limites validos
+    
+    Example:
+        >>> distance_matrix([(-9.6498, -35.7089)], [(-9.6500, -35.7090), (-9.6498, -35.7089)])
+        array([[0.0248, 0.    ]])
+    """
+    points = _coordinates_of(points)
+    targets = _coordinates_of(targets)
+    rows, columns = len(points.lat_rad), len(targets.lat_rad)
+    
+    if np is None:
+        return [block[0] for _, _, block in iter_distance_matrix(points, targets, max_cells)]
+    
+    matrix = np.empty((rows, columns))
+    for row, column, block in iter_distance_matrix(points, targets, max_cells):
+        matrix[row:row + block.shape[0], column:column + block.shape[1]] = block
+    return matrix
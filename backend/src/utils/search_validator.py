@@ -4,8 +4,12 @@ Valida se a busca faz sentido antes de processar
 """
 
 import re
+from functools import lru_cache
 from typing import Dict, Any, List, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from algorithms.fuzzy_search import DeletionIndex
+from nlp.synonyms import CULINARIA, ESTABELECIMENTOS_FAMOSOS
 
 @dataclass
 class SearchValidationResult:
@@ -13,10 +17,17 @@ class SearchValidationResult:
     is_valid: bool
     errors: List[str]
     sanitized_query: str
+    # Termos canônicos corrigidos de erros de digitação ("habbibs" -> "habibs")
+    corrected_terms: List[str] = field(default_factory=list)
 
 class IntelligentSearchValidator:
     """Validador inteligente para buscas de restaurantes"""
     
+    # Tamanho mínimo das palavras corrigidas pelo índice de erros de digitação
+    # e tamanho a partir do qual duas edições são aceitas
+    FUZZY_MIN_LENGTH = 6
+    FUZZY_TWO_EDITS_LENGTH = 10
+    
     # Palavras-chave relacionadas a restaurantes e comida (EXPANDIDO)
     FOOD_KEYWORDS = {
         # Tipos de culinária
@@ -316,6 +327,13 @@ class IntelligentSearchValidator:
         
         has_food_keywords = len(food_keywords_found) > 0
 
+        # Tolerar erros de digitação ("habbibs", "mc donals") com o índice compartilhado;
+        # os termos corrigidos seguem no resultado para a busca por keyword
+        corrected_terms = []
+        if not has_food_keywords:
+            corrected_terms = self._find_fuzzy_food_keywords(words)
+            has_food_keywords = len(corrected_terms) > 0
+
         # Verificar se segue padrões válidos
         has_valid_pattern = any(pattern.search(sanitized_query) for pattern in self.VALID_PATTERNS)
 
@@ -334,9 +352,43 @@ class IntelligentSearchValidator:
         return SearchValidationResult(
             is_valid=is_valid,
             errors=errors,
-            sanitized_query=sanitized_query
+            sanitized_query=sanitized_query,
+            corrected_terms=corrected_terms
         )
 
+    def _find_fuzzy_food_keywords(self, words: List[str]) -> List[str]:
+        """
+        Busca pratos, culinárias e estabelecimentos parecidos com as palavras da query
+        
+        Args:
+            words: palavras da query em minúsculas
+            
+        Returns:
+            termos canônicos encontrados, sem repetição e na ordem da query
+        """
+        index = get_food_vocabulary_index()
+        candidates = words + [' '.join(pair) for pair in zip(words, words[1:])]
+        found = []
+        
+        for candidate in candidates:
+            # Palavras curtas ficam de fora ("pisa" -> "pita", "dente" -> "dende", "pasta")
+            if len(candidate) < self.FUZZY_MIN_LENGTH:
+                continue
+            # Uma edição até 9 letras, duas a partir de 10
+            max_distance = 1 if len(candidate) < self.FUZZY_TWO_EDITS_LENGTH else 2
+            matches = index.lookup(candidate, max_distance)
+            if not matches:
+                continue
+            # Só aceitar correções sem ambiguidade: os termos mais próximos levam ao mesmo canônico
+            best_distance = matches[0][1]
+            canonical = {value for _, distance, value in matches if distance == best_distance}
+            if len(canonical) == 1:
+                term = canonical.pop()
+                if term not in found:
+                    found.append(term)
+        
+        return found
+
     def _sanitize_query(self, query: str) -> str:
         """
         Sanitiza a query removendo caracteres problemáticos
@@ -361,5 +413,18 @@ class IntelligentSearchValidator:
         
         return sanitized
 
+@lru_cache(maxsize=1)
+def get_food_vocabulary_index() -> DeletionIndex:
+    """
+    Índice de deleções do vocabulário de comida, construído uma vez e compartilhado entre requisições
+    
+    Returns:
+        índice com estabelecimentos famosos e sinônimos de culinária (pratos e tipos)
+    """
+    index = DeletionIndex(max_distance=2)
+    index.add_vocabulary(ESTABELECIMENTOS_FAMOSOS)
+    index.add_vocabulary(CULINARIA)
+    return index
+
 # Instância global do validador
 search_validator = IntelligentSearchValidator()
\ No newline at end of file